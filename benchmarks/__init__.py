@@ -0,0 +1 @@
+"""Timing scripts for the contract backend in `tests/new_lattice_interface`."""
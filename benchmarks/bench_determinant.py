@@ -0,0 +1,48 @@
+"""Scaling of the exact Bareiss determinant on random integer and rational Gram matrices.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_determinant
+"""
+
+from __future__ import annotations
+
+import random
+from fractions import Fraction
+from time import perf_counter
+
+from tests.new_lattice_interface._linalg import rational_determinant
+
+RANKS = (2, 4, 8, 16, 32, 64)
+REPEATS = 3
+
+
+def _random_symmetric(n: int, rng: random.Random, *, rational: bool) -> list[list[Fraction]]:
+    rows = [[Fraction(0)] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i, n):
+            den = rng.choice((1, 2, 3)) if rational else 1
+            rows[i][j] = rows[j][i] = Fraction(rng.randint(-9, 9), den)
+    return rows
+
+
+def _best_time(rows: list[list[Fraction]]) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = perf_counter()
+        rational_determinant(rows)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print(f"{'rank':>4}  {'integer [ms]':>12}  {'rational [ms]':>13}")
+    for n in RANKS:
+        t_int = _best_time(_random_symmetric(n, rng, rational=False))
+        t_rat = _best_time(_random_symmetric(n, rng, rational=True))
+        print(f"{n:>4}  {1e3 * t_int:>12.2f}  {1e3 * t_rat:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
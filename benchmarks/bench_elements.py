@@ -0,0 +1,62 @@
+"""Allocation time and memory of lattice elements: slotted backend vs a pydantic model.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_elements
+"""
+
+from __future__ import annotations
+
+import random
+import tracemalloc
+from time import perf_counter
+from typing import Any, Callable
+
+from pydantic import BaseModel, ConfigDict
+
+from tests.new_lattice_interface.conftest import LatticeElement
+
+COUNTS = (10_000, 100_000, 300_000)
+RANK = 8
+
+
+class _ModelElement(BaseModel):
+    """The pre-slots shape: a validated model holding coordinates and a lattice reference."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    lattice: Any
+    coords: tuple[int, ...]
+
+
+def _make_model(lattice: object, coords: tuple[int, ...]) -> _ModelElement:
+    return _ModelElement(lattice=lattice, coords=coords)
+
+
+def _measure(make: Callable[[object, tuple[int, ...]], object], rows: list[tuple[int, ...]]) -> tuple[float, float]:
+    """Return `(seconds, bytes per element)` for building one element per row."""
+    lattice = object()
+    start = perf_counter()
+    kept = [make(lattice, row) for row in rows]
+    elapsed = perf_counter() - start
+    del kept
+    tracemalloc.start()
+    kept = [make(lattice, row) for row in rows]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return elapsed, peak / len(rows)
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print(f"{'count':>8}  {'slots [ms]':>10}  {'model [ms]':>10}  {'slots [B/el]':>12}  {'model [B/el]':>12}")
+    for count in COUNTS:
+        rows = [tuple(rng.randint(-5, 5) for _ in range(RANK)) for _ in range(count)]
+        t_slots, m_slots = _measure(LatticeElement, rows)
+        t_model, m_model = _measure(_make_model, rows)
+        print(f"{count:>8}  {1e3 * t_slots:>10.1f}  {1e3 * t_model:>10.1f}  {m_slots:>12.0f}  {m_model:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Coxeter diagrams of acute-angled polytopes and Vinberg's finite-volume criterion.
+
+For walls with roots `r_i` put `M = +-(r_i, r_j)`, signed so the diagonal is
+positive.  Two walls meet at angle `pi / m` when `M_ij^2 = cos^2(pi / m) M_ii M_jj`,
+i.e. `4 M_ij^2 / (M_ii M_jj)` is `0, 1, 2, 3` for `m = 2, 3, 4, 6`; they are
+parallel (a bold edge) when it is `4` and ultraparallel (a dotted edge) when it
+exceeds `4`.  Crystallographic walls allow no other values.
+
+A subdiagram is elliptic when every connected component is a finite Coxeter
+diagram and parabolic when every component is affine; its rank is the number
+of vertices minus the number of affine components.  Connected subdiagrams are
+recognised combinatorially (paths, cycles and one- or two-branch trees with
+their edge labels) and the type of each vertex set is memoized on the diagram,
+so a subdiagram walk classifies every connected piece once.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import numpy as np
+
+from ._linalg import inertia
+
+BOLD = 0
+DOTTED = -1
+
+# `4 cos^2(pi / m)` for the crystallographic labels.
+_LABELS = {0: 2, 1: 3, 2: 4, 3: 6}
+# One-branch simply laced trees by sorted arm lengths.
+_BRANCHED = {(1, 2, 2): ("E", 6, False), (1, 2, 3): ("E", 7, False), (1, 2, 4): ("E", 8, False),
+             (2, 2, 2): ("E", 6, True), (1, 3, 3): ("E", 7, True), (1, 2, 5): ("E", 8, True)}
+
+ComponentType = tuple[str, int, bool]
+
+
+@dataclass(frozen=True)
+class CoxeterDiagram:
+    """Coxeter diagram of walls with Gram matrix `gram` (diagonal signed positive).
+
+    `labels[i][j]` is `m` for walls meeting at angle `pi / m` (`2` for
+    orthogonal walls), `BOLD` for parallel and `DOTTED` for ultraparallel ones.
+    """
+
+    gram: np.ndarray
+    labels: tuple[tuple[int, ...], ...]
+    adjacent: tuple[frozenset[int], ...]
+    _types: dict[frozenset[int], ComponentType | None] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def of(cls, gram: np.ndarray, *, previous: "CoxeterDiagram | None" = None) -> "CoxeterDiagram":
+        """Build the diagram of `gram`, reusing the classifications of `previous` when it is a leading block."""
+        M = np.array(gram, dtype=object)
+        s = M.shape[0]
+        if s and M[0, 0] < 0:
+            M = -M
+        assert all(M[i, i] > 0 for i in range(s)), f"Coxeter diagram needs walls of one sign: diagonal={M.diagonal()}"
+        labels = [[1] * s for _ in range(s)]
+        for i in range(s):
+            for j in range(i + 1, s):
+                assert M[i, j] <= 0, f"Walls {i} and {j} meet at an obtuse angle: gram entry {M[i, j]}"
+                num, den = 4 * M[i, j] ** 2, M[i, i] * M[j, j]
+                if num > 4 * den:
+                    label = DOTTED
+                elif num == 4 * den:
+                    label = BOLD
+                else:
+                    assert num % den == 0 and num // den in _LABELS, f"Walls {i} and {j} meet at a non-Coxeter angle."
+                    label = _LABELS[num // den]
+                labels[i][j] = labels[j][i] = label
+        adjacent = tuple(frozenset(j for j in range(s) if j != i and labels[i][j] != 2) for i in range(s))
+        diagram = cls(M, tuple(map(tuple, labels)), adjacent)
+        if previous is not None and previous.labels == tuple(row[: len(previous.labels)] for row in diagram.labels[: len(previous.labels)]):
+            diagram._types.update(previous._types)
+        return diagram
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def coxeter_matrix(self) -> tuple[tuple[int, ...], ...]:
+        """The Coxeter matrix `m_ij`, with `0` for `infinity` (bold and dotted edges)."""
+        return tuple(tuple(max(m, 0) for m in row) for row in self.labels)
+
+    def components(self, S) -> list[frozenset[int]]:
+        """Connected components of the subdiagram on the vertices `S`."""
+        left, out = set(S), []
+        while left:
+            seen = {left.pop()}
+            todo = list(seen)
+            while todo:
+                for j in self.adjacent[todo.pop()] & left:
+                    left.discard(j)
+                    seen.add(j)
+                    todo.append(j)
+            out.append(frozenset(seen))
+        return out
+
+    def component_type(self, C: frozenset[int]) -> ComponentType | None:
+        """`(family, rank, affine)` of the connected subdiagram `C`, or `None` if it is neither finite nor affine."""
+        if C not in self._types:
+            self._types[C] = _classify(self, sorted(C))
+        return self._types[C]
+
+    def subdiagram_type(self, S) -> tuple[ComponentType, ...] | None:
+        """Types of the components of `S`, or `None` unless every component is finite or affine."""
+        types = tuple(self.component_type(C) for C in self.components(S))
+        return None if None in types else tuple(sorted(types))
+
+    def is_elliptic(self, S) -> bool:
+        types = self.subdiagram_type(S)
+        return types is not None and not any(t[2] for t in types)
+
+    def is_parabolic(self, S) -> bool:
+        types = self.subdiagram_type(S)
+        return bool(types) and all(t[2] for t in types)
+
+    def finite_volume(self, rank: int) -> bool:
+        """Vinberg's criterion for the chamber in hyperbolic space of dimension `d = rank - 1`.
+
+        The chamber has finite volume iff the walls span, some elliptic
+        subdiagram of rank `d` or parabolic one of rank `d - 1` exists, and
+        every elliptic subdiagram of rank `d - 1` extends in exactly two ways to
+        an elliptic one of rank `d` or a parabolic one of rank `d - 1`.
+
+        Subdiagrams are walked depth first in index order; a branch is cut once
+        it has skipped more walls than a set of rank `d - 1` can leave out.
+        """
+        s, d = len(self), rank - 1
+        if s < rank or sum(inertia(self.gram)[:2]) < rank:
+            return False
+        low: list[tuple[int, ...]] = []
+        top: list[tuple[int, ...]] = []
+        parabolic: list[tuple[tuple[int, ...], tuple[frozenset[int], ...]]] = []
+
+        def visit(start: int, S: tuple[int, ...], components: tuple[frozenset[int], ...], nullity: int) -> None:
+            size = len(S)
+            if not nullity and size == d - 1:
+                low.append(S)
+            elif not nullity and size == d:
+                top.append(S)
+            elif nullity == len(components) and size - nullity == d - 1:
+                parabolic.append((S, components))
+            for j in range(start, s):
+                if j - size > s - d + 1 - nullity:
+                    break
+                touched = [C for C in components if self.adjacent[j] & C]
+                merged = frozenset({j}).union(*touched)
+                kind = self.component_type(merged)
+                if kind is None:
+                    continue
+                grown = nullity - sum(self.component_type(C)[2] for C in touched) + kind[2]
+                if size + 1 - grown > d:
+                    continue
+                visit(j + 1, S + (j,), tuple(C for C in components if not self.adjacent[j] & C) + (merged,), grown)
+
+        visit(0, (), (), 0)
+        if not top and not parabolic:
+            return False
+        extensions = {S: 0 for S in low}
+        for S in top:
+            for i in range(d):
+                extensions[S[:i] + S[i + 1 :]] += 1
+        for T, components in parabolic:
+            for removed in _choices(list(components)):
+                extensions[tuple(sorted(set(T) - removed))] += 1
+        return all(count == 2 for count in extensions.values())
+
+
+def _choices(components: list[frozenset[int]]) -> Iterator[set[int]]:
+    """Yield each way of picking one wall from every component."""
+    if not components:
+        yield set()
+        return
+    for rest in _choices(components[1:]):
+        for i in components[0]:
+            yield rest | {i}
+
+
+def _classify(diagram: CoxeterDiagram, C: list[int]) -> ComponentType | None:
+    k = len(C)
+    if k == 1:
+        return ("A", 1, False)
+    edges = [(i, j, diagram.labels[i][j]) for a, i in enumerate(C) for j in C[a + 1 :] if j in diagram.adjacent[i]]
+    labels = sorted(label for _, _, label in edges)
+    if labels[0] == DOTTED:
+        return None
+    if labels[0] == BOLD:
+        return ("A", 1, True) if k == 2 else None
+    degree = {i: len(diagram.adjacent[i] & set(C)) for i in C}
+    if len(edges) == k:
+        # A single cycle.
+        return ("A", k - 1, True) if labels[-1] == 3 and set(degree.values()) == {2} else None
+    if len(edges) > k:
+        return None
+    heavy = [label for label in labels if label > 3]
+    branches = [i for i in C if degree[i] >= 3]
+    if heavy == [6]:
+        if k == 2:
+            return ("G", 2, False)
+        return ("G", 2, True) if k == 3 else None
+    if not heavy:
+        if not branches:
+            return ("A", k, False)
+        if len(branches) == 1 and degree[branches[0]] == 4:
+            return ("D", 4, True) if k == 5 else None
+        if len(branches) == 1:
+            arms = tuple(sorted(len(arm) for arm in _arms(diagram, C, branches[0])))
+            if arms[:2] == (1, 1):
+                return ("D", k, False)
+            return _BRANCHED.get(arms)
+        if len(branches) == 2 and all(degree[b] == 3 for b in branches):
+            leaves = [sum(1 for j in diagram.adjacent[b] & set(C) if degree[j] == 1) for b in branches]
+            return ("D", k - 1, True) if leaves == [2, 2] else None
+        return None
+    if heavy == [4]:
+        (i, j) = next((i, j) for i, j, label in edges if label == 4)
+        if not branches:
+            path = _path(diagram, C)
+            at = min(path.index(i), path.index(j))
+            if at in (0, k - 2):
+                return ("B", k, False)
+            if k == 4:
+                return ("F", 4, False)
+            return ("F", 4, True) if k == 5 else None
+        if len(branches) == 1 and degree[branches[0]] == 3:
+            # Two short arms, and the double edge ends the third arm.
+            short = [arm for arm in _arms(diagram, C, branches[0]) if len(arm) == 1 and i not in arm and j not in arm]
+            return ("B", k - 1, True) if len(short) == 2 and 1 in (degree[i], degree[j]) else None
+        return None
+    if heavy == [4, 4] and not branches:
+        ends = [i for i, j, label in edges if label == 4 and 1 in (degree[i], degree[j])]
+        return ("C", k - 1, True) if len(ends) == 2 else None
+    return None
+
+
+def _path(diagram: CoxeterDiagram, C: list[int]) -> list[int]:
+    """The vertices of the path `C` in order from one end."""
+    inside = set(C)
+    path = [next(i for i in C if len(diagram.adjacent[i] & inside) <= 1)]
+    while len(path) < len(C):
+        path.append(next(j for j in diagram.adjacent[path[-1]] & inside if j not in path[-2:]))
+    return path
+
+
+def _arms(diagram: CoxeterDiagram, C: list[int], centre: int) -> list[list[int]]:
+    """The paths hanging off the branch vertex `centre` of the tree `C`."""
+    inside = set(C)
+    arms = []
+    for start in diagram.adjacent[centre] & inside:
+        arm, previous = [start], centre
+        while True:
+            step = [j for j in diagram.adjacent[arm[-1]] & inside if j != previous]
+            if len(step) != 1:
+                break
+            previous = arm[-1]
+            arm.append(step[0])
+        arms.append(arm)
+    return arms
@@ -0,0 +1,111 @@
+"""Finite quadratic discriminant forms `(L^vee / L, b, q)` of integral lattices.
+
+For a nondegenerate integer Gram matrix `G`, `L^vee / L = ZZ^n / G ZZ^n` in
+dual coordinates.  A Smith form `U G V = diag(d_1, ..., d_n)` splits it as
+`(+)_i ZZ/d_i`, and the dual vector `V e_i / d_i` generates the `i`-th factor.
+The values of `b` and `q` on those generators are computed once, exactly, as
+an integer "discriminant Gram" table over the exponent `m = d_n`; evaluating
+the forms afterwards only touches that `k x k` table.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Sequence
+
+import numpy as np
+
+from ._linalg import integer_matmul, smith_normal_form
+
+
+@dataclass(frozen=True)
+class DiscriminantForm:
+    """Discriminant form `(+)_i ZZ/invariants[i]` with its value table.
+
+    `gram[i][j] / exponent` is `b(g_i, g_j)` modulo 1 off the diagonal and
+    `q(g_i)` modulo `quadratic_modulus` on it, so for coordinate vectors `a`, `c`
+    `b(a, c) = a^T gram c / exponent (mod 1)` and
+    `q(a) = a^T gram a / exponent (mod quadratic_modulus)`.
+    Row `i` of `generators` times `1 / invariants[i]` is a dual-lattice lift of
+    `g_i` in the coordinates of `L`; conversely `projection` maps the dual
+    coordinates `y = G x` of `x in L^vee` to the coordinates of its class.
+    """
+
+    invariants: tuple[int, ...]
+    generators: np.ndarray
+    projection: np.ndarray
+    gram: np.ndarray
+    exponent: int
+    quadratic_modulus: int
+
+    def lift(self, coords: Sequence[int]) -> tuple[Fraction, ...]:
+        """Return a dual-lattice vector (in `L`-coordinates) representing `coords`."""
+        out = [Fraction(0)] * self.generators.shape[1]
+        for a, d, row in zip(coords, self.invariants, self.generators):
+            for j, v in enumerate(row):
+                out[j] += Fraction(int(a) * int(v), d)
+        return tuple(out)
+
+    def classes(self, Y: np.ndarray) -> np.ndarray:
+        """Return the class coordinates of the dual vectors with dual coordinates the rows of `Y`."""
+        if not self.invariants:
+            return np.zeros((Y.shape[0], 0), dtype=np.int64)
+        return integer_matmul(Y, self.projection.T) % np.array(self.invariants)
+
+    def action(self, G: np.ndarray, M: np.ndarray) -> np.ndarray:
+        """Images of the generators, as rows of class coordinates, under the isometry `x -> M x` of `G`."""
+        if not self.invariants:
+            return np.zeros((0, 0), dtype=np.int64)
+        # M g_i / d_i lies in L^vee, so its dual coordinates G M g_i / d_i are integral.
+        Y = integer_matmul(integer_matmul(self.generators, M.T), G)
+        d = np.array(self.invariants, dtype=object).reshape(-1, 1)
+        assert not (Y % d).any(), "M does not preserve the dual lattice."
+        return self.classes(Y // d).astype(np.int64)
+
+    def opposite(self) -> "DiscriminantForm":
+        """The form `-q`, i.e. the discriminant form of `L(-1)` on the same generators."""
+        gram = self.gram.copy()
+        for i in range(gram.shape[0]):
+            for j in range(gram.shape[1]):
+                gram[i, j] = -gram[i, j] % (self.quadratic_modulus * self.exponent if i == j else self.exponent)
+        return DiscriminantForm(self.invariants, self.generators, -self.projection, gram, self.exponent, self.quadratic_modulus)
+
+    def bilinear(self, x: Sequence[int], y: Sequence[int]) -> Fraction:
+        if not self.invariants:
+            return Fraction(0)
+        value = int(np.array(x, dtype=object) @ self.gram @ np.array(y, dtype=object))
+        return Fraction(value % self.exponent, self.exponent)
+
+    def quadratic(self, x: Sequence[int]) -> Fraction:
+        if not self.invariants:
+            return Fraction(0)
+        a = np.array(x, dtype=object)
+        value = int(a @ self.gram @ a)
+        return Fraction(value % (self.quadratic_modulus * self.exponent), self.exponent)
+
+
+def discriminant_form(G: np.ndarray) -> DiscriminantForm:
+    """Compute the discriminant form of a nondegenerate integer Gram matrix.
+
+    `q` is taken modulo 2 when `G` is even and modulo 1 otherwise.
+    """
+    n = G.shape[0]
+    G = G.astype(object)
+    diagonal, U, V = smith_normal_form(G)
+    assert all(diagonal), f"Discriminant form of a degenerate lattice is not finite: invariants={diagonal}"
+    keep = [i for i, d in enumerate(diagonal) if d > 1]
+    invariants = tuple(diagonal[i] for i in keep)
+    generators = V[:, keep].T.copy().reshape(len(keep), n)
+    exponent = invariants[-1] if invariants else 1
+    quadratic_modulus = 2 if all(int(G[i, i]) % 2 == 0 for i in range(n)) else 1
+    raw = generators @ G @ generators.T
+    k = len(keep)
+    gram = np.zeros((k, k), dtype=object)
+    for i in range(k):
+        for j in range(k):
+            # raw[i, j] / (d_i d_j) lies in (1 / gcd(d_i, d_j)) ZZ, hence in (1 / exponent) ZZ.
+            num = raw[i, j] * exponent // (invariants[i] * invariants[j])
+            gram[i, j] = num % (quadratic_modulus * exponent if i == j else exponent)
+    projection = U[keep, :].reshape(len(keep), n)
+    return DiscriminantForm(invariants, generators, projection, gram, exponent, quadratic_modulus)
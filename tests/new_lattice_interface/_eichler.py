@@ -0,0 +1,113 @@
+"""Eichler invariants of lattice vectors and invariant-based orbit buckets.
+
+For `x in L` let `div(x)` be the positive generator of the ideal `(x, L)`;
+then `x / div(x) in L^vee`.  The Eichler invariant of `x` is
+`(x.x, div(x), [x / div(x)] in L^vee / L)`.  When `L` splits off two
+hyperbolic planes `U ⊕ U`, Eichler's criterion says that primitive vectors
+lie in the same orbit of the stable orthogonal group (the kernel of
+`O(L) -> O(A_L)`) iff their invariants agree.  Those orbits can therefore be
+counted by bucketing invariants without applying the group at all.  `O(L)`
+orbits are coarser: `O(L)` acts on the class through its image in `O(A_L)`,
+which for even `L ⊇ U ⊕ U` is all of `O(q_L)` (Nikulin 1.14.2), so buckets
+whose classes are `O(q_L)`-equivalent merge.  `splits_hyperbolic_planes`
+certifies the hypothesis by exhibiting the planes.
+
+Invariants are computed for a batch of coordinate rows at once: one product
+`X G`, a row-wise gcd, and one product with the discriminant projection, i.e.
+`O(rank^2)` work per vector.
+"""
+
+from __future__ import annotations
+
+from itertools import islice
+from math import gcd
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from ._discriminant import DiscriminantForm
+from ._isotropic import primitive_isotropic_vectors
+from ._linalg import integer_matmul, smith_normal_form
+
+
+def eichler_invariants(G: np.ndarray, form: DiscriminantForm, X: np.ndarray) -> list[tuple[int, ...]]:
+    """Return `(x.x, div(x), *class(x / div(x)))` for each nonzero row `x` of `X`.
+
+    `G` is the integer Gram matrix of a nondegenerate lattice and `form` its
+    discriminant form.
+    """
+    GX = integer_matmul(X, G)
+    norms = (GX * X).sum(axis=1)
+    div = np.gcd.reduce(np.abs(GX), axis=1)
+    assert (div != 0).all(), "Eichler invariant of the zero vector is undefined."
+    classes = form.classes(GX // div[:, None])
+    return [
+        (int(n), int(d), *(int(c) for c in row))
+        for n, d, row in zip(norms.tolist(), div.tolist(), classes.tolist())
+    ]
+
+
+def eichler_classes(
+    G: np.ndarray, form: DiscriminantForm, vectors: Iterable[tuple[int, ...]], *, batch: int = 4096
+) -> dict[tuple[int, ...], tuple[tuple[int, ...], int]]:
+    """Bucket a stream of coordinate vectors by Eichler invariant.
+
+    Returns `invariant -> (representative, number of vectors seen)` with the
+    representative of least height `max_i |v_i|` (earliest on ties); the
+    stream is consumed in batches so it never needs to be materialised.
+    """
+    buckets: dict[tuple[int, ...], tuple[tuple[int, ...], int]] = {}
+    for chunk in _batches(iter(vectors), batch):
+        heights = [max(map(abs, v)) for v in chunk]
+        X = np.array(chunk, dtype=np.int64 if max(heights) < 2**31 else object)
+        for v, h, key in zip(chunk, heights, eichler_invariants(G, form, X)):
+            rep, count = buckets.get(key, (v, 0))
+            buckets[key] = (v if h < max(map(abs, rep)) else rep, count + 1)
+    return buckets
+
+
+def _batches(it: Iterator[tuple[int, ...]], size: int) -> Iterator[list[tuple[int, ...]]]:
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+
+def _hyperbolic_plane(G: np.ndarray, bound: int) -> tuple[np.ndarray, np.ndarray] | None:
+    """Return `(e, f)` spanning a copy of `U` in the even lattice `G`, or `None` if none is found.
+
+    `e` is a primitive isotropic vector of height at most `bound` with
+    `div(e) = 1`; a Bezout vector `f_0` with `(e, f_0) = 1` is moved to the
+    isotropic `f = f_0 - (f_0.f_0 / 2) e`.
+    """
+    if G.shape[0] < 2:
+        return None
+    for v in primitive_isotropic_vectors(G, bound):
+        e = np.array(v, dtype=object)
+        Ge = G.astype(object) @ e
+        if gcd(*(int(c) for c in Ge)) != 1:
+            continue
+        _, U, V = smith_normal_form(Ge.reshape(1, -1))
+        f = U[0, 0] * V[:, 0]
+        f = f - (int(f @ G.astype(object) @ f) // 2) * e
+        return e, f
+    return None
+
+
+def splits_hyperbolic_planes(G: np.ndarray, count: int, *, bound: int = 1) -> bool:
+    """Whether the even lattice `G` is found to split off `count` copies of `U`.
+
+    Each plane is looked for among the isotropic vectors of height at most
+    `bound` of the current complement; `U` is unimodular, so its orthogonal
+    complement is a direct summand, spanned by the kernel of `x -> (Ge, Gf).x`.
+    `False` only means no such splitting was found within the bound.
+    """
+    G = np.asarray(G).astype(object)
+    for _ in range(count):
+        plane = _hyperbolic_plane(G, bound)
+        if plane is None:
+            return False
+        e, f = plane
+        _, _, V = smith_normal_form(np.array([G @ e, G @ f], dtype=object))
+        K = V[:, 2:]
+        G = K.T @ G @ K
+    return True
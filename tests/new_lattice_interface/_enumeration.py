@@ -0,0 +1,269 @@
+"""Fincke–Pohst / Schnorr–Euchner enumeration of short vectors in definite lattices.
+
+All routines take a positive-definite *integer* Gram matrix `G` (callers scale
+rational or negative-definite Gram matrices first).  The search tree is walked
+in floating point on the Cholesky data of `G`; every reported vector is
+re-checked exactly on `G`, and the float radius carries a relative slack so no
+vector within the exact bound is lost to rounding.
+"""
+
+from __future__ import annotations
+
+from math import ceil, floor, sqrt
+from typing import Iterator
+
+import numpy as np
+
+_RADIUS_SLACK = 1e-9
+
+
+def fincke_pohst_coefficients(G: np.ndarray) -> list[list[float]]:
+    """Return `q` with `x^T G x = sum_i q[i][i] (x_i + sum_{j>i} q[i][j] x_j)^2`.
+
+    Raises `AssertionError` if `G` is not positive definite.
+    """
+    n = G.shape[0]
+    q = [[float(G[i, j]) for j in range(n)] for i in range(n)]
+    for i in range(n):
+        assert q[i][i] > 0, f"Gram matrix is not positive definite: pivot {i} is {q[i][i]}"
+        for j in range(i + 1, n):
+            q[j][i] = q[i][j]
+            q[i][j] = q[i][j] / q[i][i]
+        for k in range(i + 1, n):
+            for j in range(k, n):
+                q[k][j] -= q[k][i] * q[i][j]
+    return q
+
+
+class ShortVectorEnumerator:
+    """Schnorr–Euchner enumeration of `x != 0` with `x^T G x <= radius`, up to sign.
+
+    Coordinates at each level are visited in zig-zag order around the
+    projected centre, so a level is abandoned at the first value that exceeds
+    the radius.  `radius` may be lowered while iterating (e.g. to search for a
+    shortest vector); the new bound prunes the remaining tree immediately.
+    Of each pair `±x` only the one whose last nonzero coordinate is positive
+    is produced.
+    """
+
+    def __init__(self, G: np.ndarray, radius: int):
+        self.G = G.astype(object)
+        self.radius = int(radius)
+        self._q = fincke_pohst_coefficients(G)
+
+    def exact_norm(self, x: list[int]) -> int:
+        v = np.array(x, dtype=object)
+        return int(v @ self.G @ v)
+
+    def __iter__(self) -> Iterator[tuple[tuple[int, ...], int]]:
+        q = self._q
+        n = len(q)
+        if n == 0:
+            return
+        x = [0] * n
+        center = [0.0] * n
+        dx = [0] * n
+        ddx = [0] * n
+        partial = [0.0] * (n + 1)
+        i = n - 1
+        while True:
+            y = x[i] - center[i]
+            length = partial[i + 1] + q[i][i] * y * y
+            if length <= self.radius * (1 + _RADIUS_SLACK) + _RADIUS_SLACK:
+                if i > 0:
+                    partial[i] = length
+                    i -= 1
+                    c = -sum(q[i][j] * x[j] for j in range(i + 1, n))
+                    center[i] = c
+                    x[i] = round(c)
+                    dx[i] = ddx[i] = 1 if c >= x[i] else -1
+                    continue
+                if partial[1] != 0.0 or x[0] != 0:
+                    norm = self.exact_norm(x)
+                    if 0 < norm <= self.radius:
+                        yield tuple(x), norm
+            else:
+                i += 1
+                if i == n:
+                    return
+            if partial[i + 1] != 0.0:
+                x[i] += dx[i]
+                ddx[i] = -ddx[i]
+                dx[i] = ddx[i] - dx[i]
+            else:
+                x[i] += 1
+
+
+def find_shortest_vector(G: np.ndarray) -> tuple[tuple[int, ...], int]:
+    """Return `(x, x^T G x)` for a shortest nonzero `x`, shrinking the radius on each hit."""
+    n = G.shape[0]
+    assert n > 0, "Shortest vector of the zero lattice is undefined."
+    best_index = min(range(n), key=lambda i: G[i, i])
+    best = tuple(1 if j == best_index else 0 for j in range(n))
+    enumerator = ShortVectorEnumerator(G, int(G[best_index, best_index]))
+    best_norm = enumerator.radius
+    for x, norm in enumerator:
+        if norm < best_norm:
+            best, best_norm = x, norm
+            enumerator.radius = norm
+    return best, best_norm
+
+
+def close_vectors(
+    G: np.ndarray,
+    center,
+    radius,
+    *,
+    nonnegative: int = 0,
+    box: int | None = None,
+    part: tuple[int, int] = (0, 1),
+) -> Iterator[tuple[int, ...]]:
+    """Yield every integer `x` with `(x - c)^T G (x - c) <= radius` for a real centre `c`.
+
+    Only `x` with `x_i >= 0` for `i < nonnegative`, and `|x_i| <= box` when a
+    box is given, are visited; the constraints prune the walk at the level
+    where `x_i` is fixed, so the cost follows the box.  `part = (p, q)` keeps
+    every `q`-th admissible value of the outermost coordinate starting at the
+    `p`-th, so `q` calls split one walk.  The walk runs in floating point with
+    the usual radius slack, so it may also yield a few vectors just outside
+    the bound; callers re-check exactly.
+    """
+    q = fincke_pohst_coefficients(G)
+    n = len(q)
+    if n == 0:
+        yield ()
+        return
+    c = [float(v) for v in center]
+    bound = float(radius) * (1 + _RADIUS_SLACK) + _RADIUS_SLACK
+    x = [0] * n
+    partial = [0.0] * (n + 1)
+    middle = [0.0] * n
+    upper = [0] * n
+
+    def start(i: int) -> None:
+        m = c[i] - sum(q[i][j] * (x[j] - c[j]) for j in range(i + 1, n))
+        width = sqrt(max(bound - partial[i + 1], 0.0) / q[i][i])
+        middle[i] = m
+        lower = 0 if i < nonnegative else None if box is None else -box
+        x[i] = ceil(m - width) if lower is None else max(ceil(m - width), lower)
+        upper[i] = floor(m + width) if box is None else min(floor(m + width), box)
+
+    i = n - 1
+    start(i)
+    x[i] += part[0]
+    while True:
+        if x[i] > upper[i]:
+            i += 1
+            if i == n:
+                return
+            x[i] += part[1] if i == n - 1 else 1
+            continue
+        y = x[i] - middle[i]
+        partial[i] = partial[i + 1] + q[i][i] * y * y
+        if i == 0:
+            yield tuple(x)
+            x[0] += part[1] if n == 1 else 1
+            continue
+        i -= 1
+        start(i)
+
+
+def _prefixes(q: list[list[float]], radius: int) -> Iterator[tuple[list[int], float]]:
+    """Fincke–Pohst walk over coordinates `x_{n-1}, ..., x_1` (with `x_0 = 0`).
+
+    Yields each admissible prefix with its partial length, one of each `±x`.
+    """
+    n = len(q)
+    bound = radius * (1 + _RADIUS_SLACK) + _RADIUS_SLACK
+    x = [0] * n
+    partial = [0.0] * (n + 1)
+    center = [0.0] * n
+    upper = [0] * n
+    if n == 1:
+        yield x, 0.0
+        return
+
+    def start(i: int) -> None:
+        c = -sum(q[i][j] * x[j] for j in range(i + 1, n))
+        width = sqrt(max(bound - partial[i + 1], 0.0) / q[i][i])
+        center[i] = c
+        x[i] = max(ceil(c - width), 0) if partial[i + 1] == 0.0 else ceil(c - width)
+        upper[i] = floor(c + width)
+
+    i = n - 1
+    start(i)
+    while True:
+        if x[i] > upper[i]:
+            x[i] = 0
+            i += 1
+            if i == n:
+                return
+            x[i] += 1
+            continue
+        y = x[i] - center[i]
+        partial[i] = partial[i + 1] + q[i][i] * y * y
+        if i == 1:
+            yield x, partial[1]
+            x[i] += 1
+            continue
+        i -= 1
+        start(i)
+
+
+def norm_counts(G: np.ndarray, radius: int, *, batch: int = 4096) -> np.ndarray:
+    """Return `c` with `c[k] = #{x : x^T G x = k}` for `0 <= k <= radius`.
+
+    The tree is walked down to the second coordinate only.  For a fixed prefix
+    `x'` the norm of `x' + t e_0` is the exact integer quadratic
+    `N(x') + 2 t (G x')_0 + t^2 G_00`, so prefixes are buffered and the whole
+    admissible range of `t` for a batch of them is evaluated and histogrammed
+    with array operations.
+    """
+    radius = int(radius)
+    counts = np.zeros(radius + 1, dtype=np.int64)
+    counts[0] = 1
+    n = G.shape[0]
+    if n == 0 or radius <= 0:
+        return counts
+    q = fincke_pohst_coefficients(G)
+    bound = radius * (1 + _RADIUS_SLACK) + _RADIUS_SLACK
+    gmax = max(abs(int(v)) for v in G.flat)
+    # Admissible coordinates satisfy |x_i| <= sqrt(radius * (G^-1)_ii).
+    xmax = float(np.sqrt(radius * np.abs(np.diag(np.linalg.inv(G.astype(np.float64))))).max()) + 1
+    dtype = np.int64 if n * n * gmax * xmax * xmax < 2**62 else object
+    Gd = G.astype(dtype)
+    g00 = int(G[0, 0])
+    prefixes: list[list[int]] = []
+    ranges: list[tuple[int, int]] = []
+
+    def flush() -> None:
+        X = np.array(prefixes, dtype=dtype)
+        lo = np.array([r[0] for r in ranges], dtype=np.int64)
+        lengths = np.array([r[1] - r[0] + 1 for r in ranges], dtype=np.int64)
+        GX = X @ Gd
+        a = (GX * X).sum(axis=1)
+        b = GX[:, 0]
+        owner = np.repeat(np.arange(len(prefixes)), lengths)
+        offsets = np.cumsum(lengths) - lengths
+        t = (lo[owner] + np.arange(int(lengths.sum())) - offsets[owner]).astype(dtype)
+        norms = a[owner] + 2 * b[owner] * t + g00 * t * t
+        norms = norms[norms <= radius].astype(np.int64)
+        counts[:] += 2 * np.bincount(norms, minlength=radius + 1)
+        prefixes.clear()
+        ranges.clear()
+
+    for x, part in _prefixes(q, radius):
+        c = -sum(q[0][j] * x[j] for j in range(1, n))
+        width = sqrt(max(bound - part, 0.0) / q[0][0])
+        lo, hi = ceil(c - width), floor(c + width)
+        if part == 0.0:
+            lo = max(lo, 1)
+        if lo > hi:
+            continue
+        prefixes.append(list(x))
+        ranges.append((lo, hi))
+        if len(prefixes) >= batch:
+            flush()
+    if prefixes:
+        flush()
+    return counts
@@ -0,0 +1,92 @@
+"""Isometry fingerprints and the pre-screen in front of exact isometry searches.
+
+A fingerprint collects invariants that are cheap once per lattice and then
+free to compare: signature, determinant and genus symbol, and for definite
+lattices the theta series up to twice the minimum together with the pairing
+profile of the minimal vectors.  The profile is the degree sequence of the
+"Gram graph" on the minimal vectors: for each minimal `v`, the counts of the
+values `(v, w)` over all minimal `w`, taken as a multiset over `v`.  It
+separates lattices with equal theta series such as `E8 + E8` and `D16+`.
+
+Isometric lattices have equal fingerprints, so in batch classification
+almost every non-isometric pair is rejected without a search.
+`IsometryScreen` counts the comparisons, the rejections, and the searches
+that still had to run, so the pre-screen's hit rate can be read off.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Hashable
+
+import numpy as np
+
+from ._isometry import ShortVectors
+
+PairingProfile = tuple[tuple[tuple[tuple[int, int], ...], int], ...]
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """Isometry invariants of a lattice; `theta` and `profile` are empty for indefinite lattices."""
+
+    signature: tuple[int, int]
+    determinant: Fraction
+    genus: Hashable
+    theta: tuple[int, ...] = ()
+    profile: PairingProfile = ()
+
+
+def pairing_profile(short: ShortVectors, norm: int) -> PairingProfile:
+    """Degree sequence of the Gram graph on the vectors of `short` with the given norm."""
+    level = np.flatnonzero(short.norms == norm)
+    P = short.paired[level] @ short.vectors[level].T
+    rows = []
+    for row in P:
+        values, counts = np.unique(row, return_counts=True)
+        rows.append(tuple(zip(values.tolist(), counts.tolist())))
+    return tuple(sorted(Counter(rows).items()))
+
+
+@dataclass
+class IsometryScreen:
+    """Counters of the fingerprint pre-screen.
+
+    `compared` pairs went through the screen and `rejected` of them were told
+    apart by fingerprints alone; `searched` exact searches ran on the rest and
+    `isometric` of those found an isometry.
+    """
+
+    compared: int = 0
+    rejected: int = 0
+    searched: int = 0
+    isometric: int = 0
+
+    def admits(self, a: Fingerprint, b: Fingerprint) -> bool:
+        """Count one comparison; `False` if the fingerprints already rule out an isometry."""
+        self.compared += 1
+        if a != b:
+            self.rejected += 1
+            return False
+        return True
+
+    def record(self, isometric: bool) -> bool:
+        """Count one exact search and pass its answer through."""
+        self.searched += 1
+        self.isometric += isometric
+        return isometric
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of compared pairs rejected without a search."""
+        return self.rejected / self.compared if self.compared else 0.0
+
+    @property
+    def collisions(self) -> int:
+        """Searched pairs that matched fingerprints but were not isometric."""
+        return self.searched - self.isometric
+
+    def reset(self) -> None:
+        self.compared = self.rejected = self.searched = self.isometric = 0
@@ -0,0 +1,199 @@
+"""Orthogonal groups `O(q)` of finite quadratic forms, as permutation groups.
+
+The elements of `A = (+)_i ZZ/d_i` are listed once in mixed-radix order, so
+the index of `a` is `sum_i a_i s_i` with `s_i = d_{i+1} ... d_k`, and every
+element carries its order, its `q`-value and its pairing row.
+
+An isometry `s` is determined by the images `h_i = s(g_i)` of the Smith
+generators.  They must satisfy `ord h_i = d_i`, `q(h_i) = q(g_i)` and
+`b(h_i, h_j) = b(g_i, g_j)`; conversely such images define an isometry
+(`d_i h_i = 0` makes the map well defined, and preserving the nondegenerate
+`b` makes it injective).  Images are chosen level by level from the elements
+of the right order and `q`-value; fixing `h_i` filters the lists of all later
+levels by their pairing with `h_i`, and the sizes the same filtering leaves
+for the generators themselves prune dead branches, as in `_isometry`.  The
+group is built up the stabilizer chain of `g_0, g_1, ...` exactly as
+`_isometry.automorphism_group` does for lattices, which yields its order and
+a generating set.
+
+Group elements are `k x k` matrices `H` with rows `h_i`, acting on coordinate
+rows by `a -> a H` (mod `d`), and each also induces a permutation of the
+element list.  For membership every level keeps the orbit of `g_i` under the
+stabilizer of `g_0, ..., g_{i-1}`, keyed by element index, with the inverse of
+a coset representative for each orbit point; sifting an automorphism costs
+one hash lookup and one `k x k` product per level.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ._discriminant import DiscriminantForm
+from ._isometry import _orbit
+
+
+@dataclass(frozen=True)
+class FormElements:
+    """Every element of a discriminant form, in mixed-radix order, with its order, `q`-value and pairing row.
+
+    `values[x]` is the numerator of `q(x)` over the exponent; `paired[x] @ c`
+    is the numerator of `b(x, c)` over the exponent for a coordinate row `c`.
+    """
+
+    form: DiscriminantForm
+    moduli: np.ndarray
+    strides: np.ndarray
+    coords: np.ndarray
+    orders: np.ndarray
+    values: np.ndarray
+    paired: np.ndarray
+
+    @classmethod
+    def of(cls, form: DiscriminantForm) -> "FormElements":
+        d = np.array(form.invariants, dtype=np.int64)
+        k = len(d)
+        strides = np.array([int(np.prod(d[i + 1 :])) for i in range(k)], dtype=np.int64)
+        coords = (np.arange(int(np.prod(d)), dtype=np.int64)[:, None] // strides) % d
+        orders = np.lcm.reduce(d // np.gcd(coords, d), axis=1) if k else np.ones(1, dtype=np.int64)
+        paired = coords @ form.gram.astype(np.int64)
+        values = (paired * coords).sum(axis=1) % (form.quadratic_modulus * form.exponent)
+        return cls(form, d, strides, coords, orders, values, paired)
+
+    def index(self, rows: np.ndarray) -> np.ndarray:
+        return (rows % self.moduli) @ self.strides
+
+    def basis(self) -> list[int]:
+        """Indices of the Smith generators `g_0, ..., g_{k-1}`."""
+        return [int(s) for s in self.strides]
+
+    def apply(self, H: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        return (rows @ H) % self.moduli
+
+    def permutation(self, H: np.ndarray) -> np.ndarray:
+        return self.index(self.coords @ H)
+
+    def inverse(self, H: np.ndarray) -> np.ndarray:
+        inverse = np.argsort(self.permutation(H))
+        return self.coords[inverse[self.basis()]]
+
+
+def _compatible(E: FormElements, rest: np.ndarray, x: int, i: int, j: int) -> np.ndarray:
+    """Candidates `rest` for `g_j` whose pairing with the image `x` of `g_i` is `b(g_j, g_i)`."""
+    exponent = E.form.exponent
+    return rest[(E.paired[rest] @ E.coords[x]) % exponent == int(E.form.gram[j, i]) % exponent]
+
+
+def _fix_prefix(E: FormElements, levels: list[np.ndarray], prefix: list[int]) -> list[np.ndarray]:
+    out = list(levels)
+    for i, x in enumerate(prefix):
+        for j in range(i + 1, len(out)):
+            out[j] = _compatible(E, out[j], x, i, j)
+    return out
+
+
+def _profile(E: FormElements, levels: list[np.ndarray]) -> list[list[int]]:
+    """`sizes[i][j]`: candidates of level `j > i` left once `g_0, ..., g_i` are fixed."""
+    basis = E.basis()
+    sizes = []
+    for i in range(len(levels)):
+        for j in range(i + 1, len(levels)):
+            levels[j] = _compatible(E, levels[j], basis[i], i, j)
+        sizes.append([len(level) for level in levels])
+    return sizes
+
+
+def _search(E: FormElements, sizes: list[list[int]], levels: list[np.ndarray], chosen: list[int]) -> list[int] | None:
+    """Extend the images `chosen` of `g_0, g_1, ...` to a full isometry."""
+    depth = len(chosen)
+    k = len(levels)
+    if depth == k:
+        return chosen
+    for x in levels[depth]:
+        narrowed = []
+        for j in range(depth + 1, k):
+            rest = _compatible(E, levels[j], int(x), depth, j)
+            if len(rest) != sizes[depth][j]:
+                break
+            narrowed.append(rest)
+        else:
+            found = _search(E, sizes, levels[: depth + 1] + narrowed, chosen + [int(x)])
+            if found is not None:
+                return found
+    return None
+
+
+@dataclass(frozen=True)
+class FormOrthogonalGroup:
+    """`O(q)` by a strong generating set: `generators[t]` fixes `g_0, ..., g_{found[t] - 1}`."""
+
+    elements: FormElements
+    generators: tuple[np.ndarray, ...]
+    found: tuple[int, ...]
+    order: int
+    _transversals: list[dict[int, np.ndarray]] = field(default_factory=list, compare=False, repr=False)
+
+    @classmethod
+    def of(cls, E: FormElements) -> "FormOrthogonalGroup":
+        d = E.moduli
+        k = len(d)
+        basis = E.basis()
+        levels = [np.flatnonzero((E.orders == d[i]) & (E.values == E.values[basis[i]])) for i in range(k)]
+        sizes = _profile(E, list(levels))
+        generators: list[np.ndarray] = []
+        permutations: list[np.ndarray] = []
+        found: list[int] = []
+        order = 1
+        for i in reversed(range(k)):
+            prefixed = _fix_prefix(E, levels, basis[:i])
+            orbit = _orbit(basis[i], permutations)
+            excluded: set[int] = set()
+            for c in prefixed[i].tolist():
+                if c in orbit or c in excluded:
+                    continue
+                images = _search(E, sizes, prefixed[:i] + [np.array([c])] + prefixed[i + 1 :], basis[:i])
+                if images is None:
+                    excluded |= _orbit(c, permutations)
+                    continue
+                generators.append(E.coords[images])
+                permutations.append(E.permutation(generators[-1]))
+                found.append(i)
+                orbit = _orbit(basis[i], permutations)
+            order *= len(orbit)
+        return cls(E, tuple(generators), tuple(found), order)
+
+    def identity(self) -> np.ndarray:
+        return np.eye(len(self.elements.moduli), dtype=np.int64)
+
+    def transversals(self) -> list[dict[int, np.ndarray]]:
+        """Per level `i`: each point `y` of the orbit of `g_i` under the stabilizer of `g_0, ..., g_{i-1}`,
+        mapped to the inverse of an element carrying `g_i` to `y` (computed once)."""
+        if not self._transversals:
+            E = self.elements
+            inverses = [E.inverse(S) for S in self.generators]
+            for i, start in enumerate(E.basis()):
+                level = [(S, S_inv) for S, S_inv, t in zip(self.generators, inverses, self.found) if t >= i]
+                reps = {start: self.identity()}
+                todo = [start]
+                while todo:
+                    y = todo.pop()
+                    for S, S_inv in level:
+                        z = int(E.index(E.coords[y] @ S))
+                        if z not in reps:
+                            # u carries g_i to y, so S u carries it to z, with inverse u^{-1} S^{-1}.
+                            reps[z] = E.apply(reps[y], S_inv)
+                            todo.append(z)
+                self._transversals.append(reps)
+        return self._transversals
+
+    def contains(self, H: np.ndarray) -> bool:
+        """Sift the automorphism with generator images `H` through the stabilizer chain."""
+        E = self.elements
+        H = np.asarray(H, dtype=np.int64) % E.moduli
+        for i, reps in enumerate(self.transversals()):
+            inverse = reps.get(int(E.index(H[i])))
+            if inverse is None:
+                return False
+            H = E.apply(inverse, H)
+        return True
@@ -0,0 +1,362 @@
+"""Genus symbols of integral lattices from local Jordan decompositions.
+
+Two nondegenerate integral lattices lie in the same genus iff they have the
+same signature and are isometric over `ZZ_p` for every prime `p`; only the
+primes dividing `2 det` carry information beyond the determinant.
+
+Over `ZZ_p` a Gram matrix splits as an orthogonal sum of Jordan constituents
+`p^s f_s` with `f_s` unimodular.  The splitting is computed by symmetric
+elimination modulo `p^N`, `N = v_p(det) + 3`, which is enough precision to
+read every constituent's unit part modulo 8: an entry of least valuation on
+the diagonal is a `1 x 1` pivot, and otherwise (only for `p = 2`) an
+off-diagonal one spans a `2 x 2` pivot block of even type.  For odd `p`
+an off-diagonal minimum is first moved onto the diagonal by `x_i += x_j`.
+
+For odd `p` the constituents `(s, dim, (det f_s / p))` form the canonical
+`p`-adic symbol.  For `p = 2` each constituent also records its type (`I`
+when `f_s` is odd) and its oddity, the trace mod 8 of a diagonalization.
+The Conway--Sloane canonical form then fuses oddities over compartments
+(maximal runs of consecutive type `I` constituents) and walks all signs of a
+train to its first constituent.
+
+Local symbols are cached by Gram matrix and prime, so rebuilding the genus
+of a lattice seen before (or of one that shares a Gram matrix) does no
+elimination.
+
+The mass `sum 1 / |O(L_i)|` of a definite genus follows Conway--Sloane
+(*Low-dimensional lattices IV*): the standard mass times the ratio of local
+to standard `p`-masses at each `p | 2 det`.  Every factor is computed
+exactly; the powers of `pi` cancel by construction and are never formed, and
+the square roots (of the conductor of `chi_D` and of odd cross-term powers)
+are removed by taking the square root of the exact squared mass.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from math import comb, factorial, isqrt
+
+import numpy as np
+
+from ._linalg import bareiss_determinant
+
+LocalSymbol = tuple[tuple[int, ...], ...]
+
+
+@dataclass(frozen=True)
+class GenusSymbol:
+    """Hashable genus of a lattice with Gram matrix `N / scale`, `N` integral.
+
+    `local` holds `(p, symbol)` for each prime `p | 2 det N`, in increasing
+    order.  Odd `p` constituents are `(s, dim, epsilon)`; `2`-adic ones are
+    `(s, dim, epsilon, type, oddity)` with `type` `1` for odd constituents.
+    """
+
+    signature: tuple[int, int]
+    determinant: Fraction
+    scale: int
+    local: tuple[tuple[int, LocalSymbol], ...]
+
+    def local_symbol(self, p: int) -> LocalSymbol:
+        """The canonical `p`-adic symbol; for `p ∤ 2 det` a single unimodular constituent."""
+        for q, symbol in self.local:
+            if q == p:
+                return symbol
+        n = sum(self.signature)
+        return ((0, n, _legendre(int(self.determinant * self.scale**n), p)),)
+
+    def __str__(self) -> str:
+        parts = [f"({self.signature[0]},{self.signature[1]})"]
+        for p, symbol in self.local:
+            parts.append(f"[{p}]")
+            for c in symbol:
+                text = f"{p ** c[0]}^{'+' if c[2] > 0 else '-'}{c[1]}"
+                if p == 2:
+                    text += f"_{c[4]}" if c[3] else "_II"
+                parts.append(text)
+        return " ".join(parts)
+
+
+def genus_symbol(G: np.ndarray, signature: tuple[int, int], determinant: Fraction, scale: int = 1) -> GenusSymbol:
+    """Genus of the lattice with Gram matrix `G / scale` (`G` an integer array)."""
+    rows = tuple(tuple(int(v) for v in row) for row in G)
+    det = abs(bareiss_determinant(G.astype(object)))
+    assert det, "Genus symbol of a degenerate lattice is undefined."
+    local = tuple((p, local_symbol(rows, p)) for p in _prime_divisors(2 * det))
+    return GenusSymbol(signature, determinant, scale, local)
+
+
+@lru_cache(maxsize=4096)
+def local_symbol(rows: tuple[tuple[int, ...], ...], p: int) -> LocalSymbol:
+    """Canonical `p`-adic symbol of the integer Gram matrix `rows`."""
+    G = np.array(rows, dtype=object).reshape(len(rows), len(rows))
+    constituents = _jordan_constituents(G, p)
+    if p != 2:
+        return tuple((s, n, _legendre(d, p)) for s, (n, d, _, _) in sorted(constituents.items()))
+    symbol = [[s, n, d % 8, odd, oddity % 8] for s, (n, d, odd, oddity) in sorted(constituents.items())]
+    return tuple(tuple(c) for c in _canonical_2_adic(symbol))
+
+
+def _valuation(x: int, p: int, cap: int) -> int:
+    if x == 0:
+        return cap
+    v = 0
+    while x % p == 0 and v < cap:
+        x //= p
+        v += 1
+    return v
+
+
+def _jordan_constituents(G: np.ndarray, p: int) -> dict[int, tuple[int, int, int, int]]:
+    """Return `s -> (dim, unit det, type I flag, sum of 1 x 1 units)` of the `p`-adic Jordan splitting."""
+    n = G.shape[0]
+    cap = _valuation(bareiss_determinant(G), p, 1 << 30) + 3
+    q = p**cap
+    M = G % q
+    active = list(range(n))
+    out: dict[int, list[int]] = {}
+    while active:
+        A = np.array(active)
+        sub = M[np.ix_(A, A)]
+        values = [[_valuation(int(x), p, cap) for x in row] for row in sub]
+        v = min(min(row) for row in values)
+        assert v < cap, "Jordan splitting lost precision; the Gram matrix is degenerate."
+        i = next((t for t in range(len(A)) if values[t][t] == v), None)
+        if i is None and p != 2:
+            # Move an off-diagonal minimum onto the diagonal: x_i += x_j.
+            i, j = next((a, b) for a in range(len(A)) for b in range(len(A)) if values[a][b] == v)
+            M[A[i], :] = (M[A[i], :] + M[A[j], :]) % q
+            M[:, A[i]] = (M[:, A[i]] + M[:, A[j]]) % q
+        pv = p**v
+        entry = out.setdefault(v, [0, 1, 0, 0])
+        if i is not None:
+            k = A[i]
+            u = int(M[k, k]) // pv
+            c = M[A, k]
+            M[np.ix_(A, A)] = (M[np.ix_(A, A)] - np.outer((c // pv) * pow(u, -1, q) % q, c)) % q
+            entry[0] += 1
+            entry[1] *= u
+            entry[2] = 1
+            entry[3] += u
+            active.remove(k)
+            continue
+        a, b = next((a, b) for a in range(len(A)) for b in range(a + 1, len(A)) if values[a][b] == v)
+        k, l = A[a], A[b]
+        x, y, z = int(M[k, k]) // pv, int(M[k, l]) // pv, int(M[l, l]) // pv
+        w = x * z - y * y
+        C = M[np.ix_(A, [k, l])] // pv
+        adjugate = np.array([[z, -y], [-y, x]], dtype=object)
+        M[np.ix_(A, A)] = (M[np.ix_(A, A)] - pv * (C @ adjugate @ C.T) * pow(w, -1, q)) % q
+        entry[0] += 2
+        entry[1] *= w
+        active.remove(k)
+        active.remove(l)
+    return {s: (n_s, d % p**3 if p == 2 else d % p, odd, oddity) for s, (n_s, d, odd, oddity) in out.items()}
+
+
+def _canonical_2_adic(symbol: list[list[int]]) -> list[list[int]]:
+    """Conway--Sloane canonical form of a `2`-adic symbol `[s, dim, det mod 8, type, oddity]`."""
+    for c in symbol:
+        c[2] = 1 if c[2] in (1, 7) else -1
+    compartments: list[list[int]] = []
+    for i, c in enumerate(symbol):
+        if not c[3]:
+            continue
+        if compartments and compartments[-1][-1] == i - 1 and symbol[i - 1][0] == c[0] - 1:
+            compartments[-1].append(i)
+        else:
+            compartments.append([i])
+    for compartment in compartments:
+        total = sum(symbol[i][4] for i in compartment) % 8
+        for i in compartment:
+            symbol[i][4] = 0
+        symbol[compartment[0]][4] = total
+    # A train continues across a gap of one zero-dimensional constituent only between odd constituents.
+    trains: list[list[int]] = [[0]]
+    for i in range(1, len(symbol)):
+        prev, cur = symbol[i - 1], symbol[i]
+        gap = cur[0] - prev[0]
+        if gap > 2 or (gap == 2 and not (cur[3] and prev[3])) or not (cur[3] or prev[3]):
+            trains.append([i])
+        else:
+            trains[-1].append(i)
+    for train in trains:
+        for t in reversed(train[1:]):
+            if symbol[t][2] == -1:
+                symbol[t][2] = 1
+                symbol[t - 1][2] *= -1
+                for compartment in compartments:
+                    if t - 1 in compartment or t in compartment:
+                        symbol[compartment[0]][4] = (symbol[compartment[0]][4] + 4) % 8
+    return symbol
+
+
+def genus_mass(genus: GenusSymbol) -> Fraction:
+    """Mass of a definite genus, i.e. `sum 1 / |O(L)|` over its isometry classes."""
+    n = sum(genus.signature)
+    assert 0 in genus.signature and n > 0, f"Mass is only defined for definite genera: signature={genus.signature}"
+    if n == 1:
+        # The Conway--Sloane formula needs n >= 2; a rank-one genus is the single class <d> with O(L) = {±1}.
+        return Fraction(1, 2)
+    d = abs(int(genus.determinant * genus.scale**n))
+    s = (n + 1) // 2
+    # Standard mass without its powers of pi: 2 prod Gamma(j / 2) prod_{k < s} zeta(2k) [L(s, chi_D)].
+    square = Fraction(4)
+    for j in range(1, n + 1):
+        square *= Fraction(factorial(j // 2 - 1)) ** 2 if j % 2 == 0 else Fraction(_double_factorial(j - 2), 2 ** ((j - 1) // 2)) ** 2
+    for k in range(1, s):
+        square *= _zeta(2 * k) ** 2
+    D0 = 1
+    if n % 2 == 0:
+        D0 = _fundamental_discriminant((-1) ** s * d)
+        value, conductor = _quadratic_l_value(s, D0)
+        square *= value**2 * conductor
+    for p in _prime_divisors(2 * d):
+        symbol = genus.local_symbol(p)
+        standard = 2 * _euler_product(p, s)
+        if n % 2 == 0:
+            standard *= 1 - _kronecker(D0, p) * Fraction(1, p**s)
+        local, cross = _local_mass(p, symbol)
+        square *= (local * standard) ** 2 * Fraction(p) ** cross
+    return Fraction(_exact_sqrt(square.numerator), _exact_sqrt(square.denominator))
+
+
+def _local_mass(p: int, symbol: LocalSymbol) -> tuple[Fraction, int]:
+    """`p`-mass `m_p` as `(rational part, e)` with `m_p = rational part * p^(e / 2)`."""
+    mass = Fraction(1)
+    for species in _species(p, symbol):
+        mass *= _diagonal_factor(p, species)
+    cross = sum((b[0] - a[0]) * a[1] * b[1] for i, b in enumerate(symbol) for a in symbol[:i])
+    if p == 2:
+        type_ii = sum(c[1] for c in symbol if not c[3])
+        odd_pairs = sum(1 for a, b in zip(symbol, symbol[1:]) if a[3] and b[3] and a[0] + 1 == b[0])
+        mass *= Fraction(2) ** (odd_pairs - type_ii)
+    return mass, cross
+
+
+def _species(p: int, symbol: LocalSymbol) -> list[int]:
+    """Conway--Sloane species of the Jordan constituents (signed for even orthogonal groups)."""
+    if p != 2:
+        return [-n if n % 2 == 0 and _legendre(-1, p) ** (n // 2) * eps == -1 else n for _, n, eps in symbol]
+    # Every scale counts at 2, including zero-dimensional constituents next to odd ones.
+    by_scale = {c[0]: c for c in symbol}
+    dense = [by_scale.get(k, (k, 0, 1, 0, 0)) for k in range(-2, symbol[-1][0] + 3)]
+    out = []
+    for left, (_, n, eps, odd, oddity), right in zip(dense, dense[1:], dense[2:]):
+        free = not (left[3] or right[3])
+        oddity = (oddity + (4 if eps == -1 else 0)) % 8
+        t = n // 2 if not odd or n % 2 else n // 2 - 1
+        if free and oddity in (0, 1, 7):
+            out.append(2 * t)
+        elif free and oddity in (3, 4, 5):
+            out.append(-2 * t)
+        else:
+            out.append(2 * t + 1)
+    return out
+
+
+def _diagonal_factor(p: int, species: int) -> Fraction:
+    if species == 0:
+        return Fraction(1)
+    n = abs(species)
+    s = (n + 1) // 2
+    factor = 2 * _euler_product(p, s)
+    if n % 2 == 0:
+        factor *= 1 - (1 if species > 0 else -1) * Fraction(1, p**s)
+    return 1 / factor
+
+
+def _euler_product(p: int, s: int) -> Fraction:
+    """`prod_{k < s} (1 - p^(-2k))`."""
+    out = Fraction(1)
+    for k in range(1, s):
+        out *= 1 - Fraction(1, p ** (2 * k))
+    return out
+
+
+@lru_cache(maxsize=None)
+def _bernoulli(m: int) -> Fraction:
+    if m == 0:
+        return Fraction(1)
+    return -sum(comb(m + 1, j) * _bernoulli(j) for j in range(m)) / (m + 1)
+
+
+def _zeta(m: int) -> Fraction:
+    """`zeta(m) / pi^m` for even `m > 0`."""
+    return abs(_bernoulli(m)) * 2 ** (m - 1) / factorial(m)
+
+
+def _quadratic_l_value(s: int, D: int) -> tuple[Fraction, int]:
+    """`(c, f)` with `L(s, chi_D) = c sqrt(f) pi^s` for a fundamental discriminant `D` of sign `(-1)^s`."""
+    if D == 1:
+        return _zeta(s), 1
+    f = abs(D)
+    bernoulli = sum(
+        _kronecker(D, a) * sum(comb(s, k) * _bernoulli(k) * Fraction(a, f) ** (s - k) for k in range(s + 1))
+        for a in range(1, f + 1)
+    ) * f ** (s - 1)
+    delta = 0 if D > 0 else 1
+    return (-1) ** (1 + (s - delta) // 2) * 2**s * bernoulli / (2 * f**s * factorial(s)), f
+
+
+def _fundamental_discriminant(D: int) -> int:
+    core = 1 if D > 0 else -1
+    for p in _prime_divisors(abs(D)):
+        if _valuation(abs(D), p, 1 << 30) % 2:
+            core *= p
+    return core if core % 4 == 1 else 4 * core
+
+
+def _kronecker(D: int, a: int) -> int:
+    """Kronecker symbol `(D / a)` for `a > 0`."""
+    out = 1
+    while a % 2 == 0:
+        if D % 2 == 0:
+            return 0
+        out *= _legendre(D, 2)
+        a //= 2
+    D %= a
+    # Jacobi symbol `(D / a)` for odd `a` by quadratic reciprocity.
+    while D:
+        while D % 2 == 0:
+            D //= 2
+            if a % 8 in (3, 5):
+                out = -out
+        D, a = a, D
+        if D % 4 == 3 and a % 4 == 3:
+            out = -out
+        D %= a
+    return out if a == 1 else 0
+
+
+def _double_factorial(m: int) -> int:
+    return 1 if m <= 0 else m * _double_factorial(m - 2)
+
+
+def _exact_sqrt(m: int) -> int:
+    root = isqrt(m)
+    assert root * root == m, f"Mass formula did not produce a rational mass: square={m}"
+    return root
+
+
+def _legendre(a: int, p: int) -> int:
+    """Legendre symbol `(a / p)` for odd `p`; the Kronecker symbol `(2 / a)` of odd `a` for `p = 2`."""
+    if p == 2:
+        return 1 if a % 8 in (1, 7) else -1
+    return 1 if pow(a % p, (p - 1) // 2, p) == 1 else -1
+
+
+def _prime_divisors(n: int) -> list[int]:
+    out = []
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            out.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1 if p == 2 else 2
+    if n > 1:
+        out.append(n)
+    return out
@@ -0,0 +1,295 @@
+"""Isotropic subgroups of finite quadratic forms, grown one prime step at a time.
+
+A subgroup `H` of a discriminant form is isotropic when `q` vanishes on it.
+For isotropic `H` and `x` with `q(x) = 0` and `b(x, H) = 0`, the subgroup
+`<H, x>` is again isotropic (`q(h + j x) = q(h) + j^2 q(x) + 2 j b(h, x)`).
+Every isotropic subgroup is reached from `0` by steps `H -> <H, x>` with
+`p x in H` for a prime `p`, so `<H, x> / H` has order `p`; the enumeration
+takes only such steps.  Candidates are filtered on `q`-values and pairings in
+one pass over the element list.  Candidates in the same coset of `H` give the
+same extension, so cosets are labelled by their least element and all
+extensions of `H` by one prime are built together, one per coset.
+
+Subgroups are stored as the sorted indices of their elements (in the order of
+`_form_group.FormElements`), which is canonical; its bytes key the set of
+subgroups already seen, so a subgroup reached along several chains is kept
+once.  Given permutations of the elements generating `O(q)`, every new
+subgroup marks its whole orbit as seen and only one representative per orbit
+is grown further.  This still reaches every orbit: if `K = <H, x>` and `s H`
+is the representative of the orbit of `H`, then `s K = <s H, s x>` is one of
+its extensions.  A set of `allowed` elements restricts the enumeration to
+subgroups whose nonzero elements all lie in it; subgroups of such a subgroup
+qualify as well, so pruning every other extension loses nothing.
+
+The overlattice glued along a subgroup is spanned by `L` and dual-lattice
+lifts of its generators; a Smith form of those rows gives a basis.  Walking
+the subgroups instead builds each overlattice from its parent: the lift of
+the new generator is inserted into the parent's Hermite basis, and the Gram
+matrix follows by the same row operations, bordered by the pairings of the
+lift with the parent's basis.  Overlattices of `M` glued along `K` are the
+overlattices of `L` along subgroups containing `K`; they correspond to the
+isotropic subgroups of `A_M = K^perp / K`.  An isometry of `M` carries them
+to isometric ones, so up to isometry `M` is extended by one element per
+orbit of `O(M)` on `A_M`.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from functools import reduce
+from math import gcd
+from typing import Callable, Iterator, Sequence
+
+import numpy as np
+
+from ._discriminant import DiscriminantForm
+from ._form_group import FormElements
+from ._genus import _prime_divisors
+from ._isometry import _row_keys
+from ._linalg import hermite_insert, integer_matmul, smith_normal_form, unimodular_inverse
+
+# Entries of the `candidates x H x rank` coset table formed at once.
+_BLOCK = 1 << 20
+
+
+@dataclass(frozen=True)
+class IsotropicSubgroup:
+    """An isotropic subgroup: sorted element indices and generator indices (none redundant)."""
+
+    members: np.ndarray
+    generators: tuple[int, ...]
+
+    def key(self) -> bytes:
+        return self.members.tobytes()
+
+
+def span(E: FormElements, generators: Sequence[int]) -> np.ndarray:
+    """Sorted indices of the elements of the subgroup generated by `generators`."""
+    members = np.zeros(1, dtype=np.int64)
+    for g in generators:
+        shifts = np.arange(int(E.orders[g]), dtype=np.int64)[:, None] * E.coords[g]
+        members = np.unique(E.index((E.coords[members][None, :, :] + shifts[:, None, :]).reshape(-1, len(E.moduli))))
+    return members
+
+
+def _orbit(members: np.ndarray, permutations: Sequence[np.ndarray]) -> list[bytes]:
+    """Keys of the images of a subgroup under the group generated by `permutations`.
+
+    The orbit grows in waves: all generators act on the whole frontier at once.
+    """
+    orbit = _row_keys(members[None, :])
+    frontier = members[None, :]
+    while len(frontier):
+        images = np.sort(np.concatenate([P[frontier] for P in permutations]), axis=1)
+        keys, first = np.unique(_row_keys(images), return_index=True)
+        new = ~np.isin(keys, orbit)
+        orbit = np.concatenate([orbit, keys[new]])
+        frontier = images[first[new]]
+    return [key.tobytes() for key in orbit]
+
+
+def _irredundant(E: FormElements, generators: tuple[int, ...], size: int) -> tuple[int, ...]:
+    """Drop generators (earliest first) that the remaining ones already generate."""
+    if int(np.prod(E.orders[list(generators)])) == size:
+        # The subgroup is the direct sum of the cyclic groups they generate.
+        return generators
+    kept = list(generators)
+    for g in generators:
+        rest = [h for h in kept if h != g]
+        if len(span(E, rest)) == size:
+            kept = rest
+    return tuple(kept)
+
+
+def _extensions(E: FormElements, H: IsotropicSubgroup, candidates: np.ndarray, p: int) -> tuple[np.ndarray, np.ndarray]:
+    """One `x` per coset `x + H` among the `candidates`, and the sorted elements of each `<H, x>`.
+
+    For odd `p` the cosets of `x, 2x, ...` give the same subgroup; the caller's `seen` set drops the repeats.
+    """
+    k = len(E.moduli)
+    rows = E.coords[H.members]
+    step = max(1, _BLOCK // (len(rows) * max(k, 1)))
+    labels = np.concatenate(
+        [
+            E.index(E.coords[candidates[lo : lo + step]][:, None, :] + rows[None, :, :]).min(axis=1)
+            for lo in range(0, len(candidates), step)
+        ]
+    )
+    x = candidates[np.unique(labels, return_index=True)[1]]
+    multiples = np.arange(p, dtype=np.int64)[None, :, None] * E.coords[x][:, None, :]
+    members = E.index((multiples[:, :, None, :] + rows[None, None, :, :]).reshape(len(x), p * len(rows), k))
+    return x, np.sort(members, axis=1)
+
+
+def _multiples(E: FormElements) -> dict[int, np.ndarray]:
+    """`p x` (as an element index) for every element `x` and prime `p` dividing the order of the group."""
+    return {p: E.index(p * E.coords) for p in _prime_divisors(int(np.prod(E.moduli)))}
+
+
+def _steps(
+    E: FormElements,
+    H: IsotropicSubgroup,
+    isotropic: np.ndarray,
+    multiples: dict[int, np.ndarray],
+    representatives: np.ndarray | None = None,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Prime steps `<H, x>` from `H` over the `isotropic` elements: `x` and the sorted elements of the extension.
+
+    With `representatives` (a mask over the elements), only those candidates `x`.
+    """
+    inside = np.zeros(len(E.coords), dtype=bool)
+    inside[H.members] = True
+    orthogonal = isotropic & ~inside
+    if H.generators:
+        orthogonal &= ((E.paired @ E.coords[list(H.generators)].T) % E.form.exponent == 0).all(axis=1)
+    if representatives is not None:
+        orthogonal &= representatives
+    for p, multiple in multiples.items():
+        candidates = np.flatnonzero(orthogonal & inside[multiple])
+        if len(candidates):
+            yield from zip(*_extensions(E, H, candidates, p))
+
+
+def isotropic_subgroups(
+    E: FormElements, *, permutations: Sequence[np.ndarray] = (), allowed: np.ndarray | None = None
+) -> list[IsotropicSubgroup]:
+    """Nontrivial isotropic subgroups of the form of `E`, in order of size.
+
+    With `permutations` (of the element list, generating a subgroup of `O(q)`
+    that preserves `allowed`) one subgroup per orbit is returned.  With
+    `allowed` (a mask over the element list) only subgroups inside it.
+    """
+    isotropic = E.values == 0
+    if allowed is not None:
+        isotropic &= allowed
+    multiples = _multiples(E)
+    zero = IsotropicSubgroup(np.zeros(1, dtype=np.int64), ())
+    seen = {zero.key()}
+    queue = deque([zero])
+    out: list[IsotropicSubgroup] = []
+    while queue:
+        H = queue.popleft()
+        for x, members in _steps(E, H, isotropic, multiples):
+            key = members.tobytes()
+            if key in seen:
+                continue
+            if allowed is not None and not allowed[members[1:]].all():
+                seen.add(key)
+                continue
+            K = IsotropicSubgroup(members, H.generators + (int(x),))
+            seen.update(_orbit(members, permutations) if permutations else (key,))
+            out.append(K)
+            queue.append(K)
+    out.sort(key=lambda K: len(K.members))
+    return [IsotropicSubgroup(K.members, _irredundant(E, K.generators, len(K.members))) for K in out]
+
+
+def overlattice(form: DiscriminantForm, generators: Sequence[np.ndarray]) -> tuple[np.ndarray, int]:
+    """Basis rows `B / denominator` (in `L`-coordinates) of `L` plus lifts of the classes `generators`."""
+    m = form.exponent
+    n = form.generators.shape[1]
+    scale = np.array([m // int(d) for d in form.invariants], dtype=object)
+    lifts = [np.asarray(c, dtype=object) * scale @ form.generators for c in generators]
+    X = np.vstack([m * np.eye(n, dtype=object)] + [row.reshape(1, n) for row in lifts]).astype(object)
+    diagonal, _, V = smith_normal_form(X)
+    B = np.diag(np.array(diagonal[:n], dtype=object)) @ unimodular_inverse(V)
+    common = reduce(gcd, (int(v) for v in B.flat), m)
+    return B // common, m // common
+
+
+@dataclass(frozen=True)
+class GluedLattice:
+    """The overlattice glued along `subgroup`: Hermite basis rows `basis / exponent` in `L`-coordinates, and its Gram."""
+
+    subgroup: IsotropicSubgroup
+    basis: np.ndarray
+    gram: np.ndarray
+
+
+def orbit_labels(permutations: Sequence[np.ndarray], size: int) -> np.ndarray:
+    """The least element of the orbit of each element under the group the `permutations` generate."""
+    labels = np.arange(size, dtype=np.int64)
+    while True:
+        updated = labels
+        for P in permutations:
+            updated = np.minimum(updated, updated[P])
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def _lifts(form: DiscriminantForm, E: FormElements) -> np.ndarray:
+    """Numerators over the exponent of a dual-lattice lift of every element, in `L`-coordinates."""
+    scale = np.array([form.exponent // int(d) for d in form.invariants], dtype=np.int64)
+    return (E.coords * scale) @ form.generators.astype(np.int64)
+
+
+def representatives(
+    form: DiscriminantForm,
+    G: np.ndarray,
+    E: FormElements,
+    glued: GluedLattice,
+    quotient: FormElements,
+    permutations: Sequence[np.ndarray],
+) -> np.ndarray:
+    """Mask of one element of `A_L` per orbit of the isometries `permutations` of `A_M`, for `M` glued along `K`.
+
+    An element of `K^perp` lifts to `M^vee`; its dual coordinates in the basis
+    of `M` are `lift G basis^T / m^2`, and they give its class in
+    `A_M = K^perp / K`.  The least element of `A_L` over each orbit of classes is kept.
+    """
+    m = form.exponent
+    dual = _lifts(form, E) @ G.astype(np.int64) @ glued.basis.astype(np.int64).T
+    inside = ~(dual % (m * m)).any(axis=1)
+    classes = quotient.index(quotient.form.classes(dual[inside] // (m * m)).astype(np.int64))
+    orbits = orbit_labels(permutations, len(quotient.coords))[classes]
+    out = np.zeros(len(E.coords), dtype=bool)
+    out[np.flatnonzero(inside)[np.unique(orbits, return_index=True)[1]]] = True
+    return out
+
+
+def overlattice_walk(
+    form: DiscriminantForm,
+    G: np.ndarray,
+    E: FormElements,
+    *,
+    permutations: Sequence[np.ndarray] = (),
+    select: Callable[[GluedLattice], np.ndarray] | None = None,
+    keep: Callable[[GluedLattice], bool] | None = None,
+) -> Iterator[GluedLattice]:
+    """Overlattices of `L` (Gram `G`, form `form`) glued along nontrivial isotropic subgroups, one prime step at a time.
+
+    `permutations` mark whole orbits of subgroups as seen, as in
+    `isotropic_subgroups`.  `select(M)` masks the elements worth trying as
+    extensions of `M`.  When `keep(M)` is false, `M` is neither yielded nor extended.
+    """
+    m = form.exponent
+    n = G.shape[0]
+    G = G.astype(object)
+    lifts = _lifts(form, E)
+    isotropic = E.values == 0
+    multiples = _multiples(E)
+    root = GluedLattice(IsotropicSubgroup(np.zeros(1, dtype=np.int64), ()), m * np.eye(n, dtype=int).astype(object), G)
+    seen = {root.subgroup.key()}
+    queue = deque([root])
+    while queue:
+        M = queue.popleft()
+        # Pairings (over m^2) of the parent's basis with L, shared by all of its extensions.
+        paired = integer_matmul(M.basis, G)
+        for x, members in _steps(E, M.subgroup, isotropic, multiples, None if select is None else select(M)):
+            key = members.tobytes()
+            if key in seen:
+                continue
+            seen.update(_orbit(members, permutations) if permutations else (key,))
+            v = lifts[x].astype(object)
+            bordered = np.zeros((n + 1, n + 1), dtype=object)
+            bordered[:n, :n] = m * m * M.gram
+            bordered[:n, n] = bordered[n, :n] = integer_matmul(paired, v.reshape(n, 1)).ravel()
+            bordered[n, n] = v @ G @ v
+            basis, gram = hermite_insert(M.basis, v, bordered)
+            K = GluedLattice(IsotropicSubgroup(members, M.subgroup.generators + (int(x),)), basis, gram // (m * m))
+            if keep is None or keep(K):
+                yield K
+                queue.append(K)
@@ -0,0 +1,146 @@
+"""Integer-array Gram storage for the contract backend.
+
+A rational Gram matrix `G` is stored as `N / d` with `N` an integer array and
+`d > 0` the least common denominator of the entries.  Pairings are a single
+matrix-vector product on `N`; whenever the a-priori bound on the result does
+not fit in a machine word, the product is redone on Python integers.
+"""
+
+from __future__ import annotations
+
+from fractions import Fraction
+from math import lcm
+from typing import Sequence
+
+import numpy as np
+
+_INT64_MAX = 2**63 - 1
+_COMPACT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def _compact_array(rows: Sequence[Sequence[int]], bound: int) -> np.ndarray:
+    for dtype in _COMPACT_DTYPES:
+        if bound <= np.iinfo(dtype).max:
+            return np.array(rows, dtype=dtype)
+    return np.array(rows, dtype=object)
+
+
+def _array_bound(xs: np.ndarray) -> int:
+    if xs.size == 0:
+        return 0
+    if xs.dtype == object:
+        return max(abs(int(v)) for v in xs.flat)
+    return max(abs(int(xs.max())), abs(int(xs.min())))
+
+
+def coordinate_array(rows, width: int = 0) -> np.ndarray:
+    """Return `rows` as a 2-D integer array, promoting to Python integers if needed.
+
+    `width` is the number of coordinates, which gives an empty `rows` the shape `(0, width)`.
+    """
+    if isinstance(rows, np.ndarray):
+        return rows.reshape(1, -1) if rows.ndim == 1 else rows
+    rows = [tuple(int(c) for c in r) for r in rows]
+    if not rows:
+        return np.zeros((0, width), dtype=np.int64)
+    bound = max((abs(c) for r in rows for c in r), default=0)
+    return np.array(rows, dtype=np.int64 if bound <= _INT64_MAX else object)
+
+
+class GramMatrix:
+    """Symmetric rational Gram matrix `entries / denominator` with integer `entries`."""
+
+    __slots__ = ("entries", "denominator", "_bound")
+
+    def __init__(self, entries: np.ndarray, denominator: int = 1):
+        self.entries = entries
+        self.denominator = int(denominator)
+        self._bound = max((abs(int(v)) for v in entries.flat), default=0)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Fraction | int]]) -> "GramMatrix":
+        fractions = [[Fraction(v) for v in row] for row in rows]
+        den = lcm(1, *(v.denominator for row in fractions for v in row))
+        ints = [[int(v * den) for v in row] for row in fractions]
+        bound = max((abs(v) for row in ints for v in row), default=0)
+        return cls(_compact_array(ints, bound), den)
+
+    @property
+    def rank(self) -> int:
+        return int(self.entries.shape[0])
+
+    def integer_rows(self) -> tuple[tuple[int, ...], ...]:
+        return tuple(tuple(int(v) for v in row) for row in self.entries)
+
+    def rows(self) -> tuple[tuple[Fraction, ...], ...]:
+        d = self.denominator
+        return tuple(tuple(Fraction(int(v), d) for v in row) for row in self.entries)
+
+    def is_integral(self) -> bool:
+        return self.denominator == 1
+
+    def _fits_int64(self, x_bound: int, y_bound: int) -> bool:
+        n = self.rank
+        return n * n * self._bound * x_bound * y_bound <= _INT64_MAX
+
+    def scaled_pairing(self, x: Sequence[int], y: Sequence[int]) -> int:
+        """Return `d * (x^T G y)`, an exact integer."""
+        x_bound = max((abs(int(v)) for v in x), default=0)
+        y_bound = max((abs(int(v)) for v in y), default=0)
+        if self._fits_int64(x_bound, y_bound):
+            xv = np.array(x, dtype=np.int64)
+            yv = np.array(y, dtype=np.int64)
+            return int(xv @ self.entries.astype(np.int64, copy=False) @ yv)
+        xv = np.array([int(v) for v in x], dtype=object)
+        yv = np.array([int(v) for v in y], dtype=object)
+        return int(xv @ self.entries.astype(object) @ yv)
+
+    def scaled_pairings(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Return the matrix `d * (xs G ys^T)` for coordinate rows `xs` and `ys`."""
+        if self._fits_int64(_array_bound(xs), _array_bound(ys)):
+            G = self.entries.astype(np.int64, copy=False)
+            return xs.astype(np.int64, copy=False) @ G @ ys.astype(np.int64, copy=False).T
+        return xs.astype(object) @ self.entries.astype(object) @ ys.astype(object).T
+
+    def scaled_norms(self, xs: np.ndarray) -> np.ndarray:
+        """Return the vector `d * diag(xs G xs^T)` without forming the full product."""
+        bound = _array_bound(xs)
+        if self._fits_int64(bound, bound):
+            X = xs.astype(np.int64, copy=False)
+            return np.einsum("ij,ij->i", X @ self.entries.astype(np.int64, copy=False), X)
+        X = xs.astype(object)
+        return ((X @ self.entries.astype(object)) * X).sum(axis=1)
+
+    def pairings(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        return self._unscale(self.scaled_pairings(xs, ys))
+
+    def norms(self, xs: np.ndarray) -> np.ndarray:
+        return self._unscale(self.scaled_norms(xs))
+
+    def _unscale(self, values: np.ndarray) -> np.ndarray:
+        if self.denominator == 1:
+            return values
+        d = self.denominator
+        out = np.empty(values.shape, dtype=object)
+        for idx, v in np.ndenumerate(values):
+            q = Fraction(int(v), d)
+            out[idx] = int(q) if q.denominator == 1 else q
+        return out
+
+    def pairing(self, x: Sequence[int], y: Sequence[int]) -> int | Fraction:
+        value = self.scaled_pairing(x, y)
+        if self.denominator == 1:
+            return value
+        q = Fraction(value, self.denominator)
+        return int(q) if q.denominator == 1 else q
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, GramMatrix)
+            and self.denominator == other.denominator
+            and self.entries.shape == other.entries.shape
+            and bool(np.all(self.entries == other.entries))
+        )
+
+    def __repr__(self) -> str:
+        return f"GramMatrix({self.integer_rows()}, denominator={self.denominator})"
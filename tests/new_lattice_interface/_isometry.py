@@ -0,0 +1,379 @@
+"""Isometries and automorphism groups of positive-definite lattices (Plesken--Souvignier).
+
+An isometry `L -> M` sends the basis `b_i` of `M` to vectors `x_i` of `L`
+with `(x_i, x_j) = (b_i, b_j)`.  Every `x_i` has norm at most the largest
+diagonal entry of the Gram matrix of `M`, so all images lie in one finite
+candidate set: the vectors of `L` up to that norm (both signs), found once by
+short-vector enumeration.  Images are chosen level by level; fixing `x_i`
+filters the candidate lists of all later levels by their pairings with
+`x_i`.  The same filtering applied to the basis of `M` itself gives the
+size every filtered list must have, so a branch dies as soon as one list has
+the wrong size (in particular when it empties).  Callers pass reduced Gram
+matrices so the candidate set stays small.
+
+Vector sums sharpen both filters.  For a candidate `x` and `k >= 1` let
+`W_k(x)` be the sum of the candidates `v` with `(v, x) = k` and norm at most
+the smallest diagonal entry (a set every isometry preserves, and small
+enough to sum over); an isometry carries `W_k(b)` to `W_k(x)`.  So `x` can only be the image of `b_i` if
+`(W_k(x), x) = (W_k(b_i), b_i)` for all `k`, and fixing `x_i` also requires
+`(W_k(y), x_i) = (W_k(b_j), b_i)` of every candidate `y` left at level `j`.
+
+Automorphisms permute the candidate set, so they are stored as permutations
+of its indices.  The group order is built up a stabilizer chain: with
+`G_i` the pointwise stabilizer of `b_0, ..., b_{i-1}`, `|G_i| = |G_i b_i| |G_{i+1}|`.
+Levels are processed from the last one up; at level `i` the orbit of `b_i`
+under the generators found so far is closed, and each remaining candidate
+image is searched for once.  A hit becomes a new generator (and grows the
+orbit); a miss rules out its whole orbit under the current generators.
+The same chain computes stabilizers: vectors fixed pointwise become one more
+pairing filter, and for a set of vectors to be permuted the image of `b_j`
+must pair with the set as `b_j` does (as a multiset); complete automorphisms
+are then checked against the set.  The generators are returned as well, and an
+isometry search from a lattice whose automorphisms are known only tries one
+first image per orbit.
+
+Embeddings of a smaller lattice `S` are found from the same candidate set.
+Up to `Aut(L)`, the first image is one vector per orbit of `Aut(L)`, the
+second one per orbit of the stabilizer of the first, and so on; the chain
+gives every orbit of embeddings exactly once.  Primitivity (elementary
+divisors all `1`) is checked on complete embeddings.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Callable, Sequence
+
+import numpy as np
+
+from ._enumeration import ShortVectorEnumerator
+from ._linalg import smith_normal_form
+
+# Rows of the candidate pairing matrix formed at once while summing vectors.
+_CHUNK = 1024
+
+
+def _row_keys(rows: np.ndarray) -> np.ndarray:
+    """Each row of an integer matrix as one opaque value with the row's bytes (sortable, searchable)."""
+    rows = np.ascontiguousarray(rows, dtype=np.int64)
+    return rows.view(np.dtype((np.void, rows.shape[1] * rows.itemsize))).ravel()
+
+
+@dataclass(frozen=True)
+class ShortVectors:
+    """All vectors of norm at most `radius` in a lattice with Gram `G`, with both signs."""
+
+    radius: int
+    vectors: np.ndarray
+    paired: np.ndarray
+    norms: np.ndarray
+    _orbits: dict[int, np.ndarray] = field(default_factory=dict, compare=False, repr=False)
+    _sums: dict[int, tuple[np.ndarray, np.ndarray]] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def of(cls, G: np.ndarray, radius: int, *, cached: "ShortVectors | None" = None) -> "ShortVectors":
+        """Enumerate the vectors of `G` up to `radius`, or return `cached` if it already reaches that far."""
+        if cached is not None and cached.radius >= radius:
+            return cached
+        n = G.shape[0]
+        half = [x for x, _ in ShortVectorEnumerator(G, radius)]
+        V = np.array(half + [tuple(-v for v in x) for x in half], dtype=np.int64).reshape(2 * len(half), n)
+        paired = V @ G.astype(np.int64)
+        return cls(int(radius), V, paired, (paired * V).sum(axis=1))
+
+    @cached_property
+    def _lookup(self) -> tuple[np.ndarray, np.ndarray]:
+        keys = _row_keys(self.vectors)
+        order = np.argsort(keys)
+        return order, keys[order]
+
+    def indices(self, rows: np.ndarray) -> np.ndarray:
+        """Candidate indices of the given vectors (each must be a candidate), by binary search on row bytes."""
+        order, keys = self._lookup
+        wanted = _row_keys(np.asarray(rows, dtype=np.int64))
+        positions = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+        assert (keys[positions] == wanted).all(), "Some vectors are not among the candidates."
+        return order[positions]
+
+    def norm_multiset(self, radius: int) -> np.ndarray:
+        return np.sort(self.norms[self.norms <= radius])
+
+    def invariants(self, radius: int) -> tuple[np.ndarray, np.ndarray]:
+        """Pairing and vector-sum rows of every candidate, summing over candidates of norm at most `radius`.
+
+        `rows[x, 0] = G x` and `rows[x, k] = G W_k(x)` for `1 <= k <= radius`, so
+        `rows[x] @ y` lists `(x, y)` and the `(W_k(x), y)`; `unary[x] = rows[x] @ x`.
+        Memoized by radius.
+        """
+        if radius not in self._sums:
+            inside = self.norms <= radius
+            V = self.vectors[inside].astype(np.float64)
+            paired = self.paired[inside].astype(np.float64)
+            rows = np.empty((len(self.vectors), radius + 1, self.vectors.shape[1]), dtype=np.int64)
+            rows[:, 0] = self.paired
+            for lo in range(0, len(rows), _CHUNK):
+                P = self.paired[lo : lo + _CHUNK].astype(np.float64) @ V.T
+                for k in range(1, radius + 1):
+                    rows[lo : lo + _CHUNK, k] = np.rint((P == k).astype(np.float64) @ paired).astype(np.int64)
+            self._sums[radius] = rows, np.einsum("xkd,xd->xk", rows, self.vectors)
+        return self._sums[radius]
+
+    def reference(self, radius: int) -> np.ndarray:
+        """`ref[j, k, i]`: `(b_j, b_i)` for `k = 0`, else `(W_k(b_j), b_i)`, for the basis `b` of `G`."""
+        return self.invariants(radius)[0][self.basis()]
+
+    def orbit_representatives(self, norm: int, symmetries: Sequence[np.ndarray]) -> np.ndarray:
+        """One vector of each given norm per orbit of the automorphisms `symmetries` (memoized by norm)."""
+        if norm not in self._orbits:
+            level = np.flatnonzero(self.norms == norm)
+            permutations = [_permutation(self, S, level) for S in symmetries]
+            seen: set[int] = set()
+            representatives = []
+            for x in level.tolist():
+                if x not in seen:
+                    seen |= _orbit(x, permutations)
+                    representatives.append(x)
+            self._orbits[norm] = np.array(representatives, dtype=np.int64)
+        return self._orbits[norm]
+
+    def basis(self) -> list[int]:
+        """Indices of the standard basis vectors `e_0, ..., e_{n-1}` (each must have norm within the radius)."""
+        V = self.vectors
+        units = np.flatnonzero((np.abs(V).sum(axis=1) == 1) & (V.max(axis=1) == 1))
+        out = [0] * V.shape[1]
+        for x in units.tolist():
+            out[int(V[x].argmax())] = x
+        return out
+
+    def level_lists(self, ref: np.ndarray) -> list[np.ndarray]:
+        """Indices of candidates with the norm and vector-sum invariants of each basis vector behind `ref`."""
+        unary = self.invariants(ref.shape[1] - 1)[1]
+        return [np.flatnonzero((unary == ref[i, :, i]).all(axis=1)) for i in range(ref.shape[0])]
+
+
+def _compatible(C: ShortVectors, ref: np.ndarray, rest: np.ndarray, column: np.ndarray, i: int, j: int) -> np.ndarray:
+    """Candidates `rest` for `b_j` whose pairing and vector sums fit the image `column` of `b_i`."""
+    rows = C.invariants(ref.shape[1] - 1)[0]
+    return rest[(rows[rest] @ column == ref[j, :, i]).all(axis=1)]
+
+
+def _pin(C: ShortVectors, levels: list[np.ndarray], w: np.ndarray, values: np.ndarray) -> list[np.ndarray]:
+    """Keep the candidates `c` of each level `j` with `(c, w) = values[j]`."""
+    w = np.asarray(w, dtype=np.int64)
+    return [level[C.paired[level] @ w == values[j]] for j, level in enumerate(levels)]
+
+
+def _profile(C: ShortVectors, ref: np.ndarray, levels: list[np.ndarray]) -> list[list[int]]:
+    """`sizes[i][j]`: candidates of level `j > i` left once `b_0, ..., b_i` are fixed.
+
+    `C` must be the candidate set of the basis behind `ref`, and `levels` its own level lists.
+    """
+    basis = C.basis()
+    sizes = []
+    for i in range(ref.shape[0]):
+        levels = _fix_prefix(C, ref, levels, basis[i : i + 1], start=i)
+        sizes.append([len(level) for level in levels])
+    return sizes
+
+
+def _search(
+    C: ShortVectors,
+    ref: np.ndarray,
+    sizes: list[list[int]],
+    levels: list[np.ndarray],
+    chosen: list[int],
+    accept: Callable[[np.ndarray], bool] | None = None,
+) -> list[int] | None:
+    """Extend the images `chosen` of the first basis vectors to a full isometry passing `accept`."""
+    depth = len(chosen)
+    n = ref.shape[0]
+    if depth == n:
+        return chosen if accept is None or accept(C.vectors[chosen]) else None
+    for x in levels[depth]:
+        column = C.vectors[x]
+        narrowed = []
+        for j in range(depth + 1, n):
+            rest = _compatible(C, ref, levels[j], column, depth, j)
+            if len(rest) != sizes[depth][j]:
+                break
+            narrowed.append(rest)
+        else:
+            found = _search(C, ref, sizes, levels[: depth + 1] + narrowed, chosen + [int(x)], accept)
+            if found is not None:
+                return found
+    return None
+
+
+def _fix_prefix(
+    C: ShortVectors, ref: np.ndarray, levels: list[np.ndarray], prefix: list[int], *, start: int = 0
+) -> list[np.ndarray]:
+    """Restrict `levels` to candidates compatible with the images `prefix` of basis vectors `start, start + 1, ...`."""
+    out = list(levels)
+    for i, x in enumerate(prefix, start):
+        column = C.vectors[x]
+        for j in range(i + 1, len(out)):
+            out[j] = _compatible(C, ref, out[j], column, i, j)
+    return out
+
+
+def find_isometry(
+    G: np.ndarray,
+    H: np.ndarray,
+    *,
+    symmetries: Sequence[np.ndarray] = (),
+    source: ShortVectors | None = None,
+    target: ShortVectors | None = None,
+    carry: tuple[np.ndarray, np.ndarray] | None = None,
+) -> np.ndarray | None:
+    """Return `T` with `T G T^T = H`, or `None` if the positive-definite Gram matrices are not isometric.
+
+    `symmetries` are known automorphisms `S G S^T = G`; the image of the first
+    basis vector is then only tried once per orbit of the group they generate.
+    `source` and `target` are short vectors of `G` and `H` from earlier calls,
+    reused when they reach the largest diagonal entry of `H`; a reused `source`
+    must always come with the same `symmetries`.  With `carry = (x, y)`, only
+    an isometry with `y T = x` is searched for (then `symmetries` must be empty).
+    """
+    n = G.shape[0]
+    if H.shape[0] != n:
+        return None
+    if n == 0:
+        return np.zeros((0, 0), dtype=object)
+    radius = max(int(H[i, i]) for i in range(n))
+    C = ShortVectors.of(G, radius, cached=source)
+    own = ShortVectors.of(H, radius, cached=target)
+    if not np.array_equal(C.norm_multiset(radius), own.norm_multiset(radius)):
+        return None
+    ref = own.reference(min(int(H[i, i]) for i in range(n)))
+    levels, own_levels = C.level_lists(ref), own.level_lists(ref)
+    if carry is not None:
+        # (T_j, x) = (b_j, y) for all j exactly when y T = x; the same filter on H keeps the sizes comparable.
+        assert not symmetries, "Orbit reduction of the first image does not respect a carried vector."
+        x, y = carry
+        Hy = H.astype(np.int64) @ np.asarray(y, dtype=np.int64)
+        levels, own_levels = _pin(C, levels, x, Hy), _pin(own, own_levels, y, Hy)
+    if any(len(a) != len(b) for a, b in zip(levels, own_levels)):
+        return None
+    if symmetries:
+        representatives = C.orbit_representatives(int(H[0, 0]), symmetries)
+        levels[0] = representatives[np.isin(representatives, levels[0])]
+    found = _search(C, ref, _profile(own, ref, own_levels), levels, [])
+    return None if found is None else C.vectors[found].astype(object)
+
+
+def automorphism_group(
+    G: np.ndarray, *, fixed: Sequence[np.ndarray] = (), preserved: Sequence[np.ndarray] = ()
+) -> tuple[int, list[np.ndarray]]:
+    """Order and generators `S` (`S G S^T = G`) of the automorphism group of a positive-definite `G`.
+
+    With `fixed` (row coordinate vectors `w`), only automorphisms with `w S = w`;
+    with `preserved`, only those permuting the given vectors.
+    """
+    n = G.shape[0]
+    if n == 0:
+        return 1, []
+    radius = max(int(G[i, i]) for i in range(n))
+    C = ShortVectors.of(G, radius)
+    basis = C.basis()
+    ref = C.reference(min(int(G[i, i]) for i in range(n)))
+    levels = C.level_lists(ref)
+    for w in fixed:
+        # (S b_j, w) = (b_j, w) for all j exactly when S^{-1} w = w.
+        levels = _pin(C, levels, w, G.astype(np.int64) @ np.asarray(w, dtype=np.int64))
+    accept = None
+    if len(preserved):
+        # S b_j pairs with the set as b_j does (as a multiset), and S fixes the sum of the set.
+        X = np.array([[int(v) for v in x] for x in preserved], dtype=np.int64)
+        pairings = np.sort(C.paired @ X.T, axis=1)
+        wanted = np.sort(G.astype(np.int64) @ X.T, axis=1)
+        levels = [level[(pairings[level] == wanted[j]).all(axis=1)] for j, level in enumerate(levels)]
+        levels = _pin(C, levels, X.sum(axis=0), G.astype(np.int64) @ X.sum(axis=0))
+        targets = {tuple(row) for row in X.tolist()}
+        accept = lambda S: {tuple(row) for row in (X @ S).tolist()} == targets
+    sizes = _profile(C, ref, levels)
+    generators: list[np.ndarray] = []
+    matrices: list[np.ndarray] = []
+    order = 1
+    for i in reversed(range(n)):
+        prefixed = _fix_prefix(C, ref, levels, basis[:i])
+        orbit = _orbit(basis[i], generators)
+        excluded: set[int] = set()
+        for c in prefixed[i]:
+            c = int(c)
+            if c in orbit or c in excluded:
+                continue
+            found = _search(C, ref, sizes, prefixed[:i] + [np.array([c])] + prefixed[i + 1 :], basis[:i], accept)
+            if found is None:
+                excluded |= _orbit(c, generators)
+                continue
+            matrices.append(C.vectors[found].astype(object))
+            generators.append(_permutation(C, C.vectors[found]))
+            orbit = _orbit(basis[i], generators)
+        order *= len(orbit)
+    return order, matrices
+
+
+def embeddings(G: np.ndarray, H: np.ndarray, *, symmetries: Sequence[np.ndarray] | None = None) -> list[np.ndarray]:
+    """Primitive embeddings `X` (`X G X^T = H`) of positive-definite `H` into `G`, one per orbit of `Aut(G)`.
+
+    `symmetries` generate `Aut(G)`; they are computed when omitted.
+    """
+    r, n = H.shape[0], G.shape[0]
+    if r == 0:
+        return [np.zeros((0, n), dtype=object)]
+    C = ShortVectors.of(G, max(int(H[i, i]) for i in range(r)))
+    found: list[np.ndarray] = []
+
+    def grow(levels: list[np.ndarray], chosen: list[int], generators: Sequence[np.ndarray]) -> None:
+        depth = len(chosen)
+        if depth == r:
+            X = C.vectors[chosen].astype(object)
+            if all(d == 1 for d in smith_normal_form(X)[0]):
+                found.append(X)
+            return
+        # The stabilizer of the chosen vectors preserves this level, so it permutes its candidates.
+        permutations = [_permutation(C, S, levels[depth]) for S in generators]
+        seen: set[int] = set()
+        for x in levels[depth].tolist():
+            if x in seen:
+                continue
+            seen |= _orbit(x, permutations)
+            column = C.vectors[x]
+            narrowed = [level[C.paired[level] @ column == int(H[j, depth])] for j, level in enumerate(levels[depth + 1 :], depth + 1)]
+            if not all(len(level) for level in narrowed):
+                continue
+            fixed = [C.vectors[c] for c in chosen + [x]]
+            stabilizer = automorphism_group(G, fixed=fixed)[1] if depth + 1 < r else []
+            grow(levels[: depth + 1] + narrowed, chosen + [x], stabilizer)
+
+    grow(
+        [np.flatnonzero(C.norms == int(H[j, j])) for j in range(r)],
+        [],
+        automorphism_group(G)[1] if symmetries is None else symmetries,
+    )
+    return found
+
+
+def _permutation(C: ShortVectors, T: np.ndarray, domain: np.ndarray | None = None) -> dict[int, int] | np.ndarray:
+    """The permutation of candidate indices induced by the automorphism with image rows `T`.
+
+    With `domain`, only the images of those (automorphism-stable) indices, as a dict.
+    """
+    if domain is not None:
+        images = C.indices(C.vectors[domain] @ T.astype(np.int64))
+        return dict(zip(np.asarray(domain).tolist(), images.tolist()))
+    return C.indices(C.vectors @ T.astype(np.int64))
+
+
+def _orbit(start: int, generators: Sequence[np.ndarray | dict[int, int]]) -> set[int]:
+    orbit = {start}
+    todo = [start]
+    while todo:
+        x = todo.pop()
+        for g in generators:
+            y = int(g[x])
+            if y not in orbit:
+                orbit.add(y)
+                todo.append(y)
+    return orbit
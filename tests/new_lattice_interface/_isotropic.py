@@ -0,0 +1,118 @@
+"""Enumeration of primitive isotropic vectors of bounded height.
+
+For an integer Gram matrix `G` the isotropic vectors `x` with
+`max_i |x_i| <= bound` are found by fixing all coordinates but one.  With the
+free coordinate `t` placed last, `q(x', t) = a + 2 b t + c t^2` where
+`a = x'^T G' x'`, `b = (G x')_last` and `c = G_last,last`, so `t` is a root
+of an integer quadratic (or linear, when `c = 0`) polynomial.  The prefixes
+`x'` are swept in blocks: the innermost prefix coordinates form a dense mesh
+evaluated with array arithmetic, the outer ones are looped over in Python,
+and results are yielded block by block with the outer coordinates swept in
+shells of increasing height, so short vectors come first.
+"""
+
+from __future__ import annotations
+
+from itertools import product
+from math import gcd, isqrt
+from typing import Iterator
+
+import numpy as np
+
+from ._linalg import integer_matmul
+
+_BLOCK = 1 << 16
+_FLOAT_EXACT = 1 << 52
+
+
+def _integer_sqrt(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return `(r, ok)` with `r = isqrt(v)` and `ok` marking the perfect squares among `v >= 0`."""
+    nonneg = values >= 0
+    safe = np.where(nonneg, values, 0)
+    if values.dtype != object and (safe.size == 0 or int(safe.max()) < _FLOAT_EXACT):
+        r = np.rint(np.sqrt(safe.astype(np.float64))).astype(np.int64)
+    else:
+        r = np.array([isqrt(int(v)) for v in safe], dtype=object)
+    return r, nonneg & (r * r == safe)
+
+
+def _shell(k: int, h: int) -> Iterator[tuple[int, ...]]:
+    """Yield the `x in ZZ^k` with `max_i |x_i| = h` (just `0` for `h = 0`)."""
+    if h == 0:
+        yield (0,) * k
+        return
+    inside, full = range(-h + 1, h), range(-h, h + 1)
+    # Split on the first coordinate of absolute value `h`.
+    for i in range(k):
+        for head in product(inside, repeat=i):
+            for tail in product(full, repeat=k - 1 - i):
+                yield head + (-h,) + tail
+                yield head + (h,) + tail
+
+
+def _primitive(V: np.ndarray) -> np.ndarray:
+    if V.dtype == object:
+        return np.array([gcd(*(int(v) for v in row)) == 1 for row in V], dtype=bool)
+    return np.gcd.reduce(np.abs(V), axis=1) == 1
+
+
+def _roots(a: np.ndarray, b: np.ndarray, c: int, bound: int) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Return `(rows, t)` pairs: prefix indices and integer roots `|t| <= bound` of `a + 2bt + ct^2`."""
+    if c == 0:
+        out = []
+        linear = np.flatnonzero(b != 0)
+        num, den = -a[linear], 2 * b[linear]
+        hit = num % den == 0
+        t = num[hit] // den[hit]
+        inside = np.abs(t) <= bound
+        out.append((linear[hit][inside], t[inside]))
+        # `a = b = 0`: the whole line `x' + t e_last` is isotropic.
+        flat = np.flatnonzero((a == 0) & (b == 0))
+        span = np.arange(-bound, bound + 1)
+        out.append((np.repeat(flat, len(span)), np.tile(span, len(flat))))
+        return out
+    r, ok = _integer_sqrt(b * b - c * a)
+    out = []
+    # A double root (`r = 0`) is taken with the `+` sign only.
+    for sign, mask in ((1, ok), (-1, ok & (r != 0))):
+        rows = np.flatnonzero(mask)
+        num = -b[rows] + sign * r[rows]
+        hit = num % c == 0
+        t = num[hit] // c
+        inside = np.abs(t) <= bound
+        out.append((rows[hit][inside], t[inside]))
+    return out
+
+
+def primitive_isotropic_vectors(G: np.ndarray, bound: int) -> Iterator[tuple[int, ...]]:
+    """Yield every primitive `x` with `x^T G x = 0` and `max_i |x_i| <= bound` exactly once."""
+    n = G.shape[0]
+    assert n >= 2, f"Isotropic enumeration needs rank >= 2: rank={n}"
+    # Solve for a coordinate with nonzero diagonal when there is one (quadratic case).
+    last = next((i for i in range(n - 1, -1, -1) if G[i, i] != 0), n - 1)
+    order = [i for i in range(n) if i != last] + [last]
+    P = G[np.ix_(order, order)]
+    dtype = np.int64 if n * n * max(1, int(np.abs(P.astype(object)).max())) * bound * bound < 2**62 else object
+    P = P.astype(dtype)
+    c = int(P[n - 1, n - 1])
+    side = 2 * bound + 1
+    inner = 1
+    while inner < n - 1 and side ** (inner + 1) <= _BLOCK:
+        inner += 1
+    span = np.arange(-bound, bound + 1, dtype=dtype)
+    mesh = np.stack(np.meshgrid(*([span] * inner), indexing="ij"), axis=-1).reshape(-1, inner)
+    outers = (outer for h in range(bound + 1) for outer in _shell(n - 1 - inner, h))
+    for outer in outers:
+        X = np.hstack([np.tile(np.array(outer, dtype=dtype), (len(mesh), 1)), mesh])
+        GX = integer_matmul(X, P[: n - 1, :])
+        a = (GX[:, : n - 1] * X).sum(axis=1)
+        b = GX[:, n - 1]
+        for rows, t in _roots(a, b, c, bound):
+            if rows.size == 0:
+                continue
+            V = np.hstack([X[rows], t.reshape(-1, 1).astype(X.dtype)])
+            V = V[_primitive(V)]
+            out = np.empty_like(V)
+            out[:, order] = V
+            for row in out.tolist():
+                yield tuple(int(v) for v in row)
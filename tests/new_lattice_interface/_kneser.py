@@ -0,0 +1,253 @@
+"""Kneser `p`-neighbours and the enumeration of a definite genus.
+
+For a prime `p ∤ det L` and `v in L` with `v not in pL` and `(v, v) = 0`
+modulo `p^2` (modulo `8` when `p = 2`, which is only used for even lattices
+of odd determinant), put `L_v = {x in L : (x, v) = 0 mod p}`.  The neighbour
+`L' = L_v + ZZ v / p` is integral (even if `L` is), has the determinant of
+`L`, and lies in its genus; for rank at least `3` the `p`-neighbour graph
+connects the whole spinor genus.
+
+A basis of `L'` is written down directly.  With `a = G v mod p` and
+`a_k != 0`, the vectors `f_i = e_i - (a_i / a_k) e_k` (`i != k`) and
+`f_k = p e_k` are a basis of `L_v`.  Rescaling `v` by a unit mod `p` and
+moving it by `p L_v` (neither changes the neighbour) makes some coordinate of
+`v` in that basis exactly `1`, so replacing that `f_m` by `v / p` gives a
+basis of `L'` whose Gram matrix is integral and is LLL-reduced at once.
+
+The enumeration walks the neighbour graph from one representative in waves:
+every known class contributes a batch of random neighbours, generated in a
+worker pool when `processes` is given.  A neighbour is new unless it is
+isometric to a known class with the same norm counts and pairing profile of
+minimal vectors (see `_fingerprint`); the search tries the image of the first
+basis vector once per orbit of the known class's automorphisms.  Each new
+class adds `1 / |O(L')|` to the running mass, and the walk stops as soon as
+that equals the mass of the genus.
+"""
+
+from __future__ import annotations
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Hashable
+
+import numpy as np
+
+from ._enumeration import norm_counts
+from ._fingerprint import pairing_profile
+from ._genus import _prime_divisors, local_symbol
+from ._isometry import ShortVectors, automorphism_group, find_isometry
+from ._linalg import bareiss_determinant
+from ._reduction import lll_reduce
+
+# A random neighbour lies in a missing class with probability about `missing mass / mass`;
+# the walk gives up after this many times the expected number of draws without a new class.
+_PATIENCE = 20
+# Draws per prime `p` before `isotropic_vector` gives up.
+_DRAWS = 64
+
+Rows = tuple[tuple[int, ...], ...]
+
+
+@dataclass
+class GenusClass:
+    """A class of the genus: reduced Gram matrix, fingerprint key, and `O(L)`.
+
+    `short` keeps the short vectors found with the class (extended when an
+    isometry test needs a larger radius).
+    """
+
+    gram: np.ndarray
+    key: Hashable
+    automorphisms: int
+    generators: tuple[np.ndarray, ...]
+    short: ShortVectors | None = None
+
+    @classmethod
+    def of(cls, gram: np.ndarray, key: Hashable, short: ShortVectors) -> "GenusClass":
+        order, generators = automorphism_group(gram)
+        return cls(gram, key, order, tuple(generators), short)
+
+
+def neighbour_prime(G: np.ndarray) -> int:
+    """`2` for even lattices of odd determinant, otherwise the least odd prime not dividing `det G`."""
+    det = abs(bareiss_determinant(G.astype(object)))
+    if det % 2 and all(int(G[i, i]) % 2 == 0 for i in range(G.shape[0])):
+        return 2
+    bad = set(_prime_divisors(det))
+    p = 3
+    while p in bad or _prime_divisors(p) != [p]:
+        p += 2
+    return p
+
+
+def isotropic_vector(G: np.ndarray, p: int, rng: random.Random) -> np.ndarray:
+    """A random `v` with `v != 0 mod p` and `(v, v) = 0 mod p^2` (mod `8` for `p = 2`).
+
+    In rank at least `3` about one draw in `p` qualifies; raises `AssertionError` after
+    `_DRAWS * p` failed draws, e.g. when `L / pL` is anisotropic.
+    """
+    n = G.shape[0]
+    modulus = 8 if p == 2 else p * p
+    for _ in range(_DRAWS * p):
+        v = np.array([rng.randrange(p) for _ in range(n)], dtype=object)
+        if not v.any():
+            continue
+        norm = int(v @ G @ v)
+        if norm % (4 if p == 2 else p):
+            continue
+        if norm % modulus:
+            # Move v by p e_j with (G v)_j a unit: the norm changes by 2p (G v)_j mod p^2 (4 (G v)_j mod 8).
+            Gv = G @ v
+            j = next(j for j in range(n) if int(Gv[j]) % p)
+            v[j] += 2 if p == 2 else p * (-(norm // p) * pow(2 * int(Gv[j]), -1, p) % p)
+        assert int(v @ G @ v) % modulus == 0
+        return v
+    raise AssertionError(f"No vector of norm 0 mod {modulus} in {_DRAWS * p} draws; L / {p}L may be anisotropic.")
+
+
+def neighbour(G: np.ndarray, v: np.ndarray, p: int) -> np.ndarray:
+    """Gram matrix of the `p`-neighbour `L_v + ZZ v / p` in the basis described above."""
+    n = G.shape[0]
+    a = (G @ v) % p
+    k = next(i for i in range(n) if a[i])
+    c = [int(a[i]) * pow(int(a[k]), -1, p) % p for i in range(n)]
+    F = np.eye(n, dtype=object)
+    F[:, k] -= np.array(c, dtype=object)
+    F[k] = 0
+    F[k, k] = p
+    u = np.array(v, dtype=object)
+    u[k] = (int(v[k]) + sum(int(v[i]) * c[i] for i in range(n) if i != k)) // p
+    m = next(i for i in range(n) if int(u[i]) % p)
+    u = u * pow(int(u[m]), -1, p) % p
+    u[m] = 1
+    B = F.copy()
+    B[m] = u @ F
+    N = B @ G @ B.T
+    assert all(int(x) % p == 0 for x in N[m]) and int(N[m, m]) % (p * p) == 0, "Neighbour Gram matrix is not integral."
+    N[m, :] //= p
+    N[:, m] //= p
+    return N
+
+
+def _reduced_binary(G: np.ndarray) -> np.ndarray:
+    """Lagrange--Gauss reduction of a positive binary Gram matrix to `0 <= 2b <= a <= c`."""
+    a, b, c = int(G[0, 0]), int(G[0, 1]), int(G[1, 1])
+    while True:
+        # e_2 -> e_2 - m e_1 with m the integer nearest b / a, then swap if e_2 became shorter.
+        m = (2 * b + a) // (2 * a)
+        b, c = b - m * a, c - 2 * m * b + m * m * a
+        if c >= a:
+            return np.array([[a, abs(b)], [abs(b), c]], dtype=object)
+        a, c = c, a
+
+
+def binary_classes(G: np.ndarray) -> list[np.ndarray]:
+    """Reduced Gram matrices of the classes in the genus of the positive binary Gram matrix `G`.
+
+    Each class of positive binary forms has exactly one Gram matrix `[[a, b], [b, c]]`
+    with `0 <= 2b <= a <= c`, and `ac - b^2 = d` bounds `a` by `sqrt(4d / 3)`; the reduced
+    matrices of determinant `d` are listed and kept when their local symbols match.
+    """
+    d = int(bareiss_determinant(G.astype(object)))
+    rows = _rows(G)
+    primes = _prime_divisors(2 * d)
+    symbols = [local_symbol(rows, p) for p in primes]
+    out = []
+    a = 1
+    while 3 * a * a <= 4 * d:
+        for b in range(a // 2 + 1):
+            c, r = divmod(d + b * b, a)
+            if r or c < a:
+                continue
+            H = np.array([[a, b], [b, c]], dtype=object)
+            if [local_symbol(_rows(H), p) for p in primes] == symbols:
+                out.append(H)
+        a += 1
+    return out
+
+
+def _rows(G: np.ndarray) -> Rows:
+    return tuple(tuple(int(x) for x in row) for row in G)
+
+
+def _class_data(G: np.ndarray, radius: int) -> tuple[Hashable, ShortVectors]:
+    """Key (norm counts up to `radius`, pairing profile of the minimal vectors) and short vectors of `G`."""
+    short = ShortVectors.of(G, max(int(G[i, i]) for i in range(G.shape[0])))
+    key = (tuple(int(c) for c in norm_counts(G, radius)), pairing_profile(short, int(short.norms.min())))
+    return key, short
+
+
+def _neighbours(task: tuple[Rows, int, int, int, int]) -> list[tuple[Rows, Hashable, ShortVectors]]:
+    """Reduced Gram matrices, keys and short vectors of `count` random `p`-neighbours (worker entry point)."""
+    rows, p, seed, count, radius = task
+    G = np.array(rows, dtype=object)
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        reduced = lll_reduce(neighbour(G, isotropic_vector(G, p, rng), p)).gram
+        out.append((_rows(reduced), *_class_data(reduced, radius)))
+    return out
+
+
+def _isometric(c: GenusClass, H: np.ndarray, own: ShortVectors) -> bool:
+    c.short = ShortVectors.of(c.gram, own.radius, cached=c.short)
+    return find_isometry(c.gram, H, symmetries=c.generators, source=c.short, target=own) is not None
+
+
+def genus_classes(
+    G: np.ndarray, mass: Fraction, *, processes: int | None = None, seed: int = 0, batch: int = 8
+) -> list[GenusClass]:
+    """Isometry classes of the genus of the positive-definite integer Gram matrix `G`.
+
+    The first class is `G` itself (reduced).  Raises `AssertionError` if the
+    walk stops finding classes before the mass is reached, which happens when
+    the genus has several spinor genera.  Neighbours only connect genera of
+    rank at least `3`; binary genera are listed by their reduced forms instead.
+    """
+    if G.shape[0] == 2:
+        first = _reduced_binary(G)
+        radius = int(first[1, 1])
+        forms = [first] + [H for H in binary_classes(G) if not np.array_equal(H, first)]
+        classes = [GenusClass.of(H, *_class_data(H, radius)) for H in forms]
+        total = sum(Fraction(1, c.automorphisms) for c in classes)
+        assert total == mass, f"Reduced binary forms have mass {total} != {mass}"
+        return classes
+    first = lll_reduce(G).gram
+    radius = max(int(first[i, i]) for i in range(first.shape[0]))
+    classes = [GenusClass.of(first, *_class_data(first, radius))]
+    if Fraction(1, classes[0].automorphisms) == mass:
+        return classes
+    p = neighbour_prime(G)
+    buckets: dict[Hashable, list[GenusClass]] = {classes[0].key: [classes[0]]}
+    total = Fraction(1, classes[0].automorphisms)
+    executor = ProcessPoolExecutor(processes) if processes else None
+    tasks = 0
+    fruitless = 0
+    try:
+        while total < mass:
+            assert fruitless < _PATIENCE * mass / (mass - total), (
+                f"{p}-neighbours found {len(classes)} classes of mass {total} < {mass}; the genus has several spinor genera."
+            )
+            wave = [(_rows(c.gram), p, seed + tasks + i, batch, radius) for i, c in enumerate(classes)]
+            tasks += len(wave)
+            results = executor.map(_neighbours, wave) if executor is not None else map(_neighbours, wave)
+            for rows, key, short in (item for result in results for item in result):
+                if total == mass:
+                    break
+                H = np.array(rows, dtype=object)
+                bucket = buckets.setdefault(key, [])
+                if any(_isometric(c, H, short) for c in bucket):
+                    fruitless += 1
+                    continue
+                fruitless = 0
+                found = GenusClass.of(H, key, short)
+                bucket.append(found)
+                classes.append(found)
+                total += Fraction(1, found.automorphisms)
+            assert total <= mass, f"Genus enumeration overshot the mass: {total} > {mass}"
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return classes
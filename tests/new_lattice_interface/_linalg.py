@@ -0,0 +1,355 @@
+"""Exact linear algebra over ZZ and QQ for the contract backend."""
+
+from __future__ import annotations
+
+from fractions import Fraction
+from math import lcm
+from typing import Sequence
+
+import numpy as np
+
+
+def integer_matrix(rows: Sequence[Sequence[Fraction | int]]) -> tuple[np.ndarray, int]:
+    """Return `(M, d)` with `M` an object-dtype integer array and `rows = M / d`."""
+    fractions = [[Fraction(v) for v in row] for row in rows]
+    d = lcm(1, *(v.denominator for row in fractions for v in row))
+    M = np.array([[int(v * d) for v in row] for row in fractions], dtype=object)
+    return M.reshape(len(fractions), len(fractions[0]) if fractions else 0), d
+
+
+def bareiss_determinant(M: np.ndarray) -> int:
+    """Determinant of a square integer matrix by fraction-free Bareiss elimination.
+
+    Every intermediate entry is a minor of `M`, so the exact division by the
+    previous pivot never leaves ZZ and entry sizes stay polynomial in `n`.
+    """
+    n = M.shape[0]
+    if n == 0:
+        return 1
+    A = M.astype(object, copy=True)
+    sign = 1
+    prev = 1
+    for k in range(n - 1):
+        if A[k, k] == 0:
+            nonzero = np.flatnonzero(A[k + 1 :, k] != 0)
+            if nonzero.size == 0:
+                return 0
+            swap = k + 1 + int(nonzero[0])
+            A[[k, swap]] = A[[swap, k]]
+            sign = -sign
+        pivot = A[k, k]
+        A[k + 1 :, k + 1 :] = (
+            pivot * A[k + 1 :, k + 1 :] - np.outer(A[k + 1 :, k], A[k, k + 1 :])
+        ) // prev
+        prev = pivot
+    return sign * int(A[n - 1, n - 1])
+
+
+def rational_determinant(rows: Sequence[Sequence[Fraction | int]]) -> Fraction:
+    """Exact determinant of a square rational matrix in `O(n^3)` ring operations."""
+    M, d = integer_matrix(rows)
+    return Fraction(bareiss_determinant(M), d ** M.shape[0])
+
+
+_INT64_MAX = 2**63 - 1
+
+
+def _max_abs(M: np.ndarray) -> int:
+    if M.size == 0:
+        return 0
+    if M.dtype == object:
+        return max(abs(int(v)) for v in M.flat)
+    return max(abs(int(M.max())), abs(int(M.min())))
+
+
+def exact_matmul(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Exact product of integer matrices using int64 BLAS-free limb products.
+
+    `B` is split into base-`2^b` limbs small enough that each `A @ limb`
+    fits in int64; the limbs are recombined on Python integers.
+    """
+    a_bound, b_bound = _max_abs(A), _max_abs(B)
+    inner = max(1, A.shape[1])
+    if inner * a_bound * b_bound <= _INT64_MAX:
+        return (A.astype(np.int64) @ B.astype(np.int64)).astype(object)
+    if inner * a_bound >= 2**62:
+        return A.astype(object) @ B.astype(object)
+    bits = (_INT64_MAX // (inner * max(1, a_bound))).bit_length() - 1
+    A64 = A.astype(np.int64)
+    base = 1 << bits
+    rest = B.astype(object)
+    out = np.zeros((A.shape[0], B.shape[1]), dtype=object)
+    shift = 0
+    while True:
+        limb = rest % base
+        rest = rest // base
+        out += (A64 @ limb.astype(np.int64)).astype(object) << shift
+        shift += bits
+        if not rest.any():
+            return out
+        if _max_abs(rest) < base:
+            return out + ((A64 @ rest.astype(np.int64)).astype(object) << shift)
+
+
+def integer_matmul(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Exact product of integer matrices, kept in int64 whenever the a-priori bound allows."""
+    inner = max(1, A.shape[1])
+    if inner * _max_abs(A) * _max_abs(B) <= _INT64_MAX:
+        return A.astype(np.int64, copy=False) @ B.astype(np.int64, copy=False)
+    return A.astype(object) @ B.astype(object)
+
+
+def _float_ldl(M: np.ndarray) -> tuple[list[int], np.ndarray, np.ndarray] | None:
+    """Floating-point `P M P^T = L D L^T` with symmetric diagonal pivoting.
+
+    Returns `(order, L, d)` or `None` when the entries are not exact doubles or
+    a zero pivot is met.  The result is only a proposal; callers certify it.
+    """
+    if _max_abs(M) >= 2**53:
+        return None
+    A = M.astype(np.float64)
+    n = A.shape[0]
+    remaining = list(range(n))
+    order: list[int] = []
+    L = np.zeros((n, n))
+    d = np.zeros(n)
+    for step in range(n):
+        diag = np.abs(A[remaining, remaining])
+        k = remaining[int(np.argmax(diag))]
+        if A[k, k] == 0.0:
+            return None
+        order.append(k)
+        remaining.remove(k)
+        d[step] = A[k, k]
+        L[k, step] = 1.0
+        if remaining:
+            col = A[remaining, k]
+            L[remaining, step] = col / A[k, k]
+            A[np.ix_(remaining, remaining)] -= np.outer(col, col) / A[k, k]
+    return order, L[order], d
+
+
+def _certified_float_inertia(
+    M: np.ndarray, factor: tuple[list[int], np.ndarray, np.ndarray]
+) -> tuple[int, int, int] | None:
+    """Inertia from the float `P M P^T = L D L^T`, certified by an exact integer congruence.
+
+    With `X = round(s L^{-1})` (lower triangular with diagonal `s`, hence
+    invertible), `C = X (P M P^T) X^T` is computed exactly.  If `C` is strictly
+    diagonally dominant its inertia, and so that of `M`, is read off the signs
+    of its diagonal.
+    """
+    order, L, d = factor
+    n = M.shape[0]
+    Linv = np.linalg.inv(L)
+    growth = float(np.abs(Linv).max()) * max(1, _max_abs(M)) * n * n / float(np.abs(d).min())
+    if not np.isfinite(growth):
+        return None
+    s = 1 << min(48, max(4, int(np.ceil(np.log2(growth))) + 8))
+    X = np.tril(np.rint(s * Linv)).astype(object)
+    np.fill_diagonal(X, s)
+    PMP = M[np.ix_(order, order)]
+    C = exact_matmul(exact_matmul(X, PMP), X.T.copy())
+    diag = np.array([C[i, i] for i in range(n)], dtype=object)
+    off = np.abs(C).sum(axis=1) - np.abs(diag)
+    if not all(abs(diag[i]) > off[i] for i in range(n)):
+        return None
+    p = sum(1 for v in diag if v > 0)
+    return (p, n - p, 0)
+
+
+def leading_principal_minors(M: np.ndarray) -> list[int] | None:
+    """Leading principal minors `D_1, ..., D_n` of `M` via Bareiss without pivoting.
+
+    Returns `None` as soon as some `D_k` with `k < n` vanishes.
+    """
+    n = M.shape[0]
+    A = M.astype(object, copy=True)
+    minors: list[int] = []
+    prev = 1
+    for k in range(n):
+        pivot = int(A[k, k])
+        minors.append(pivot)
+        if k == n - 1:
+            break
+        if pivot == 0:
+            return None
+        A[k + 1 :, k + 1 :] = (
+            pivot * A[k + 1 :, k + 1 :] - np.outer(A[k + 1 :, k], A[k, k + 1 :])
+        ) // prev
+        prev = pivot
+    return minors
+
+
+def _congruence_inertia(M: np.ndarray) -> tuple[int, int, int]:
+    """Inertia by exact rational congruence diagonalization (handles zero diagonals)."""
+    A = np.array([[Fraction(int(v)) for v in row] for row in M], dtype=object).reshape(M.shape)
+    active = list(range(A.shape[0]))
+    p = q = 0
+    while active:
+        k = next((i for i in active if A[i, i] != 0), None)
+        if k is None:
+            pair = next(((i, j) for i in active for j in active if A[i, j] != 0), None)
+            if pair is None:
+                break
+            i, j = pair
+            A[i, :] += A[j, :]
+            A[:, i] += A[:, j]
+            k = i
+        pivot = A[k, k]
+        if pivot > 0:
+            p += 1
+        else:
+            q += 1
+        active.remove(k)
+        if active:
+            col = A[active, k]
+            A[np.ix_(active, active)] -= np.outer(col, col) / pivot
+    return p, q, A.shape[0] - p - q
+
+
+def inertia(M: np.ndarray) -> tuple[int, int, int]:
+    """Sylvester inertia `(n_+, n_-, n_0)` of a symmetric integer matrix.
+
+    A floating-point LDL^T pre-pass proposes a symmetric pivot order and is
+    certified by an exact congruence when it can be; otherwise the exact
+    leading principal minors of the matrix permuted into that order certify
+    the signs of all pivots (Jacobi's rule: `n_-` is the number of sign changes
+    in `1, D_1, ..., D_n`).  If the permuted matrix hits a zero minor, or the
+    matrix is singular, exact rational congruence diagonalization decides.
+    """
+    n = M.shape[0]
+    if n == 0:
+        return (0, 0, 0)
+    factor = _float_ldl(M)
+    if factor is not None:
+        certified = _certified_float_inertia(M, factor)
+        if certified is not None:
+            return certified
+        order = factor[0]
+        M = M[np.ix_(order, order)]
+    minors = leading_principal_minors(M)
+    if minors is not None and minors[-1] != 0:
+        q = sum(1 for a, b in zip([1] + minors, minors) if (a > 0) != (b > 0))
+        return (n - q, q, 0)
+    return _congruence_inertia(M)
+
+
+def rational_signature(rows: Sequence[Sequence[Fraction | int]]) -> tuple[int, int]:
+    """Signature `(n_+, n_-)` of a symmetric rational matrix; degenerate directions are dropped."""
+    M, _ = integer_matrix(rows)
+    p, q, _ = inertia(M)
+    return (p, q)
+
+
+def smith_normal_form(M: np.ndarray) -> tuple[list[int], np.ndarray, np.ndarray]:
+    """Smith normal form `U M V = diag(d_1, ..., d_r, 0, ...)` of an integer matrix.
+
+    Returns `(diagonal, U, V)` with `U`, `V` unimodular object-dtype arrays,
+    `d_i > 0` and `d_i | d_{i+1}`; `diagonal` has `min(m, n)` entries, the
+    trailing ones zero when `M` is singular.  Elimination picks the entry of
+    least absolute value as pivot so remainders shrink at every step.
+    """
+    m, n = M.shape
+    A = M.astype(object, copy=True)
+    U = np.eye(m, dtype=int).astype(object)
+    V = np.eye(n, dtype=int).astype(object)
+    for t in range(min(m, n)):
+        while True:
+            block = np.abs(A[t:, t:])
+            nonzero = np.argwhere(block != 0)
+            if nonzero.size == 0:
+                return [int(A[i, i]) for i in range(min(m, n))], U, V
+            i, j = min(nonzero, key=lambda ij: block[ij[0], ij[1]]) + t
+            A[[t, i]] = A[[i, t]]
+            U[[t, i]] = U[[i, t]]
+            A[:, [t, j]] = A[:, [j, t]]
+            V[:, [t, j]] = V[:, [j, t]]
+            pivot = A[t, t]
+            q = A[t + 1 :, t] // pivot
+            A[t + 1 :] -= np.outer(q, A[t])
+            U[t + 1 :] -= np.outer(q, U[t])
+            q = A[t, t + 1 :] // pivot
+            A[:, t + 1 :] -= np.outer(A[:, t], q)
+            V[:, t + 1 :] -= np.outer(V[:, t], q)
+            if A[t + 1 :, t].any() or A[t, t + 1 :].any():
+                continue
+            # Pivot must divide the rest; otherwise fold an offending row in and retry.
+            bad = np.argwhere(A[t + 1 :, t + 1 :] % pivot != 0)
+            if bad.size == 0:
+                break
+            r = t + 1 + int(bad[0][0])
+            A[t] += A[r]
+            U[t] += U[r]
+        if A[t, t] < 0:
+            A[t] = -A[t]
+            U[t] = -U[t]
+    return [int(A[i, i]) for i in range(min(m, n))], U, V
+
+
+def _bezout(a: int, b: int) -> tuple[int, int, int]:
+    """`(g, s, t)` with `g = gcd(a, b) = s a + t b` and `g >= 0`."""
+    s0, s1, t0, t1 = 1, 0, 0, 1
+    while b:
+        q = a // b
+        a, b = b, a - q * b
+        s0, s1 = s1, s0 - q * s1
+        t0, t1 = t1, t0 - q * t1
+    return (a, s0, t0) if a >= 0 else (-a, -s0, -t0)
+
+
+def hermite_insert(H: np.ndarray, v: Sequence[int], gram: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Upper-triangular Hermite basis of the lattice spanned by the rows of `H` and `v`, with its Gram matrix.
+
+    `H` is a full-rank Hermite basis and `gram` the Gram matrix of the rows
+    `[H; v]`.  `v` is cleared column by column against the pivots by `2 x 2`
+    unimodular row operations, then the entries above the pivots are reduced;
+    each operation is applied to `gram` by congruence, at `O(n)` per operation.
+    """
+    n = H.shape[0]
+    R = np.vstack([H.astype(object), np.asarray(v, dtype=object).reshape(1, n)])
+    A = gram.astype(object, copy=True)
+
+    def combine(i: int, j: int, a: int, b: int, c: int, d: int) -> None:
+        # (row_i, row_j) <- (a row_i + b row_j, c row_i + d row_j), on the basis and on both sides of the Gram.
+        R[[i, j]] = [a * R[i] + b * R[j], c * R[i] + d * R[j]]
+        A[[i, j]] = [a * A[i] + b * A[j], c * A[i] + d * A[j]]
+        A[:, [i, j]] = np.stack([a * A[:, i] + b * A[:, j], c * A[:, i] + d * A[:, j]], axis=1)
+
+    for k in range(n):
+        if R[n, k] == 0:
+            continue
+        g, s, t = _bezout(int(R[k, k]), int(R[n, k]))
+        combine(k, n, s, t, -(R[n, k] // g), R[k, k] // g)
+    assert not R[n].any(), f"Rows of H do not have full rank: H={H}"
+    for k in range(n):
+        for i in range(k):
+            q = R[i, k] // R[k, k]
+            if q:
+                combine(i, k, 1, -q, 0, 1)
+    return R[:n], A[:n, :n]
+
+
+def rational_solve(A: np.ndarray, b: Sequence[int | Fraction]) -> tuple[Fraction, ...]:
+    """Exact solution `x` of `A x = b` for a nonsingular square integer matrix `A`."""
+    n = A.shape[0]
+    R = [[Fraction(int(v)) for v in row] + [Fraction(b[i])] for i, row in enumerate(A)]
+    for k in range(n):
+        pivot = next((i for i in range(k, n) if R[i][k] != 0), None)
+        assert pivot is not None, "Linear system is singular."
+        R[k], R[pivot] = R[pivot], R[k]
+        for i in range(n):
+            if i != k and R[i][k] != 0:
+                f = R[i][k] / R[k][k]
+                R[i] = [a - f * c for a, c in zip(R[i], R[k])]
+    return tuple(R[i][n] / R[i][i] for i in range(n))
+
+
+def unimodular_inverse(M: np.ndarray) -> np.ndarray:
+    """Exact inverse of a square integer matrix with determinant `±1`.
+
+    The Smith form of a unimodular `M` is `U M V = I`, so `M^{-1} = V U`.
+    """
+    diagonal, U, V = smith_normal_form(M)
+    assert all(d == 1 for d in diagonal), f"Matrix is not unimodular: invariants={diagonal}"
+    return V @ U
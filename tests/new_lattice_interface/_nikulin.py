@@ -0,0 +1,194 @@
+"""Nikulin's existence criteria for even lattices and primitive embeddings.
+
+Over `ZZ_p` the `p`-part `q_p` of a nondegenerate finite quadratic form is the
+discriminant form of a lattice `K(q_p)` of rank `l(A_{q_p})`, the number of
+invariants divisible by `p`; it is unique except for the choice of the
+`q_theta(2)` summands at `p = 2`.  A Gram matrix comes straight from the
+value table.  If `g_1, ..., g_r` generate `A_{q_p}` and `B` lifts the
+values `b(g_i, g_j)` to `QQ`, with the `q(g_i)` on the diagonal, then
+`B^{-1}` is `p`-integral and its dual basis realizes the `g_i` with the
+values `B`.  Scaled by the square of a `p`-adic unit it becomes an integer
+matrix, and `_genus.local_symbol` turns it into the canonical `p`-adic symbol,
+a normal form of `q_p`.
+
+From those symbols, an even lattice with signature `(t_+, t_-)` and form `q`
+exists iff (Nikulin, *Integral symmetric bilinear forms*, 1.10.1):
+
+- `t_+ - t_- = sign q (mod 8)`, where the oddity formula gives
+  `sign q = oddity K(q_2) - sum_p p-excess K(q_p)`;
+- `t_+, t_- >= 0` and `t_+ + t_- >= l(A_q)`;
+- at each odd `p` with `t_+ + t_- = l(A_{q_p})`, `(-1)^{t_-} |A_q|` and
+  `det K(q_p)` have the same unit square class;
+- the same at `p = 2` up to sign, unless `q_2` has a `q_theta(2)` summand,
+  i.e. unless the level-2 constituent of `K(q_2)` is odd.
+
+An even lattice `S` embeds primitively into an even lattice `L`, with
+orthogonal complement `K`, iff (Theorem 1.15.1) some isotropic subgroup
+`Gamma` of `-q_S + q_L` that meets neither summand admits such a `K`.
+`Gamma` is the graph of an isometry between subgroups of `A_S` and `A_L`,
+`K` has signature `sig L - sig S`, and its form is `Gamma^perp / Gamma`.
+That form is the discriminant form of the overlattice of `S(-1) + L` glued
+along `Gamma`.  For unimodular `L` only `Gamma = 0` occurs, and the test is
+on `-q_S` alone (Theorem 1.12.2).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from ._discriminant import DiscriminantForm, discriminant_form
+from ._form_group import FormElements
+from ._genus import LocalSymbol, _legendre, _prime_divisors, _valuation, local_symbol
+from ._glue import isotropic_subgroups, overlattice
+from ._linalg import bareiss_determinant, integer_matmul, rational_solve
+
+
+@dataclass(frozen=True)
+class LocalForm:
+    """The `p`-part of a finite quadratic form: `l(A_{q_p})` and the canonical symbol of `K(q_p)`."""
+
+    p: int
+    length: int
+    symbol: LocalSymbol
+
+    def sign(self) -> int:
+        """Contribution of `q_p` to `sign q (mod 8)`: the oddity at `2`, minus the `p`-excess otherwise."""
+        p = self.p
+        odd_scaled = sum(4 for c in self.symbol if c[0] % 2 and c[2] == -1)
+        if p == 2:
+            return (sum(c[4] for c in self.symbol) + odd_scaled) % 8
+        return -(sum(c[1] * (p ** c[0] - 1) for c in self.symbol) + odd_scaled) % 8
+
+    def unit_class(self) -> int:
+        """`(u / p)` for the unit part `u` of `det K(q_p)`; at `2` the Kronecker symbol `(2 / u)`."""
+        out = 1
+        for c in self.symbol:
+            out *= c[2]
+        return out
+
+    def has_odd_level_two(self) -> bool:
+        """Whether `q_2` splits off a `q_theta(2)`, so that `K(q_2)` is not determined by `q_2`."""
+        return self.p == 2 and any(c[0] == 1 and c[3] for c in self.symbol)
+
+
+def local_gram(form: DiscriminantForm, p: int) -> np.ndarray:
+    """Integer Gram matrix of `K(q_p)`, from the generators `(d_i / p^{v_i}) g_i` of `A_{q_p}`."""
+    assert form.quadratic_modulus == 2, "Nikulin's criteria concern the discriminant forms of even lattices."
+    m = form.exponent
+    e = _valuation(m, p, 1 << 30)
+    cofactor = m // p**e
+    keep = [i for i, d in enumerate(form.invariants) if d % p == 0]
+    t = [form.invariants[i] // p ** _valuation(form.invariants[i], p, 1 << 30) for i in keep]
+    r = len(keep)
+    # Numerators of b (and of q on the diagonal) over p^e for the p-part generators.
+    N = np.zeros((r, r), dtype=object)
+    for a, i in enumerate(keep):
+        for b, j in enumerate(keep):
+            value = t[a] * t[b] * int(form.gram[i, j]) % (2 * m if a == b else m)
+            assert value % cofactor == 0, "The p-part generators pair outside (1 / p^e) ZZ."
+            N[a, b] = value // cofactor
+    # K = p^e N^{-1}; scaling by the square of the unit part u of det N clears every denominator.
+    det = bareiss_determinant(N)
+    u = det // p ** _valuation(det, p, 1 << 30)
+    columns = [rational_solve(N, [int(a == b) for a in range(r)]) for b in range(r)]
+    K = [[p**e * u * u * columns[b][a] for b in range(r)] for a in range(r)]
+    assert all(x.denominator == 1 for row in K for x in row), "K(q_p) is not p-integral; the form is degenerate."
+    return np.array([[int(x) for x in row] for row in K], dtype=object).reshape(r, r)
+
+
+@dataclass(frozen=True)
+class LocalForms:
+    """The `p`-parts of a form, reduced to what Nikulin 1.10.1 asks of them.
+
+    `sign` is `sign q (mod 8)`, `lengths[p]` is `l(A_{q_p})`, and `checks` lists
+    `(p, l(A_{q_p}), unit part of |A_q| at p, unit class of det K(q_p))` for the
+    primes where the determinant condition can bind.
+    """
+
+    sign: int
+    lengths: dict[int, int]
+    checks: tuple[tuple[int, int, int, int], ...]
+
+    @classmethod
+    def of(cls, form: DiscriminantForm) -> "LocalForms":
+        order = int(np.prod([int(d) for d in form.invariants], dtype=object)) if form.invariants else 1
+        forms = local_forms(form)
+        checks = tuple(
+            (local.p, local.length, order // local.p ** _valuation(order, local.p, 1 << 30), local.unit_class())
+            for local in forms
+            if not local.has_odd_level_two()
+        )
+        return cls(sum(local.sign() for local in forms) % 8, {local.p: local.length for local in forms}, checks)
+
+    def admits(self, t_plus: int, t_minus: int) -> bool:
+        """Nikulin 1.10.1: is there an even lattice of signature `(t_plus, t_minus)` with this form?"""
+        if t_plus < 0 or t_minus < 0 or (t_plus - t_minus - self.sign) % 8:
+            return False
+        rank = t_plus + t_minus
+        if rank < max(self.lengths.values(), default=0):
+            return False
+        return all(
+            rank != length or _legendre((-1) ** t_minus * unit, p) == unit_class
+            for p, length, unit, unit_class in self.checks
+        )
+
+
+def local_forms(form: DiscriminantForm) -> tuple[LocalForm, ...]:
+    """`LocalForm` of every `p`-part, for the primes dividing `|A_q|`."""
+    order = int(np.prod([int(d) for d in form.invariants], dtype=object)) if form.invariants else 1
+    out = []
+    for p in _prime_divisors(order):
+        K = local_gram(form, p)
+        out.append(LocalForm(p, K.shape[0], local_symbol(tuple(tuple(int(v) for v in row) for row in K), p)))
+    return tuple(out)
+
+
+def even_lattice_exists(form: DiscriminantForm, t_plus: int, t_minus: int) -> bool:
+    """Nikulin 1.10.1 for a form seen once; callers asking repeatedly keep its `LocalForms`."""
+    return LocalForms.of(form).admits(t_plus, t_minus)
+
+
+def graph_elements(form: DiscriminantForm, E: FormElements, split: int) -> np.ndarray:
+    """Elements of `A_S + A_L` (the form of `S(-1) + L`, `S` on the first `split` coordinates) in neither summand."""
+    m = form.exponent
+    scale = np.array([m // int(d) for d in form.invariants], dtype=object)
+    # Numerators over m of the lifts to S^vee + L^vee: an element lies in A_L iff its S-part is integral.
+    lifts = integer_matmul(E.coords.astype(object), form.generators * scale[:, None]) % m
+    in_l = ~lifts[:, :split].any(axis=1)
+    in_s = ~lifts[:, split:].any(axis=1)
+    return ~(in_l | in_s)
+
+
+def embedding_exists(
+    S: np.ndarray,
+    L: np.ndarray,
+    signature_s: tuple[int, int],
+    signature_l: tuple[int, int],
+    *,
+    source_form: DiscriminantForm | None = None,
+) -> bool:
+    """Theorems 1.12.2 / 1.15.1: does the even lattice with Gram `S` embed primitively into the one with Gram `L`?
+
+    `source_form` is the discriminant form of `S` when already known.
+    """
+    t_plus, t_minus = signature_l[0] - signature_s[0], signature_l[1] - signature_s[1]
+    if t_plus < 0 or t_minus < 0:
+        return False
+    if abs(bareiss_determinant(L.astype(object))) == 1:
+        return even_lattice_exists((source_form or discriminant_form(S)).opposite(), t_plus, t_minus)
+    n = S.shape[0]
+    W = np.zeros((n + L.shape[0], n + L.shape[0]), dtype=object)
+    W[:n, :n] = -S
+    W[n:, n:] = L
+    form = discriminant_form(W)
+    if even_lattice_exists(form, t_plus, t_minus):
+        return True
+    E = FormElements.of(form)
+    for gamma in isotropic_subgroups(E, allowed=graph_elements(form, E, n)):
+        B, denominator = overlattice(form, [E.coords[g] for g in gamma.generators])
+        glued = integer_matmul(integer_matmul(B, W), B.T) // denominator**2
+        if even_lattice_exists(discriminant_form(glued), t_plus, t_minus):
+            return True
+    return False
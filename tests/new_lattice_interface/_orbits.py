@@ -0,0 +1,83 @@
+"""Bounded orbit enumeration under a finite set of integer matrices.
+
+Vectors are integer coordinate rows and group elements act by `x -> M x`.
+Orbits of infinite groups (e.g. on hyperbolic lattices) are infinite, so the
+search is bounded by the height `max_i |x_i|`: a breadth-first walk from the
+seed applies every generator to the whole current frontier in one matrix
+product, discards images above the bound, and keys the survivors in a hash set
+of coordinate tuples.  Vectors are yielded as soon as they are discovered.
+
+The walk only follows generator steps that stay within the bound, so it
+returns the orbit points reachable through vectors of height at most `bound`:
+the box-connected part of the orbit, which may miss points of the box.
+Definite lattices, whose `O(L)` is finite, cut their orbits to the box by
+testing the equal-norm vectors of the box instead (see `close_vectors`).
+"""
+
+from __future__ import annotations
+
+from itertools import combinations, product
+from typing import Iterator, Sequence
+
+import numpy as np
+
+from ._linalg import integer_matmul
+
+
+def _heights(X: np.ndarray) -> np.ndarray:
+    return np.abs(X).max(axis=1)
+
+
+def bounded_orbit(
+    seed: Sequence[int], generators: Sequence[np.ndarray], bound: int
+) -> Iterator[tuple[int, ...]]:
+    """Yield the seed, then each new vector of its bounded orbit, breadth first."""
+    start = tuple(int(c) for c in seed)
+    seen = {start}
+    yield start
+    if not generators or max((abs(c) for c in start), default=0) > bound:
+        return
+    transposes = [np.asarray(M).T for M in generators]
+    frontier = np.array([start], dtype=np.int64 if bound < 2**62 else object)
+    while frontier.shape[0]:
+        images = np.concatenate([integer_matmul(frontier, T) for T in transposes])
+        images = images[_heights(images) <= bound]
+        if images.dtype != object:
+            images = np.unique(images, axis=0)
+        fresh = []
+        for row in images.tolist():
+            key = tuple(row)
+            if key not in seen:
+                seen.add(key)
+                fresh.append(key)
+                yield key
+        frontier = np.array(fresh, dtype=frontier.dtype).reshape(len(fresh), frontier.shape[1])
+
+
+def reflective_vectors(G: np.ndarray, *, support: int | None = None) -> list[tuple[int, ...]]:
+    """Return the `{0, ±1}`-vectors `r`, one of each `±r`, whose reflection preserves `ZZ^n`.
+
+    `G` is an integer Gram matrix; `r` qualifies when `(r, r) != 0` divides
+    `2 G r`.  Only vectors with at most `support` nonzero coordinates are
+    tried (all of them by default).
+    """
+    n = G.shape[0]
+    support = n if support is None else min(support, n)
+    rows = []
+    for k in range(1, support + 1):
+        for idx in combinations(range(n), k):
+            # Fixing the last nonzero coordinate to +1 keeps one of each pair `±r`.
+            for signs in product((-1, 1), repeat=k - 1):
+                row = [0] * n
+                for i, s in zip(idx, signs + (1,)):
+                    row[i] = s
+                rows.append(row)
+    if not rows:
+        return []
+    X = np.array(rows, dtype=np.int64)
+    GX = integer_matmul(X, G.T)
+    norms = (GX * X).sum(axis=1)
+    keep = norms != 0
+    X, GX, norms = X[keep], GX[keep], norms[keep]
+    ok = ((2 * GX) % norms[:, None] == 0).all(axis=1)
+    return [tuple(row) for row in X[ok].tolist()]
@@ -0,0 +1,105 @@
+"""Lattice basis reduction on Gram matrices for the contract backend."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from fractions import Fraction
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ReducedBasis:
+    """An LLL-reduced basis given by its unimodular transform.
+
+    Row `i` of `transform` holds the user coordinates of reduced basis vector
+    `i`, so `gram == transform @ G @ transform.T` for the user Gram `G`.
+    """
+
+    gram: np.ndarray
+    transform: np.ndarray
+
+    def to_user(self, coords) -> tuple[int, ...]:
+        """Map coordinates in the reduced basis back to user coordinates."""
+        return tuple(int(v) for v in np.array(coords, dtype=object) @ self.transform)
+
+    def to_user_many(self, coords: np.ndarray) -> np.ndarray:
+        return coords.astype(object) @ self.transform
+
+
+def _nearest(num: int, den: int) -> int:
+    """Nearest integer to `num / den` for `den > 0`, rounding halves up."""
+    return (2 * num + den) // (2 * den)
+
+
+def lll_reduce(G: np.ndarray, delta: Fraction = Fraction(99, 100)) -> ReducedBasis:
+    """Integral LLL reduction of a positive-definite integer Gram matrix.
+
+    Cohen, *A Course in Computational Algebraic Number Theory*, Alg. 2.6.7:
+    Gram–Schmidt data is kept as the integers `d_i` (leading principal minors)
+    and `lam[k][j] = d_{j+1} mu_{k,j}`, so all arithmetic is exact in ZZ.
+    """
+    n = G.shape[0]
+    g = [[int(G[i, j]) for j in range(n)] for i in range(n)]
+    H = [[1 if i == j else 0 for j in range(n)] for i in range(n)]
+    if n <= 1:
+        return ReducedBasis(np.array(g, dtype=object).reshape(n, n), np.array(H, dtype=object).reshape(n, n))
+    dnum, dden = delta.numerator, delta.denominator
+    lam = [[0] * n for _ in range(n)]
+    # d[i + 1] is the i-th leading principal minor (1-based in Cohen), d[0] = 1.
+    d = [1] * (n + 1)
+    d[1] = g[0][0]
+
+    def red(k: int, l: int) -> None:
+        if 2 * abs(lam[k][l]) <= d[l + 1]:
+            return
+        q = _nearest(lam[k][l], d[l + 1])
+        H[k] = [a - q * b for a, b in zip(H[k], H[l])]
+        row_l = g[l]
+        g[k][k] += -2 * q * g[k][l] + q * q * row_l[l]
+        for j in range(n):
+            if j != k:
+                g[k][j] -= q * row_l[j]
+                g[j][k] = g[k][j]
+        lam[k][l] -= q * d[l + 1]
+        for i in range(l):
+            lam[k][i] -= q * lam[l][i]
+
+    def swap(k: int, kmax: int) -> None:
+        H[k], H[k - 1] = H[k - 1], H[k]
+        g[k], g[k - 1] = g[k - 1], g[k]
+        for row in g:
+            row[k], row[k - 1] = row[k - 1], row[k]
+        for j in range(k - 1):
+            lam[k][j], lam[k - 1][j] = lam[k - 1][j], lam[k][j]
+        m = lam[k][k - 1]
+        B = (d[k - 1] * d[k + 1] + m * m) // d[k]
+        for i in range(k + 1, kmax + 1):
+            t = lam[i][k]
+            lam[i][k] = (d[k + 1] * lam[i][k - 1] - m * t) // d[k]
+            lam[i][k - 1] = (B * t + m * lam[i][k]) // d[k + 1]
+        d[k] = B
+
+    k, kmax = 1, 0
+    while k < n:
+        if k > kmax:
+            kmax = k
+            for j in range(k + 1):
+                u = g[k][j]
+                for i in range(j):
+                    u = (d[i + 1] * u - lam[k][i] * lam[j][i]) // d[i]
+                if j < k:
+                    lam[k][j] = u
+                else:
+                    assert u != 0, "LLL input Gram matrix is not positive definite."
+                    d[k + 1] = u
+        red(k, k - 1)
+        # Lovasz condition: d_k d_{k-2} >= delta d_{k-1}^2 - lam^2, scaled by delta's denominator.
+        if dden * d[k + 1] * d[k - 1] < dnum * d[k] * d[k] - dden * lam[k][k - 1] ** 2:
+            swap(k, kmax)
+            k = max(1, k - 1)
+        else:
+            for l in range(k - 2, -1, -1):
+                red(k, l)
+            k += 1
+    return ReducedBasis(np.array(g, dtype=object), np.array(H, dtype=object))
@@ -0,0 +1,299 @@
+"""Vinberg's algorithm for the reflection chamber of a hyperbolic lattice.
+
+`G` is an integer Gram matrix of signature `(1, n - 1)`.  A root is a
+primitive `r` with `(r, r) = -m < 0` and `m | 2 (r, x)` for every `x in L`, so
+the reflection `x -> x - 2 (x, r) / (r, r) r` is integral; primitivity forces
+`m | 2 e` for the exponent `e` of `L^vee / L`.
+
+A controlling vector `v0` with `(v0, v0) > 0` is fixed.  The roots orthogonal
+to `v0` form a finite root system; its simple roots for a generic direction
+`w` in `v0^perp` are the first walls.  The other roots are visited in order of
+height `(r, v0)^2 / (m (v0, v0))`, the `sinh^2` of the distance from `v0` to
+the mirror of `r`, and a root is accepted as a wall iff `(r, r_j) >= 0` for
+every accepted `r_j`.  The pairings `G r_j` of accepted roots are kept as
+columns, so each new batch costs one product with them.  After every height
+that adds walls, Vinberg's criterion on the Coxeter diagram of the walls
+decides whether the chamber has finite volume.
+
+Candidates with `(r, v0) = k` lie in an affine slice: with `(x1, v0) = g`
+(the content of `G v0`) and `N` an LLL-reduced basis of `v0^perp`, write
+`x = (k / g) x1 + N z`; then `(x, x) = -m` becomes
+`(z - (k / g) c)^T P (z - (k / g) c) = m + k^2 / (v0, v0)` for the
+positive-definite `P = -N^T G N` and `c = P^{-1} N^T G x1`, a close-vector
+enumeration.  The walk runs in coordinates whose first entries are the
+pairings with the height-0 walls, which every later wall must have
+non-negative, so it only visits one chamber of their finite reflection group.  A slice walk
+can be split across worker processes by the values of its outermost
+coordinate.
+"""
+
+from __future__ import annotations
+
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from fractions import Fraction
+from itertools import combinations, groupby
+from math import gcd, lcm
+from typing import Iterator
+
+import numpy as np
+
+from ._coxeter import CoxeterDiagram
+from ._enumeration import ShortVectorEnumerator, close_vectors
+from ._linalg import bareiss_determinant, integer_matmul, rational_solve, smith_normal_form
+from ._reduction import lll_reduce
+
+
+@dataclass(frozen=True)
+class VinbergResult:
+    """Walls found by Vinberg's algorithm, in the order they were accepted.
+
+    `gram` is the Gram matrix of `roots`; `finite_volume` is `False` when the
+    search stopped at `max_height` before the chamber closed up.
+    """
+
+    roots: tuple[tuple[int, ...], ...]
+    gram: np.ndarray
+    controlling_vector: tuple[int, ...]
+    finite_volume: bool
+
+
+@dataclass(frozen=True)
+class _Frame:
+    """`v0^perp` with an LLL-reduced basis `kernel` and a vector `base` with `(base, v0) = content`."""
+
+    content: int
+    base: np.ndarray
+    kernel: np.ndarray
+    gram: np.ndarray
+
+    @classmethod
+    def of(cls, G: np.ndarray, v0: tuple[int, ...]) -> "_Frame":
+        a = np.array([v0], dtype=object) @ G
+        diagonal, U, V = smith_normal_form(a)
+        reduced = lll_reduce(-(V[:, 1:].T @ G @ V[:, 1:]))
+        return cls(diagonal[0], V[:, 0] * U[0, 0], V[:, 1:] @ reduced.transform.T, reduced.gram)
+
+
+@dataclass(frozen=True)
+class _Slices:
+    """Enumerates the roots with `(r, v0) = k` for one `k` at a time.
+
+    Slice points are walked in the coordinates `u = M z + s beta`, whose first
+    `walls` entries are the pairings with the height-0 walls and must be
+    non-negative; `adjugate / det` inverts `M`, and `gram` is the slice form
+    in `u`-coordinates scaled by `det^2`.
+    """
+
+    G: np.ndarray
+    norms: tuple[int, ...]
+    v0_norm: int
+    frame: _Frame
+    walls: int
+    beta: np.ndarray
+    adjugate: np.ndarray
+    det: int
+    gram: np.ndarray
+    centre: tuple[Fraction, ...]
+
+    def roots(self, k: int, part: tuple[int, int] = (0, 1)) -> dict[int, list[tuple[int, ...]]]:
+        """Return `m -> sorted roots r` with `(r, v0) = k` and `(r, r) = -m` (in one `part` of the walk)."""
+        s = k // self.frame.content
+        radius = self.det**2 * (max(self.norms) + Fraction(k * k, self.v0_norm))
+        centre = [s * c for c in self.centre]
+        points = list(close_vectors(self.gram, centre, radius, nonnegative=self.walls, part=part))
+        if not points:
+            return {}
+        num = integer_matmul(np.array(points, dtype=np.int64) - s * self.beta, self.adjugate.T)
+        Z = num[(num % self.det == 0).all(axis=1)] // self.det
+        X = integer_matmul(Z, self.frame.kernel.T) + s * self.frame.base
+        return _filter_roots(self.G, X, self.norms)
+
+
+def _filter_roots(G: np.ndarray, X: np.ndarray, norms: tuple[int, ...]) -> dict[int, list[tuple[int, ...]]]:
+    """Keep the primitive rows of `X` of norm `-m` (`m` in `norms`) with `m | 2 G x`."""
+    GX = integer_matmul(X, G)
+    values = -(GX * X).sum(axis=1)
+    out: dict[int, list[tuple[int, ...]]] = {}
+    for m in norms:
+        rows = np.flatnonzero(values == m)
+        keep = [i for i in rows if not ((2 * GX[i]) % m).any() and gcd(*(int(v) for v in X[i])) == 1]
+        if keep:
+            out[m] = sorted(tuple(int(v) for v in X[i]) for i in keep)
+    return out
+
+
+def _slices(G: np.ndarray, v0: tuple[int, ...], norms: tuple[int, ...], frame: _Frame, walls: list[tuple[int, ...]]) -> _Slices:
+    q = frame.kernel.shape[1]
+    W = np.array(walls, dtype=object).reshape(len(walls), G.shape[0])
+    # Complete the wall pairings `W G N` by unit rows to a nonsingular `M`.
+    rows = list(W @ G @ frame.kernel)
+    for i in range(q):
+        if len(rows) == q:
+            break
+        trial = rows + [np.array([int(j == i) for j in range(q)], dtype=object)]
+        if sum(1 for d in smith_normal_form(np.array(trial, dtype=object))[0] if d) == len(trial):
+            rows = trial
+    M = np.array(rows, dtype=object).reshape(q, q)
+    det = bareiss_determinant(M)
+    adjugate = np.array([rational_solve(M, [det * int(i == j) for i in range(q)]) for j in range(q)], dtype=object).T
+    adjugate = adjugate.astype(int).astype(object) if q else adjugate
+    beta = np.concatenate([W @ G @ frame.base, np.zeros(q - len(walls), dtype=object)]) if q else np.zeros(0, dtype=object)
+    shift = rational_solve(frame.gram, list(frame.kernel.T @ G @ frame.base)) if q else ()
+    centre = tuple(b + sum(M[i, j] * shift[j] for j in range(q)) for i, b in enumerate(beta))
+    return _Slices(
+        G.astype(np.int64),
+        norms,
+        int(np.array(v0, dtype=object) @ G @ np.array(v0, dtype=object)),
+        _Frame(frame.content, frame.base.astype(np.int64), frame.kernel.astype(np.int64), frame.gram),
+        len(walls),
+        beta.astype(np.int64),
+        adjugate.astype(np.int64),
+        det,
+        (adjugate.T @ frame.gram @ adjugate).astype(object),
+        centre,
+    )
+
+
+def root_norms(G: np.ndarray, exponent: int) -> tuple[int, ...]:
+    """Candidate values of `m = -(r, r)`: the divisors of `2 e`, even ones only for even `G`."""
+    even = all(int(G[i, i]) % 2 == 0 for i in range(G.shape[0]))
+    return tuple(m for m in range(1, 2 * exponent + 1) if (2 * exponent) % m == 0 and not (even and m % 2))
+
+
+def controlling_vector(G: np.ndarray) -> tuple[int, ...]:
+    """A primitive vector of least positive norm among `e_i` and `e_i ± e_j`."""
+    n = G.shape[0]
+    candidates = [tuple(int(i == t) for t in range(n)) for i in range(n)]
+    for i, j in combinations(range(n), 2):
+        for sign in (1, -1):
+            candidates.append(tuple(1 if t == i else sign if t == j else 0 for t in range(n)))
+    X = np.array(candidates, dtype=object)
+    norms = ((X @ G.astype(object)) * X).sum(axis=1)
+    positive = [(int(q), v) for q, v in zip(norms, candidates) if q > 0]
+    assert positive, "No controlling vector of small support; reduce the Gram matrix first."
+    return min(positive)[1]
+
+
+def _heights(norms: tuple[int, ...], content: int, v0_norm: int) -> Iterator[tuple[Fraction, int, int]]:
+    """Yield `(height, k, m)` with `k > 0`, `content | k`, `m | 2 k`, in increasing height."""
+    heap = []
+    for m in norms:
+        step = lcm(content, m // gcd(m, 2))
+        heap.append((Fraction(step * step, m * v0_norm), step, m, step))
+    heapq.heapify(heap)
+    while heap:
+        h, k, m, step = heapq.heappop(heap)
+        yield h, k, m
+        nxt = k + step
+        heapq.heappush(heap, (Fraction(nxt * nxt, m * v0_norm), nxt, m, step))
+
+
+def _slice_roots(slices: _Slices, k: int, executor: ProcessPoolExecutor | None, parts: int) -> dict[int, list[tuple[int, ...]]]:
+    """Roots of slice `k`, with the walk split into `parts` jobs when a pool is given."""
+    if executor is None:
+        return slices.roots(k)
+    out: dict[int, list[tuple[int, ...]]] = {}
+    for future in [executor.submit(slices.roots, k, (p, parts)) for p in range(parts)]:
+        for m, rs in future.result().items():
+            out.setdefault(m, []).extend(rs)
+    return {m: sorted(rs) for m, rs in out.items()}
+
+
+def _generic_direction(G: np.ndarray, frame: _Frame, X: np.ndarray) -> np.ndarray:
+    """A vector `w` of `v0^perp` with `(r, w) != 0` for every row `r` of `X`."""
+    K = frame.kernel
+    for scale in range(2, 64):
+        w = K @ np.array([scale**i for i in range(K.shape[1])], dtype=object)
+        if all(v != 0 for v in X @ G @ w):
+            return w
+    raise AssertionError("No generic direction found in v0^perp.")
+
+
+def vinberg(
+    G: np.ndarray,
+    exponent: int,
+    *,
+    v0: tuple[int, ...] | None = None,
+    max_height: Fraction | int | None = None,
+    processes: int | None = None,
+) -> VinbergResult:
+    """Run Vinberg's algorithm on a Gram matrix of signature `(1, n - 1)`.
+
+    `exponent` is the exponent of the discriminant group.  The search stops
+    once the walls bound a finite-volume chamber, or after the last height not
+    exceeding `max_height` (unbounded by default).  With `processes`, each
+    slice walk is split across a pool of that many worker processes.
+    """
+    n = G.shape[0]
+    G = G.astype(object)
+    v0 = controlling_vector(G) if v0 is None else tuple(int(c) for c in v0)
+    norms = root_norms(G, exponent)
+    frame = _Frame.of(G, v0)
+
+    roots: list[tuple[int, ...]] = []
+    columns: list[np.ndarray] = []
+
+    def accept(X: np.ndarray) -> int:
+        """Accept the rows of `X` (one height) that pair non-negatively with all walls."""
+        alive = np.ones(X.shape[0], dtype=bool)
+        if columns:
+            alive &= (integer_matmul(X, np.stack(columns, axis=1)) >= 0).all(axis=1)
+        added = 0
+        for i in range(X.shape[0]):
+            if not alive[i]:
+                continue
+            r = X[i]
+            roots.append(tuple(int(v) for v in r))
+            columns.append(integer_matmul(G, r.reshape(-1, 1)).reshape(-1))
+            alive &= integer_matmul(X, columns[-1].reshape(-1, 1)).reshape(-1) >= 0
+            added += 1
+        return added
+
+    def gram() -> np.ndarray:
+        R = np.array(roots, dtype=object).reshape(len(roots), n)
+        return R @ np.stack(columns, axis=1) if roots else np.zeros((0, 0), dtype=object)
+
+    diagram = None
+
+    def finite_volume() -> bool:
+        nonlocal diagram
+        diagram = CoxeterDiagram.of(gram(), previous=diagram)
+        return diagram.finite_volume(n)
+
+    # Height 0: simple roots of the finite root system in v0^perp, chosen by distance to w.
+    zs = [z for z, _ in ShortVectorEnumerator(frame.gram, max(norms))]
+    found = [r for rs in _filter_roots(G, np.array(zs, dtype=object) @ frame.kernel.T, norms).values() for r in rs] if zs else []
+    if found:
+        X = np.array(sorted(found), dtype=object)
+        pair = X @ G @ _generic_direction(G, frame, X)
+        X = X * np.where(pair > 0, 1, -1)[:, None]
+        order = sorted(range(X.shape[0]), key=lambda i: Fraction(int(pair[i]) ** 2, -int(X[i] @ G @ X[i])))
+        accept(X[order])
+
+    volume = finite_volume() if roots else False
+    slices = _slices(G, v0, norms, frame, roots)
+    executor = ProcessPoolExecutor(processes) if processes else None
+    try:
+        cache: dict[int, dict[int, list[tuple[int, ...]]]] = {}
+        needed: dict[int, int] = {}
+        for h, batch in groupby(_heights(norms, frame.content, slices.v0_norm), key=lambda t: t[0]):
+            if volume or (max_height is not None and h > max_height):
+                break
+            candidates = []
+            for _, k, m in batch:
+                if k not in cache:
+                    cache[k] = _slice_roots(slices, k, executor, 4 * processes if processes else 1)
+                    needed[k] = sum(1 for t in norms if (2 * k) % t == 0)
+                candidates += cache[k].pop(m, [])
+                needed[k] -= 1
+                if not needed[k]:
+                    del cache[k], needed[k]
+            if candidates and accept(np.array(sorted(candidates), dtype=object)):
+                volume = finite_volume()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return VinbergResult(tuple(roots), gram(), v0, volume)
+
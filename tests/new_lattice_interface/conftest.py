@@ -1,15 +1,43 @@
 from __future__ import annotations
 
+import warnings
 from dataclasses import dataclass
 from fractions import Fraction
-from itertools import product
-from math import gcd
-from typing import Any
-
+from math import ceil, floor, gcd, lcm
+from typing import Any, Iterator
+
+import numpy as np
+import pytest
+
+from ._coxeter import CoxeterDiagram
+from ._discriminant import DiscriminantForm, discriminant_form
+from ._eichler import eichler_classes, eichler_invariants, splits_hyperbolic_planes
+from ._enumeration import ShortVectorEnumerator, close_vectors, find_shortest_vector, norm_counts
+from ._genus import GenusSymbol, genus_mass, genus_symbol
+from ._gram import GramMatrix, coordinate_array
+from ._fingerprint import Fingerprint, IsometryScreen, pairing_profile
+from ._form_group import FormElements, FormOrthogonalGroup
+from ._glue import GluedLattice, isotropic_subgroups, overlattice, overlattice_walk, representatives
+from ._isometry import ShortVectors, _orbit, automorphism_group, embeddings, find_isometry
+from ._isotropic import primitive_isotropic_vectors
+from ._kneser import genus_classes
+from ._nikulin import LocalForms, embedding_exists
+from ._linalg import (
+    bareiss_determinant,
+    integer_matmul,
+    integer_matrix,
+    rational_determinant,
+    rational_signature,
+    unimodular_inverse,
+)
+from ._orbits import bounded_orbit, reflective_vectors
+from ._reduction import ReducedBasis, lll_reduce
+from ._vinberg import vinberg
 from .types import (
     CoxeterData as AbstractCoxeterData,
     DefiniteLattice as AbstractDefiniteLattice,
     DiscriminantGroupElement as AbstractDiscriminantGroupElement,
+    DiscriminantOrthogonalGroup as AbstractDiscriminantOrthogonalGroup,
     HyperbolicLattice as AbstractHyperbolicLattice,
     IndefiniteLattice as AbstractIndefiniteLattice,
     Lattice as AbstractLattice,
@@ -17,8 +45,11 @@ from .types import (
     LatticeOrthogonalSubgroup as AbstractLatticeOrthogonalSubgroup,
     LatticeDiscriminantGroup as AbstractLatticeDiscriminantGroup,
     LatticeElement as AbstractLatticeElement,
+    LatticeGenus as AbstractLatticeGenus,
+    LatticeGlueData as AbstractLatticeGlueData,
     LatticeHyperplane as AbstractLatticeHyperplane,
     LatticePolytope as AbstractLatticePolytope,
+    LatticePrimitiveEmbedding as AbstractLatticePrimitiveEmbedding,
     LatticeQuotient as AbstractLatticeQuotient,
     LatticeQuotientElement as AbstractLatticeQuotientElement,
     LatticeRootSystem as AbstractLatticeRootSystem,
@@ -52,47 +83,12 @@ def _to_rows(gram) -> tuple[tuple[Fraction, ...], ...]:
     return tuple(tuple(_frac(gram[i, j]) for j in range(n)) for i in range(n))
 
 
-def _det(rows: tuple[tuple[Fraction, ...], ...]) -> Fraction:
-    n = len(rows)
-    if n == 1:
-        return rows[0][0]
-    if n == 2:
-        return rows[0][0] * rows[1][1] - rows[0][1] * rows[1][0]
-    total = Fraction(0)
-    for j in range(n):
-        minor = tuple(
-            tuple(rows[i][k] for k in range(n) if k != j)
-            for i in range(1, n)
-        )
-        total += ((-1) ** j) * rows[0][j] * _det(minor)
-    return total
-
-
-def _signature(rows: tuple[tuple[Fraction, ...], ...]) -> tuple[int, int]:
-    # Small contract backend: only dimensions used by tests require exact signatures.
-    if len(rows) == 2 and rows == ((Fraction(0), Fraction(1)), (Fraction(1), Fraction(0))):
-        return (1, 1)
-    if len(rows) == 2:
-        a, b, c = rows[0][0], rows[0][1], rows[1][1]
-        det = a * c - b * b
-        if a > 0 and det > 0:
-            return (2, 0)
-        if a < 0 and det > 0:
-            return (0, 2)
-    # Used for H3 contract fixture
-    if rows == (
-        (Fraction(-2), Fraction(0), Fraction(0)),
-        (Fraction(0), Fraction(-2), Fraction(0)),
-        (Fraction(0), Fraction(0), Fraction(2)),
-    ):
-        return (1, 2)
-    return (len(rows), 0)
-
-
 class LatticeElement(AbstractLatticeElement):
+    __slots__ = ("_lattice", "_coords")
+
     def __init__(self, lattice: "Lattice", coords: tuple[int, ...]):
         self._lattice = lattice
-        self._coords = tuple(int(c) for c in coords)
+        self._coords = tuple(map(int, coords))
 
     def __iter__(self):
         return iter(self._coords)
@@ -109,11 +105,11 @@ class LatticeElement(AbstractLatticeElement):
     def coords(self) -> tuple[int, ...]:
         return self._coords
 
-    def norm(self) -> int:
-        return int(self._lattice.norm(self))
+    def norm(self) -> int | Fraction:
+        return self._lattice.norm(self)
 
-    def __mul__(self, other: "LatticeElement") -> int:
-        return int(self._lattice.pairing(self, other))
+    def __mul__(self, other: "LatticeElement") -> int | Fraction:
+        return self._lattice.pairing(self, other)
 
     def perp(self) -> "SubLattice":
         # Minimal contract support for U and isotropic e=(1,0).
@@ -121,6 +117,8 @@ class LatticeElement(AbstractLatticeElement):
 
 
 class RootLatticeElement(LatticeElement, AbstractRootLatticeElement):
+    __slots__ = ()
+
     def reflection(self) -> "LatticeAutomorphism":
         return self._lattice.reflection(self)
 
@@ -129,9 +127,11 @@ class RootLatticeElement(LatticeElement, AbstractRootLatticeElement):
 
 
 class LatticeHyperplane(AbstractLatticeHyperplane):
+    lattice: "Lattice"
+    root: RootLatticeElement
+
     def __init__(self, lattice: "Lattice", root: RootLatticeElement):
-        self.lattice = lattice
-        self.root = root
+        super().__init__(lattice=lattice, root=root)
 
     def __eq__(self, other: object) -> bool:
         return isinstance(other, LatticeHyperplane) and self.lattice is other.lattice and self.root == other.root
@@ -141,9 +141,14 @@ class LatticeHyperplane(AbstractLatticeHyperplane):
 
 
 class LatticeAutomorphism(AbstractLatticeAutomorphism):
-    def __init__(self, lattice: "Lattice", matrix: tuple[tuple[Fraction, ...], ...]):
+    """Automorphism `x -> M x` of a lattice, `M` an integer matrix acting on coordinate columns."""
+
+    def __init__(self, lattice: "Lattice", matrix, *, inverse: "LatticeAutomorphism | None" = None):
+        M, d = integer_matrix(matrix)
+        assert d == 1, f"Automorphism matrix must be integral: matrix={matrix}"
         self._lattice = lattice
-        self._matrix = matrix
+        self._matrix = M
+        self._inverse = inverse
 
     def source(self) -> "Lattice":
         return self._lattice
@@ -151,32 +156,36 @@ class LatticeAutomorphism(AbstractLatticeAutomorphism):
     def target(self) -> "Lattice":
         return self._lattice
 
-    def matrix(self) -> tuple[tuple[Fraction, ...], ...]:
-        return self._matrix
+    def matrix(self) -> tuple[tuple[int, ...], ...]:
+        return tuple(tuple(int(v) for v in row) for row in self._matrix)
 
     def inverse(self) -> "LatticeAutomorphism":
-        # Contract backend keeps only identity-like usage in tests; return self as minimal witness.
-        return self
+        if self._inverse is None:
+            self._inverse = LatticeAutomorphism(self._lattice, unimodular_inverse(self._matrix), inverse=self)
+        return self._inverse
+
+    def __mul__(self, other: "LatticeAutomorphism") -> "LatticeAutomorphism":
+        assert self._lattice is other._lattice, f"Cannot compose automorphisms of different lattices: {self}, {other}"
+        return LatticeAutomorphism(self._lattice, integer_matmul(self._matrix, other._matrix))
+
+    def apply_many(self, xs) -> np.ndarray:
+        return integer_matmul(coordinate_array(xs), self._matrix.T)
 
     def __call__(self, x: LatticeElement) -> LatticeElement:
-        v = x.coords()
-        out = []
-        for row in self._matrix:
-            out.append(sum(row[j] * Fraction(v[j]) for j in range(len(v))))
-        return self._lattice.element(tuple(int(v) for v in out))
+        return self._lattice.element(self.apply_many([x.coords()])[0])
 
     def __eq__(self, other: object) -> bool:
         return (
             isinstance(other, LatticeAutomorphism)
             and self._lattice is other._lattice
-            and self._matrix == other._matrix
+            and bool(np.array_equal(self._matrix, other._matrix))
         )
 
-    def determinant(self) -> Fraction:
-        return _det(self._matrix)
+    def determinant(self) -> int:
+        return bareiss_determinant(self._matrix)
 
     def __repr__(self) -> str:
-        return f"LatticeAutomorphism(matrix={self._matrix})"
+        return f"LatticeAutomorphism(matrix={self.matrix()})"
 
 
 class LatticeOrthogonalSubgroup(AbstractLatticeOrthogonalSubgroup):
@@ -191,39 +200,83 @@ class LatticeOrthogonalSubgroup(AbstractLatticeOrthogonalSubgroup):
 
 
 class LatticeCoxeterGroup(LatticeOrthogonalSubgroup, AbstractLatticeCoxeterGroup):
-    pass
+    simple_roots: tuple[RootLatticeElement, ...] = ()
+
+    def simple_reflections(self) -> tuple[LatticeAutomorphism, ...]:
+        return tuple(r.reflection() for r in self.simple_roots)
+
+    def coxeter_matrix(self) -> tuple[tuple[int, ...], ...]:
+        return _coxeter_diagram(self.lattice, self.simple_roots).coxeter_matrix()
 
 
 class OrthogonalGroup(LatticeOrthogonalSubgroup, AbstractOrthogonalGroup):
+    # Empty means the lattice's default generating set, see `Lattice._orthogonal_generators`.
+    generators: tuple[LatticeAutomorphism, ...] = ()
+
     def identity(self) -> LatticeAutomorphism:
-        n = self.lattice.rank()
-        m = tuple(tuple(Fraction(1 if i == j else 0) for j in range(n)) for i in range(n))
-        return LatticeAutomorphism(self.lattice, m)
+        return LatticeAutomorphism(self.lattice, np.eye(self.lattice.rank(), dtype=np.int64))
+
+    def _matrices(self) -> list[np.ndarray]:
+        # Generators and their inverses, so the walk explores the group rather than a monoid.
+        matrices: dict[tuple[int, ...], np.ndarray] = {}
+        for g in self.generators or self.lattice._orthogonal_generators():
+            for h in (g, g.inverse()):
+                matrices.setdefault(tuple(int(v) for v in h._matrix.flat), h._matrix)
+        return list(matrices.values())
+
+    def order(self) -> int:
+        return self.lattice._orthogonal_order()
+
+    def iter_orbit(self, x: LatticeElement, *, bound: int) -> Iterator[LatticeElement]:
+        for coords in self.lattice._orbit_in_box(x, bound, self._matrices()):
+            yield self.lattice.element(coords)
 
     def orbit(self, x: LatticeElement, *, bound: int) -> tuple[LatticeElement, ...]:
-        if self.lattice.signature() == (1, 1):
-            return (x,)
-        return (x,)
+        return tuple(self.iter_orbit(x, bound=bound))
 
     def same_orbit(self, x: LatticeElement, y: LatticeElement) -> bool:
-        if self.lattice.signature() == (1, 1):
-            return self.lattice.norm(x) == 0 and self.lattice.norm(y) == 0
-        return x == y
+        if self.lattice.norm(x) != self.lattice.norm(y):
+            return False
+        return self.lattice._same_orbit(x, y, self._matrices())
 
     def stabilizer(self, x: LatticeElement) -> LatticeOrthogonalSubgroup:
-        return LatticeOrthogonalSubgroup(lattice=self.lattice)
+        return self.lattice._stabilizer(fixed=(x,))
 
     def stabilizer_of_set(
         self, vectors: tuple[LatticeElement, ...] | list[LatticeElement]
     ) -> LatticeOrthogonalSubgroup:
-        return LatticeOrthogonalSubgroup(lattice=self.lattice)
+        return self.lattice._stabilizer(preserved=tuple(vectors))
+
+
+class LatticeStabilizer(LatticeOrthogonalSubgroup):
+    """Automorphisms fixing `fixed` pointwise and permuting `preserved`, with generators and order."""
+
+    fixed: tuple[LatticeElement, ...] = ()
+    preserved: tuple[LatticeElement, ...] = ()
+    generators: tuple[LatticeAutomorphism, ...] = ()
+    size: int = 1
+
+    def order(self) -> int:
+        return self.size
+
+    def contains(self, element: LatticeAutomorphism) -> bool:
+        if not super().contains(element):
+            return False
+        fixed = [x.coords() for x in self.fixed]
+        preserved = [x.coords() for x in self.preserved]
+        if not fixed and not preserved:
+            return True
+        images = [tuple(int(c) for c in row) for row in element.apply_many(fixed + preserved)]
+        return images[: len(fixed)] == fixed and set(images[len(fixed) :]) == set(preserved)
 
 
 class LatticeRootSystem(AbstractLatticeRootSystem):
+    family: str
+    rank: int
+    affine: bool = False
+
     def __init__(self, family: str, rank: int, affine: bool = False):
-        self.family = family
-        self.rank = int(rank)
-        self.affine = bool(affine)
+        super().__init__(family=family, rank=int(rank), affine=bool(affine))
 
     @classmethod
     def A(cls, rank: int) -> "LatticeRootSystem":
@@ -285,103 +338,412 @@ class LatticeRootSystem(AbstractLatticeRootSystem):
         return (self.family, self.rank, self.affine) == (other.family, other.rank, other.affine)
 
 
+def _coxeter_diagram(lattice: "Lattice", roots) -> CoxeterDiagram:
+    X = coordinate_array([r.coords() for r in roots], lattice.rank())
+    return CoxeterDiagram.of(lattice._data.gram.scaled_pairings(X, X))
+
+
 class LatticePolytope(AbstractLatticePolytope):
-    pass
+    """Chamber bounded by the mirrors of the roots of `walls`."""
+
+    def __init__(self, lattice: "Lattice", walls: tuple[LatticeHyperplane, ...]):
+        self._lattice = lattice
+        self._walls = walls
+        self._diagram: CoxeterDiagram | None = None
+
+    def walls(self) -> tuple[LatticeHyperplane, ...]:
+        return self._walls
+
+    def coxeter_diagram(self) -> CoxeterDiagram:
+        if self._diagram is None:
+            self._diagram = _coxeter_diagram(self._lattice, [h.root for h in self._walls])
+        return self._diagram
+
+    def has_finite_volume(self) -> bool:
+        n = self._lattice.rank()
+        assert self._lattice.signature() in ((1, n - 1), (n - 1, 1)), "Finite volume is only defined for hyperbolic chambers."
+        return self.coxeter_diagram().finite_volume(n)
 
 
 class CoxeterData(AbstractCoxeterData):
-    def __init__(self, lattice: "Lattice", root_system: LatticeRootSystem, simple_roots: tuple[RootLatticeElement, ...]):
+    # `root_system=None` reads the type off the Coxeter diagram of the simple roots when first asked.
+    def __init__(
+        self,
+        lattice: "Lattice",
+        root_system: LatticeRootSystem | None,
+        simple_roots: tuple[RootLatticeElement, ...],
+        finite_volume: bool,
+    ):
         self._lattice = lattice
         self._root_system = root_system
         self._simple_roots = simple_roots
+        self._finite_volume = finite_volume
+        self._domain: LatticePolytope | None = None
 
     def root_lattice(self) -> "RootLattice":
         return RootLattice.A(1)
 
     def fundamental_domain(self) -> LatticePolytope:
-        return LatticePolytope()
+        if self._domain is None:
+            self._domain = LatticePolytope(self._lattice, tuple(r.orthogonal_hyperplane() for r in self._simple_roots))
+        return self._domain
 
     def coxeter_group(self) -> LatticeCoxeterGroup:
-        return LatticeCoxeterGroup(lattice=self._lattice)
+        return LatticeCoxeterGroup(lattice=self._lattice, simple_roots=self._simple_roots)
 
     def root_system(self) -> LatticeRootSystem:
+        if self._root_system is None:
+            diagram = self.fundamental_domain().coxeter_diagram()
+            types = diagram.subdiagram_type(range(len(diagram)))
+            assert types is not None and len(types) == 1, (
+                f"The simple roots do not form a connected finite or affine diagram: {diagram.coxeter_matrix()}"
+            )
+            self._root_system = LatticeRootSystem(*types[0])
         return self._root_system
 
     def simple_roots(self) -> tuple[RootLatticeElement, ...]:
         return self._simple_roots
 
+    def has_finite_volume(self) -> bool:
+        return self._finite_volume
+
 
 class LatticeQuotientElement(AbstractLatticeQuotientElement):
-    def __init__(self, parent: "LatticeQuotient", value: int):
-        self.parent = parent
-        self.value = int(value) % self.parent.modulus
+    parent: "LatticeQuotient"
+    value: tuple[int, ...]
+
+    def __init__(self, parent: "LatticeQuotient", value: int | tuple[int, ...]):
+        super().__init__(parent=parent, value=parent.reduce(value))
 
     def __add__(self, other: "LatticeQuotientElement") -> "LatticeQuotientElement":
-        return self.parent.element(self.value + other.value)
+        return self.parent.element(tuple(a + b for a, b in zip(self.value, other.value)))
 
     def __neg__(self) -> "LatticeQuotientElement":
-        return self.parent.element(-self.value)
+        return self.parent.element(tuple(-a for a in self.value))
 
     def __eq__(self, other: object) -> bool:
         return isinstance(other, LatticeQuotientElement) and self.parent is other.parent and self.value == other.value
 
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}{self.value}"
+
+    __str__ = __repr__
+
 
 class DiscriminantGroupElement(LatticeQuotientElement, AbstractDiscriminantGroupElement):
     def order(self) -> int:
-        if self.value == 0:
-            return 1
-        m = self.parent.modulus
-        for k in range(1, m + 1):
-            if (k * self.value) % m == 0:
-                return k
-        return m
+        return lcm(1, *(d // gcd(a, d) for a, d in zip(self.value, self.parent.invariants)))
 
 
 class LatticeQuotient(AbstractLatticeQuotient):
-    def __init__(self, modulus: int):
-        self.modulus = int(modulus)
+    """Finite abelian group `(+)_i ZZ/invariants[i]`; elements are coordinate tuples."""
 
-    def element(self, value: int) -> LatticeQuotientElement:
+    invariants: tuple[int, ...]
+
+    def __init__(self, invariants: tuple[int, ...]):
+        super().__init__(invariants=tuple(int(d) for d in invariants))
+
+    def reduce(self, value: int | tuple[int, ...]) -> tuple[int, ...]:
+        if isinstance(value, int):
+            # An integer names a multiple of the first generator (cyclic groups).
+            value = (value,) + (0,) * (len(self.invariants) - 1) if self.invariants else ()
+        assert len(value) == len(self.invariants), f"Coordinate length mismatch: value={value}, invariants={self.invariants}"
+        return tuple(int(a) % d for a, d in zip(value, self.invariants))
+
+    def element(self, value: int | tuple[int, ...]) -> LatticeQuotientElement:
         return LatticeQuotientElement(self, value)
 
     def order(self) -> int:
-        return self.modulus
+        out = 1
+        for d in self.invariants:
+            out *= d
+        return out
 
     def zero(self) -> LatticeQuotientElement:
-        return self.element(0)
+        return self.element((0,) * len(self.invariants))
 
 
 class LatticeDiscriminantGroup(LatticeQuotient, AbstractLatticeDiscriminantGroup):
-    def __init__(self, modulus: int, qgen: Fraction):
-        super().__init__(modulus)
-        self._qgen = Fraction(qgen)
+    def __init__(self, form: DiscriminantForm):
+        super().__init__(form.invariants)
+        self._form = form
+        self._elements: FormElements | None = None
+        self._orthogonal_group: DiscriminantOrthogonalGroup | None = None
+        self._isotropic_subgroups: dict[bool, tuple[LatticeGlueData, ...]] = {}
+        self._local_forms: LocalForms | None = None
+
+    def _form_elements(self) -> FormElements:
+        # The element list, orders and q-values are shared by every group computation on this form.
+        if self._elements is None:
+            self._elements = FormElements.of(self._form)
+        return self._elements
+
+    def elements(self) -> tuple[DiscriminantGroupElement, ...]:
+        """All elements, in the order `DiscriminantAutomorphism.permutation` refers to."""
+        return tuple(self.element(tuple(int(v) for v in row)) for row in self._form_elements().coords)
+
+    def orthogonal_group(self) -> "DiscriminantOrthogonalGroup":
+        if self._orthogonal_group is None:
+            self._orthogonal_group = DiscriminantOrthogonalGroup(
+                discriminant=self, group=FormOrthogonalGroup.of(self._form_elements())
+            )
+        return self._orthogonal_group
+
+    def _local(self) -> LocalForms:
+        # The p-parts are normalized once; every existence query then only reads them.
+        if self._local_forms is None:
+            self._local_forms = LocalForms.of(self._form)
+        return self._local_forms
+
+    def minimal_number_of_generators(self, *, prime: int | None = None) -> int:
+        if prime is None:
+            return len(self._form.invariants)
+        return sum(1 for d in self._form.invariants if d % prime == 0)
+
+    def signature_mod_8(self) -> int:
+        return self._local().sign
+
+    def exists_even_lattice(self, *, t_plus: int, t_minus: int) -> bool:
+        return self._local().admits(t_plus, t_minus)
+
+    def isotropic_subgroups(self, *, up_to_isometry: bool = False) -> tuple["LatticeGlueData", ...]:
+        """Nontrivial isotropic subgroups, smallest first; one per `O(q)`-orbit with `up_to_isometry`."""
+        if up_to_isometry not in self._isotropic_subgroups:
+            E = self._form_elements()
+            permutations = [E.permutation(H) for H in self.orthogonal_group().group.generators] if up_to_isometry else []
+            self._isotropic_subgroups[up_to_isometry] = tuple(
+                LatticeGlueData(
+                    discriminant=self,
+                    generators=tuple(self.element(tuple(int(v) for v in E.coords[g])) for g in K.generators),
+                    size=len(K.members),
+                )
+                for K in isotropic_subgroups(E, permutations=permutations)
+            )
+        return self._isotropic_subgroups[up_to_isometry]
 
-    def element(self, value: int) -> DiscriminantGroupElement:
+    def element(self, value: int | tuple[int, ...]) -> DiscriminantGroupElement:
         return DiscriminantGroupElement(self, value)
 
     def generator(self, i: int) -> DiscriminantGroupElement:
-        assert i == 0, f"Only one generator available for this contract backend: i={i}"
-        return self.element(1)
+        k = len(self.invariants)
+        assert 0 <= i < k, f"Generator index out of range: i={i}, invariants={self.invariants}"
+        return self.element(tuple(1 if j == i else 0 for j in range(k)))
 
     def zero(self) -> DiscriminantGroupElement:
-        return self.element(0)
+        return self.element((0,) * len(self.invariants))
 
     def bilinear(self, x: DiscriminantGroupElement, y: DiscriminantGroupElement) -> Fraction:
-        return Fraction(x.value * y.value, 1) * self._qgen
+        return self._form.bilinear(x.value, y.value)
 
     def quadratic(self, x: DiscriminantGroupElement) -> Fraction:
-        return Fraction(x.value * x.value, 1) * self._qgen
+        return self._form.quadratic(x.value)
+
+
+class DiscriminantAutomorphism:
+    """Automorphism `a -> a H` of a discriminant form; row `i` of `H` is the image of generator `i`."""
+
+    def __init__(self, discriminant: LatticeDiscriminantGroup, matrix):
+        self._discriminant = discriminant
+        self._matrix = np.asarray(matrix, dtype=np.int64) % discriminant._form_elements().moduli
+
+    def matrix(self) -> tuple[tuple[int, ...], ...]:
+        return tuple(tuple(int(v) for v in row) for row in self._matrix)
+
+    def __call__(self, x: DiscriminantGroupElement) -> DiscriminantGroupElement:
+        image = self._discriminant._form_elements().apply(self._matrix, np.array(x.value, dtype=np.int64))
+        return self._discriminant.element(tuple(int(v) for v in image))
+
+    def __mul__(self, other: "DiscriminantAutomorphism") -> "DiscriminantAutomorphism":
+        # (self * other)(a) = self(other(a)): apply `other` first.
+        return DiscriminantAutomorphism(self._discriminant, other._matrix @ self._matrix)
+
+    def inverse(self) -> "DiscriminantAutomorphism":
+        return DiscriminantAutomorphism(self._discriminant, self._discriminant._form_elements().inverse(self._matrix))
+
+    def permutation(self) -> tuple[int, ...]:
+        """The induced permutation of `discriminant.elements()`."""
+        return tuple(int(i) for i in self._discriminant._form_elements().permutation(self._matrix))
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, DiscriminantAutomorphism)
+            and self._discriminant is other._discriminant
+            and bool(np.array_equal(self._matrix, other._matrix))
+        )
+
+    def __hash__(self) -> int:
+        return hash(self.matrix())
+
+    def __repr__(self) -> str:
+        return f"DiscriminantAutomorphism(matrix={self.matrix()})"
+
+
+class DiscriminantOrthogonalGroup(AbstractDiscriminantOrthogonalGroup):
+    """`O(q)` of a discriminant form, computed once per form; see `_form_group`."""
+
+    discriminant: LatticeDiscriminantGroup
+    group: FormOrthogonalGroup
+
+    def identity(self) -> DiscriminantAutomorphism:
+        return DiscriminantAutomorphism(self.discriminant, self.group.identity())
+
+    def order(self) -> int:
+        return self.group.order
+
+    def generators(self) -> tuple[DiscriminantAutomorphism, ...]:
+        return tuple(DiscriminantAutomorphism(self.discriminant, H) for H in self.group.generators)
+
+    def contains(self, automorphism) -> bool:
+        # Lattice isometries act through their image in O(A_L).
+        if isinstance(automorphism, LatticeAutomorphism):
+            lattice = automorphism.source()
+            automorphism = DiscriminantAutomorphism(
+                lattice.discriminant(), lattice.discriminant()._form.action(lattice._data.gram.entries, automorphism._matrix)
+            )
+        return (
+            isinstance(automorphism, DiscriminantAutomorphism)
+            and automorphism._discriminant is self.discriminant
+            and self.group.contains(automorphism._matrix)
+        )
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, DiscriminantOrthogonalGroup) and self.discriminant is other.discriminant
+
+
+class LatticeGlueData(AbstractLatticeGlueData):
+    """Isotropic subgroup of `discriminant` of order `size`, spanned by `generators`."""
+
+    discriminant: LatticeDiscriminantGroup
+    generators: tuple[DiscriminantGroupElement, ...] = ()
+    size: int = 1
+
+    def base_discriminant_form(self) -> LatticeDiscriminantGroup:
+        return self.discriminant
+
+    def subgroup_generators(self) -> tuple[DiscriminantGroupElement, ...]:
+        return self.generators
+
+    def order(self) -> int:
+        return self.size
+
+    def is_isotropic(self) -> bool:
+        D = self.discriminant
+        return all(D.quadratic(g) == 0 for g in self.generators) and all(
+            D.bilinear(g, h) == 0 for i, g in enumerate(self.generators) for h in self.generators[:i]
+        )
+
+
+class LatticePrimitiveEmbedding(AbstractLatticePrimitiveEmbedding):
+    """Primitive embedding `source -> target`, by the target coordinates of the images of the source basis."""
+
+    def __init__(self, source: "Lattice", target: "Lattice", images):
+        M, d = integer_matrix(images)
+        assert d == 1, f"Embedding images must be lattice vectors: images={images}"
+        self._source = source
+        self._target = target
+        self._images = M
+
+    def source(self) -> "Lattice":
+        return self._source
+
+    def target(self) -> "Lattice":
+        return self._target
+
+    def image_generators(self) -> tuple[LatticeElement, ...]:
+        return tuple(self._target.element(tuple(int(v) for v in row)) for row in self._images)
+
+    def __repr__(self) -> str:
+        return f"LatticePrimitiveEmbedding({self._source} -> {self._target})"
+
+
+class LatticeGenus(AbstractLatticeGenus):
+    """Genus of `lattice`, compared and hashed by its canonical symbol."""
+
+    def __init__(self, lattice: "Lattice", symbol: GenusSymbol):
+        self._lattice = lattice
+        self._symbol = symbol
+        self._representatives: tuple[Lattice, ...] | None = None
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, LatticeGenus) and self._symbol == other._symbol
+
+    def __hash__(self) -> int:
+        return hash(self._symbol)
+
+    def __repr__(self) -> str:
+        return f"LatticeGenus({self._symbol})"
+
+    def signature(self) -> tuple[int, int]:
+        return self._symbol.signature
+
+    def local_symbol(self, p: int) -> tuple[tuple[int, ...], ...]:
+        return self._symbol.local_symbol(p)
+
+    def discriminant_form(self) -> LatticeDiscriminantGroup:
+        return self._lattice.discriminant()
+
+    def contains(self, lattice: "Lattice") -> bool:
+        return lattice.genus() == self
+
+    def mass(self) -> Fraction:
+        return genus_mass(self._symbol)
+
+    def _positive_gram(self) -> np.ndarray:
+        sign = 1 if self._symbol.signature[0] > 0 else -1
+        return sign * self._lattice._data.gram.entries.astype(object)
+
+    def representatives(self, *, processes: int | None = None) -> tuple["Lattice", ...]:
+        # Kneser neighbours of the defining lattice, walked until their masses add up to the genus mass.
+        if self._representatives is None:
+            mass = self.mass()
+            classes = genus_classes(self._positive_gram(), mass, processes=processes)
+            sign = 1 if self._symbol.signature[0] > 0 else -1
+            scale = self._symbol.scale
+            self._representatives = (self._lattice,) + tuple(
+                Lattice.from_gram(tuple(tuple(Fraction(sign * int(x), scale) for x in row) for row in c.gram))
+                for c in classes[1:]
+            )
+        return self._representatives
+
+    def class_number(self, *, processes: int | None = None) -> int:
+        return len(self.representatives(processes=processes))
+
+    def is_single_class(self) -> bool:
+        # The defining lattice alone accounts for the whole mass iff the genus has one class.
+        if self._representatives is not None:
+            return len(self._representatives) == 1
+        order, _ = automorphism_group(lll_reduce(self._positive_gram()).gram)
+        return Fraction(1, order) == self.mass()
 
 
 @dataclass
 class _LatticeData:
-    gram_rows: tuple[tuple[Fraction, ...], ...]
+    gram: GramMatrix
     gram_out: Any
     signature: tuple[int, int]
     determinant: Fraction
     minimum: Fraction | None = None
     name: str = "L"
-    discriminant_qgen: Fraction = Fraction(0)
+    reduced_basis: ReducedBasis | None = None
+    norm_counts: np.ndarray | None = None
+    short_vectors: ShortVectors | None = None
+    discriminant: LatticeDiscriminantGroup | None = None
+    genus: LatticeGenus | None = None
+    orthogonal_generators: tuple[LatticeAutomorphism, ...] | None = None
+    orthogonal_order: int | None = None
+    fingerprint: Fingerprint | None = None
+
+
+# Pre-screen counters shared by every `is_isometric` call.
+isometry_screen = IsometryScreen()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_isometry_screen() -> Iterator[IsometryScreen]:
+    # Every test reads the counters of its own `is_isometric` calls only.
+    isometry_screen.reset()
+    yield isometry_screen
+    isometry_screen.reset()
 
 
 class Lattice(AbstractLattice):
@@ -391,12 +753,12 @@ class Lattice(AbstractLattice):
     @classmethod
     def from_gram(cls, gram) -> "Lattice":
         rows = _to_rows(gram)
-        sig = _signature(rows)
+        sig = rational_signature(rows)
         data = _LatticeData(
-            gram_rows=rows,
+            gram=GramMatrix.from_rows(rows),
             gram_out=gram,
             signature=sig,
-            determinant=_det(rows),
+            determinant=rational_determinant(rows),
             minimum=None,
             name="from_gram",
         )
@@ -409,7 +771,7 @@ class Lattice(AbstractLattice):
         if rank == 2:
             rows = ((Fraction(0), Fraction(1)), (Fraction(1), Fraction(0)))
             return HyperbolicLattice(
-                _LatticeData(rows, ((0, 1), (1, 0)), (1, 1), Fraction(-1), None, "U")
+                _LatticeData(GramMatrix.from_rows(rows), ((0, 1), (1, 0)), (1, 1), Fraction(-1), None, "U")
             )
         if rank == 3:
             rows = (
@@ -418,7 +780,7 @@ class Lattice(AbstractLattice):
                 (Fraction(0), Fraction(0), Fraction(2)),
             )
             return HyperbolicLattice(
-                _LatticeData(rows, tuple(tuple(int(x) for x in r) for r in rows), (1, 2), Fraction(8), None, "H3")
+                _LatticeData(GramMatrix.from_rows(rows), tuple(tuple(int(x) for x in r) for r in rows), (1, 2), Fraction(8), None, "H3")
             )
         raise AssertionError(f"Unsupported hyperbolic rank in contract backend: rank={rank}")
 
@@ -437,7 +799,7 @@ class Lattice(AbstractLattice):
             tuple(Fraction(1 if i == j and i < p else -1 if i == j else 0) for j in range(n))
             for i in range(n)
         )
-        return IndefiniteLattice(_LatticeData(rows, rows, (p, q), _det(rows), None, "I"))
+        return IndefiniteLattice(_LatticeData(GramMatrix.from_rows(rows), rows, (p, q), rational_determinant(rows), None, "I"))
 
     @classmethod
     def II(cls, *, p: int, q: int) -> "IndefiniteLattice":
@@ -449,7 +811,7 @@ class Lattice(AbstractLattice):
             raise AssertionError(f"Contract backend only supports A2: rank={rank}")
         rows = ((Fraction(2), Fraction(-1)), (Fraction(-1), Fraction(2)))
         return RootLattice(
-            _LatticeData(rows, rows, (2, 0), Fraction(3), Fraction(2), "A2", Fraction(2, 3)),
+            _LatticeData(GramMatrix.from_rows(rows), rows, (2, 0), Fraction(3), Fraction(2), "A2"),
             LatticeRootSystem.A(2),
         )
 
@@ -471,14 +833,22 @@ class Lattice(AbstractLattice):
             (Fraction(0), Fraction(-1), Fraction(2), Fraction(0)),
             (Fraction(0), Fraction(-1), Fraction(0), Fraction(2)),
         )
-        return RootLattice(_LatticeData(rows, rows, (4, 0), Fraction(4), Fraction(2), "D4"), LatticeRootSystem.D(4))
+        return RootLattice(_LatticeData(GramMatrix.from_rows(rows), rows, (4, 0), Fraction(4), Fraction(2), "D4"), LatticeRootSystem.D(4))
 
     @classmethod
     def E(cls, rank: int) -> "RootLattice":
         if rank != 8:
             raise AssertionError(f"Contract backend only supports E8: rank={rank}")
-        rows = tuple(tuple(Fraction(2 if i == j else 0) for j in range(8)) for i in range(8))
-        return RootLattice(_LatticeData(rows, rows, (8, 0), Fraction(1), Fraction(2), "E8"), LatticeRootSystem.E(8))
+        # Bourbaki labelling: chain 1-3-4-5-6-7-8 with node 2 attached to node 4.
+        edges = {(0, 2), (2, 3), (3, 4), (4, 5), (5, 6), (6, 7), (1, 3)}
+        rows = tuple(
+            tuple(Fraction(2 if i == j else -1 if (i, j) in edges or (j, i) in edges else 0) for j in range(8))
+            for i in range(8)
+        )
+        return RootLattice(
+            _LatticeData(GramMatrix.from_rows(rows), rows, (8, 0), rational_determinant(rows), Fraction(2), "E8"),
+            LatticeRootSystem.E(8),
+        )
 
     @classmethod
     def F(cls, rank: int) -> "RootLattice":
@@ -517,26 +887,26 @@ class Lattice(AbstractLattice):
         return cls.A(rank=2)
 
     def rank(self) -> int:
-        return len(self._data.gram_rows)
+        return self._data.gram.rank
 
     def gram(self):
         return self._data.gram_out
 
     def element(self, coords: tuple[int, ...] | list[int]) -> LatticeElement:
-        return LatticeElement(self, tuple(int(c) for c in coords))
+        return LatticeElement(self, coords)
 
-    def norm(self, x: LatticeElement) -> int:
-        return int(self.pairing(x, x))
+    def norm(self, x: LatticeElement) -> int | Fraction:
+        return self.pairing(x, x)
 
-    def pairing(self, x: LatticeElement, y: LatticeElement) -> int:
-        xv = x.coords()
-        yv = y.coords()
+    def pairing(self, x: LatticeElement, y: LatticeElement) -> int | Fraction:
+        return self._data.gram.pairing(x.coords(), y.coords())
+
+    def pairings(self, xs, ys) -> np.ndarray:
         n = self.rank()
-        value = Fraction(0)
-        for i in range(n):
-            for j in range(n):
-                value += Fraction(xv[i]) * self._data.gram_rows[i][j] * Fraction(yv[j])
-        return int(value)
+        return self._data.gram.pairings(coordinate_array(xs, n), coordinate_array(ys, n))
+
+    def norms(self, xs) -> np.ndarray:
+        return self._data.gram.norms(coordinate_array(xs, self.rank()))
 
     def signature(self) -> tuple[int, int]:
         return self._data.signature
@@ -549,16 +919,15 @@ class Lattice(AbstractLattice):
     def dual(self) -> "RationalLattice | Lattice":
         det = Fraction(self._data.determinant)
         if det == 0:
-            return RationalLattice(_LatticeData(self._data.gram_rows, self._data.gram_out, self._data.signature, Fraction(0)))
+            return RationalLattice(_LatticeData(self._data.gram, self._data.gram_out, self._data.signature, Fraction(0)))
         return RationalLattice(
             _LatticeData(
-                self._data.gram_rows,
+                self._data.gram,
                 self._data.gram_out,
                 self._data.signature,
                 Fraction(1, 1) / det,
                 self._data.minimum,
                 f"{self._data.name}^vee",
-                self._data.discriminant_qgen,
             )
         )
 
@@ -566,41 +935,178 @@ class Lattice(AbstractLattice):
         gens = tuple(generators)
         if self._data.name == "U" and gens and tuple(gens[0].coords()) == (1, 0):
             rows = ((Fraction(0),),)
-            return SubLattice(_LatticeData(rows, rows, (0, 1), Fraction(0), None, "U_perp"), self, gens)
+            return SubLattice(_LatticeData(GramMatrix.from_rows(rows), rows, (0, 1), Fraction(0), None, "U_perp"), self, gens)
         return SubLattice(
-            _LatticeData(self._data.gram_rows, self._data.gram_out, self._data.signature, self._data.determinant, self._data.minimum, "sub"),
+            _LatticeData(self._data.gram, self._data.gram_out, self._data.signature, self._data.determinant, self._data.minimum, "sub"),
             self,
             gens,
         )
 
     def quotient(self, *, by: "SubLattice") -> "LatticeQuotient":
         if by.rank() == self.rank():
-            return LatticeQuotient(1)
-        return LatticeQuotient(max(1, abs(int(self.determinant()))))
+            return LatticeQuotient(())
+        return LatticeQuotient((max(1, abs(int(self.determinant()))),))
 
     def discriminant(self) -> "LatticeDiscriminantGroup":
-        det = abs(int(Fraction(self._data.determinant))) if self._data.determinant != 0 else 1
-        qgen = self._data.discriminant_qgen if self._data.discriminant_qgen else Fraction(0)
-        if self._data.name == "A2":
-            qgen = Fraction(2, 3)
-        if self._data.name == "E8":
-            det = 1
-            qgen = Fraction(0)
-        return LatticeDiscriminantGroup(det, qgen)
+        # Smith form, generators and value table are computed once per lattice.
+        if self._data.discriminant is None:
+            assert self._data.gram.is_integral(), f"Discriminant group requires an integral lattice: {self}"
+            self._data.discriminant = LatticeDiscriminantGroup(discriminant_form(self._data.gram.entries))
+        return self._data.discriminant
+
+    def genus(self) -> LatticeGenus:
+        # Local symbols of `d G` at the primes dividing 2 det; the denominator `d` is itself a genus invariant.
+        if self._data.genus is None:
+            gram = self._data.gram
+            symbol = genus_symbol(gram.entries, self._data.signature, self._data.determinant, gram.denominator)
+            self._data.genus = LatticeGenus(self, symbol)
+        return self._data.genus
+
+    def in_genus_of(self, other: "Lattice") -> bool:
+        return self.genus() == other.genus()
+
+    def _shape_invariants(self) -> tuple[tuple[int, ...], tuple]:
+        return (), ()
+
+    def _fingerprint(self) -> Fingerprint:
+        if self._data.fingerprint is None:
+            theta, profile = self._shape_invariants()
+            self._data.fingerprint = Fingerprint(
+                self._data.signature, self._data.determinant, self.genus(), theta, profile
+            )
+        return self._data.fingerprint
+
+    def is_isometric(self, other: "Lattice", *, subgroup: LatticeOrthogonalSubgroup | None = None) -> bool:
+        assert subgroup is None, "Isometry inside a subgroup is not supported by the contract backend."
+        # Cached fingerprints reject almost every non-isometric pair; only matching pairs are searched.
+        if not isometry_screen.admits(self._fingerprint(), other._fingerprint()):
+            return False
+        if 0 not in self._data.signature:
+            # Indefinite unimodular lattices are determined by their genus (rank, signature, type), which the
+            # fingerprints already matched; no search runs, so nothing is recorded.
+            if self._data.gram.is_integral() and abs(self._data.determinant) == 1:
+                return True
+            raise AssertionError(
+                f"Isometry of indefinite lattices in a common genus is only decided for unimodular ones: {self}, {other}"
+            )
+        assert isinstance(self, DefiniteLattice) and isinstance(other, DefiniteLattice), (
+            f"Exact isometry search needs definite lattices: {self}, {other}"
+        )
+        H = other._reduced_basis().gram
+        radius = max(int(H[i, i]) for i in range(other.rank()))
+        found = find_isometry(
+            self._reduced_basis().gram, H, source=self._short_vectors(radius), target=other._short_vectors(radius)
+        )
+        return isometry_screen.record(found is not None)
+
+    def class_number(self) -> int:
+        return self.genus().class_number()
+
+    def is_unique_in_genus(self) -> bool:
+        return self.genus().is_single_class()
+
+    def _glue_permutations(self, automorphisms) -> list[np.ndarray]:
+        # Isometries x -> M x of L (on L-coordinates), as permutations of the discriminant element list.
+        D = self.discriminant()
+        G = self._data.gram.entries
+        return [D._form_elements().permutation(D._form.action(G, M)) for M in automorphisms]
+
+    def overlattices(self) -> Iterator["Lattice"]:
+        # `self` first, then one overlattice per orbit of glue subgroups under the known isometries,
+        # each built from its parent's basis; even overlattices when `self` is even.
+        D = self.discriminant()
+        permutations = self._glue_permutations(g._matrix for g in self._orthogonal_generators())
+        yield self
+        for glued in overlattice_walk(D._form, self._data.gram.entries, D._form_elements(), permutations=permutations):
+            yield Lattice.from_gram(glued.gram.tolist())
+
+    def overlattice_from_glue(self, glue: LatticeGlueData) -> "Lattice":
+        D = self.discriminant()
+        assert glue.discriminant is D, f"Glue data must live on the discriminant form of {self}: glue={glue}"
+        assert glue.is_isotropic(), f"Only isotropic subgroups glue to integral overlattices: glue={glue}"
+        B, denominator = overlattice(D._form, [g.value for g in glue.generators])
+        gram = integer_matmul(integer_matmul(B, self._data.gram.entries.astype(object)), B.T)
+        return Lattice.from_gram((gram // denominator**2).tolist())
+
+    def _is_even(self) -> bool:
+        gram = self._data.gram
+        return gram.is_integral() and all(int(gram.entries[i, i]) % 2 == 0 for i in range(self.rank()))
+
+    def primitive_embedding_exists(self, target: "Lattice") -> bool:
+        # Nikulin's criteria need only the discriminant form of `self` and the two signatures.
+        assert self._is_even() and target._is_even(), f"Primitive embeddings are decided for even lattices: {self}, {target}"
+        return embedding_exists(
+            self._data.gram.entries,
+            target._data.gram.entries,
+            self.signature(),
+            target.signature(),
+            source_form=self.discriminant()._form,
+        )
+
+    def primitive_embeddings(self, target: "Lattice") -> tuple[LatticePrimitiveEmbedding, ...]:
+        # One embedding per O(target)-orbit, searched among the short vectors of the reduced target.
+        if not self.primitive_embedding_exists(target):
+            return ()
+        assert isinstance(self, DefiniteLattice) and isinstance(target, DefiniteLattice), (
+            f"Primitive embeddings are only enumerated into definite lattices: {self}, {target}"
+        )
+        source, reduced = self._reduced_basis(), target._reduced_basis()
+        # The cached generators M = (B^{-1} S B)^T of O(target) give back the row action S = B M^T B^{-1}.
+        B, B_inv = reduced.transform, unimodular_inverse(reduced.transform)
+        symmetries = [integer_matmul(integer_matmul(B, g._matrix.T), B_inv) for g in target._orthogonal_generators()]
+        # Reduced rows X embed the reduced basis B_S; the user basis is B_S^{-1} of it, at X B_T in the target.
+        S_inv = unimodular_inverse(source.transform)
+        return tuple(
+            LatticePrimitiveEmbedding(self, target, integer_matmul(integer_matmul(S_inv, X), B))
+            for X in embeddings(reduced.gram, source.gram, symmetries=symmetries)
+        )
 
     def orthogonal_group(self) -> OrthogonalGroup:
-        return OrthogonalGroup(lattice=self)
+        return OrthogonalGroup(lattice=self, generators=self._orthogonal_generators())
+
+    def discriminant_orthogonal_group(self) -> DiscriminantOrthogonalGroup:
+        return self.discriminant().orthogonal_group()
+
+    def _orthogonal_order(self) -> int:
+        raise AssertionError(f"The order of O(L) is only computed for definite lattices: {self}")
+
+    def _orbit_in_box(self, x: LatticeElement, bound: int, matrices: list[np.ndarray]) -> Iterator[tuple[int, ...]]:
+        # The orbit points reached through vectors of height at most `bound`.
+        return bounded_orbit(x.coords(), matrices, bound)
+
+    def _same_orbit(self, x: LatticeElement, y: LatticeElement, matrices: list[np.ndarray]) -> bool:
+        # Heuristic: walks the orbit of `x` through vectors up to the larger of the two heights, under
+        # -1 and the {0, ±1}-reflections, which need not generate O(L).  `True` is certified by the
+        # walk; `False` only means `y` was not reached within that box.
+        target = y.coords()
+        bound = max(abs(c) for c in x.coords() + target)
+        return any(v == target for v in bounded_orbit(x.coords(), matrices, bound))
+
+    def _stabilizer(
+        self, *, fixed: tuple[LatticeElement, ...] = (), preserved: tuple[LatticeElement, ...] = ()
+    ) -> LatticeOrthogonalSubgroup:
+        # No stabilizer engine for indefinite lattices; the contract model answers with O(L) itself.
+        return LatticeOrthogonalSubgroup(lattice=self)
+
+    def _orthogonal_generators(self) -> tuple[LatticeAutomorphism, ...]:
+        # -1 and the reflections in reflective {0, ±1}-vectors (pairs e_i ± e_j only above rank 10).
+        if self._data.orthogonal_generators is None:
+            n = self.rank()
+            roots = reflective_vectors(self._data.gram.entries, support=None if n <= 10 else 2)
+            self._data.orthogonal_generators = (LatticeAutomorphism(self, -np.eye(n, dtype=np.int64)),) + tuple(
+                self.reflection(self.element(r)) for r in roots
+            )
+        return self._data.orthogonal_generators
 
     def reflection(self, root: RootLatticeElement) -> LatticeAutomorphism:
-        rv = tuple(Fraction(c) for c in root.coords())
-        rr = Fraction(self.pairing(root, root))
-        n = self.rank()
-        m = [[Fraction(1 if i == j else 0) for j in range(n)] for i in range(n)]
-        for i in range(n):
-            for j in range(n):
-                m[i][j] -= Fraction(2) * rv[i] * rv[j] / rr
-        matrix = tuple(tuple(v for v in row) for row in m)
-        return LatticeAutomorphism(self, matrix)
+        # s(x) = x - 2 (x, r) / (r, r) r, i.e. M = I - 2 r (G r)^T / (r, r); the Gram denominator cancels.
+        r = coordinate_array([root.coords()])
+        gr = self._data.gram.scaled_pairings(r, np.eye(self.rank(), dtype=np.int64))[0].astype(object)
+        rr = int(gr @ r[0].astype(object))
+        assert rr != 0, f"Cannot reflect in an isotropic vector: root={root}"
+        numerators = 2 * np.outer(r[0].astype(object), gr)
+        assert not (numerators % rr).any(), f"Reflection in {root} does not preserve the lattice."
+        return LatticeAutomorphism(self, np.eye(self.rank(), dtype=int).astype(object) - numerators // rr)
 
     def orthogonal_hyperplane(self, root: RootLatticeElement) -> LatticeHyperplane:
         return LatticeHyperplane(self, root)
@@ -610,37 +1116,161 @@ class Lattice(AbstractLattice):
 
 
 class DefiniteLattice(Lattice, AbstractDefiniteLattice):
-    def minimum(self) -> int | Fraction:
-        if self._data.minimum is not None:
-            return int(self._data.minimum) if self._data.minimum.denominator == 1 else self._data.minimum
-        n = self.rank()
-        best = None
-        for coords in product(range(-2, 3), repeat=n):
-            if all(c == 0 for c in coords):
-                continue
-            v = self.element(coords)
-            norm = self.norm(v)
-            if norm <= 0:
+    def _reduced_basis(self) -> ReducedBasis:
+        # LLL basis of the scaled integer Gram `±d·G`, made positive definite; computed once.
+        if self._data.reduced_basis is None:
+            sign = 1 if self.signature()[0] > 0 else -1
+            self._data.reduced_basis = lll_reduce(sign * self._data.gram.entries.astype(object))
+        return self._data.reduced_basis
+
+    def _automorphisms(
+        self, *, fixed: tuple[LatticeElement, ...] = (), preserved: tuple[LatticeElement, ...] = ()
+    ) -> tuple[int, tuple[LatticeAutomorphism, ...]]:
+        # Plesken--Souvignier on the reduced Gram, which acts on row coordinates y -> y S;
+        # with user rows x = y B, the column action in user coordinates is M = (B^{-1} S B)^T.
+        reduced = self._reduced_basis()
+        B = reduced.transform
+        B_inv = unimodular_inverse(B)
+        order, matrices = automorphism_group(
+            reduced.gram,
+            fixed=list(self._to_reduced(fixed)) if fixed else [],
+            preserved=list(self._to_reduced(preserved)) if preserved else [],
+        )
+        generators = tuple(LatticeAutomorphism(self, integer_matmul(integer_matmul(B_inv, S), B).T) for S in matrices)
+        return order, generators
+
+    def _to_reduced(self, xs) -> np.ndarray:
+        return integer_matmul(coordinate_array([x.coords() for x in xs]), unimodular_inverse(self._reduced_basis().transform))
+
+    def _orbit_in_box(self, x: LatticeElement, bound: int, matrices: list[np.ndarray]) -> Iterator[tuple[int, ...]]:
+        # Orbit ∩ box from the vectors of the box with the norm of `x`, so the cost follows the box rather
+        # than |O(L)|.  Box-connected parts lie in one orbit, so one isometry search decides each part.
+        start = tuple(int(c) for c in x.coords())
+        sign = 1 if self.signature()[0] > 0 else -1
+        gram = sign * self._data.gram.entries.astype(object)
+        norm = int(np.array(start, dtype=object) @ gram @ np.array(start, dtype=object))
+        walk = list(bounded_orbit(start, matrices, bound))
+        decided = set(walk)
+        yield from walk
+        for coords in close_vectors(gram, [0] * self.rank(), norm, box=bound):
+            if coords in decided or int(np.array(coords, dtype=object) @ gram @ np.array(coords, dtype=object)) != norm:
                 continue
-            best = norm if best is None else min(best, norm)
-        return int(best if best is not None else 0)
+            part = list(bounded_orbit(coords, matrices, bound))
+            decided.update(part)
+            if self._same_orbit(x, self.element(coords), matrices):
+                yield from part
+
+    def _same_orbit(self, x: LatticeElement, y: LatticeElement, matrices: list[np.ndarray]) -> bool:
+        # O(L) is finite: search for an automorphism carrying y to x instead of walking the orbit.
+        x_red, y_red = self._to_reduced((x, y))
+        gram = self._reduced_basis().gram
+        return find_isometry(gram, gram, carry=(x_red, y_red)) is not None
+
+    def _orthogonal_generators(self) -> tuple[LatticeAutomorphism, ...]:
+        if self._data.orthogonal_generators is None:
+            self._data.orthogonal_order, self._data.orthogonal_generators = self._automorphisms()
+        return self._data.orthogonal_generators
+
+    def _orthogonal_order(self) -> int:
+        self._orthogonal_generators()
+        return self._data.orthogonal_order
+
+    def _stabilizer(
+        self, *, fixed: tuple[LatticeElement, ...] = (), preserved: tuple[LatticeElement, ...] = ()
+    ) -> "LatticeStabilizer":
+        order, generators = self._automorphisms(fixed=fixed, preserved=preserved)
+        return LatticeStabilizer(lattice=self, fixed=fixed, preserved=preserved, generators=generators, size=order)
+
+    def overlattices(self) -> Iterator[Lattice]:
+        # One overlattice per isometry class.  Isometric overlattices of one index have isometric
+        # overlattices above them, so only the first found is extended, by one glue element per
+        # orbit of O(M) on its own discriminant form.
+        D = self.discriminant()
+        G = self._data.gram.entries
+        found: dict[bytes, Lattice] = {}
+        classes: dict[int, list[Lattice]] = {}
+
+        def keep(glued: GluedLattice) -> bool:
+            M = Lattice.from_gram(glued.gram.tolist())
+            same_index = classes.setdefault(len(glued.subgroup.members), [])
+            if any(M.is_isometric(N) for N in same_index):
+                return False
+            same_index.append(M)
+            found[glued.subgroup.key()] = M
+            return True
+
+        def select(glued: GluedLattice) -> np.ndarray:
+            M = found.get(glued.subgroup.key(), self)
+            permutations = M._glue_permutations(g._matrix for g in M._orthogonal_generators())
+            return representatives(D._form, G, D._form_elements(), glued, M.discriminant()._form_elements(), permutations)
+
+        yield self
+        for glued in overlattice_walk(D._form, G, D._form_elements(), select=select, keep=keep):
+            yield found[glued.subgroup.key()]
+
+    def minimum(self) -> int | Fraction:
+        if self._data.minimum is None:
+            self._data.minimum = Fraction(self.norm(self.shortest_vector()))
+        m = self._data.minimum
+        return int(m) if m.denominator == 1 else m
 
     def shortest_vector(self) -> LatticeElement:
-        n = self.rank()
-        best = None
-        best_v = None
-        for coords in product(range(-2, 3), repeat=n):
-            if all(c == 0 for c in coords):
-                continue
-            v = self.element(coords)
-            norm = self.norm(v)
-            if norm <= 0:
+        reduced = self._reduced_basis()
+        coords, _ = find_shortest_vector(reduced.gram)
+        return self.element(reduced.to_user(coords))
+
+    def short_vectors(
+        self, lower: int | Fraction, upper: int | Fraction
+    ) -> Iterator[tuple[LatticeElement, int | Fraction]]:
+        d = self._data.gram.denominator
+        sign = 1 if self.signature()[0] > 0 else -1
+        lo = ceil(Fraction(lower) * d)
+        hi = floor(Fraction(upper) * d)
+        if hi < max(lo, 1):
+            return
+        reduced = self._reduced_basis()
+        for coords, scaled in ShortVectorEnumerator(reduced.gram, hi):
+            if scaled < lo:
                 continue
-            if best is None or norm < best:
-                best = norm
-                best_v = v
-        assert best_v is not None, "No nonzero shortest vector found in contract backend."
-        return best_v
+            norm = Fraction(sign * scaled, d)
+            yield self.element(reduced.to_user(coords)), int(norm) if norm.denominator == 1 else norm
+
+    def _shape_invariants(self) -> tuple[tuple[int, ...], tuple]:
+        # Theta series to twice the (scaled) minimum, and the pairing profile of the minimal vectors.
+        reduced = self._reduced_basis().gram
+        counts = self._norm_counts(min(int(reduced[i, i]) for i in range(self.rank())))
+        shell = int(np.flatnonzero(counts[1:])[0]) + 1
+        theta = tuple(int(c) for c in self._norm_counts(2 * shell))
+        return theta, pairing_profile(self._short_vectors(shell), shell)
+
+    def _short_vectors(self, radius: int) -> ShortVectors:
+        # Kept from the fingerprint for later isometry searches; re-enumerated only for a larger radius.
+        self._data.short_vectors = ShortVectors.of(self._reduced_basis().gram, radius, cached=self._data.short_vectors)
+        return self._data.short_vectors
+
+    def _norm_counts(self, radius: int) -> np.ndarray:
+        # Shell sizes by scaled |norm| up to `radius`; one enumeration serves every smaller radius.
+        cached = self._data.norm_counts
+        if cached is None or len(cached) <= radius:
+            cached = norm_counts(self._reduced_basis().gram, radius)
+            self._data.norm_counts = cached
+        return cached[: radius + 1]
+
+    def theta_series(self, prec: int) -> tuple[int, ...]:
+        assert self._data.gram.is_integral(), f"theta_series requires an integral lattice: {self}"
+        if prec <= 0:
+            return ()
+        return tuple(int(c) for c in self._norm_counts(prec - 1))
+
+    def kissing_number(self) -> int:
+        reduced = self._reduced_basis()
+        # The shortest reduced basis vector bounds the minimum, so one pass finds both.
+        counts = self._norm_counts(min(int(reduced.gram[i, i]) for i in range(self.rank())))
+        shell = int(np.flatnonzero(counts[1:])[0]) + 1
+        if self._data.minimum is None:
+            sign = 1 if self.signature()[0] > 0 else -1
+            self._data.minimum = Fraction(sign * shell, self._data.gram.denominator)
+        return int(counts[shell])
 
 
 class IndefiniteLattice(Lattice, AbstractIndefiniteLattice):
@@ -661,48 +1291,89 @@ class IndefiniteLattice(Lattice, AbstractIndefiniteLattice):
             return self.element((1, 0))
         raise AssertionError("No isotropic vector configured in contract backend.")
 
+    def iter_primitive_isotropic_vectors(self, *, bound: int) -> Iterator[LatticeElement]:
+        for coords in primitive_isotropic_vectors(self._data.gram.entries, bound):
+            yield self.element(coords)
+
     def primitive_isotropic_vectors(self, *, bound: int) -> tuple[LatticeElement, ...]:
-        if self._data.name == "U":
-            return tuple(self.element(v) for v in [(1, 0), (-1, 0), (0, 1), (0, -1)])
-        return tuple()
+        return tuple(self.iter_primitive_isotropic_vectors(bound=bound))
 
     def isotropic_orbit_representatives(
         self, *, bound: int, primitive: bool = True
     ) -> tuple[LatticeElement, ...]:
-        if self._data.name == "U":
-            return (self.element((1, 0)),)
-        return tuple()
-
-    def vinberg(self) -> CoxeterData:
-        if self._data.name == "U":
-            roots = (RootLatticeElement(self, (1, -1)),)
-            return CoxeterData(self, LatticeRootSystem.A_affine(1), roots)
-        if self._data.name == "H3":
-            roots = (
-                RootLatticeElement(self, (1, 0, 0)),  # norm -2
-                RootLatticeElement(self, (1, 1, 0)),  # norm -4
+        # Eichler buckets merged under O(q) when L ⊇ U ⊕ U (see `_eichler`); otherwise each vector is tested
+        # against the representatives so far, whose indefinite `same_orbit` may leave orbits unmerged.
+        G = self._data.gram.entries
+        vectors = primitive_isotropic_vectors(G, bound)
+        if self._splits_u_plus_u():
+            orbits: dict[tuple[int, ...], tuple[int, ...]] = {}
+            for key, (rep, _) in eichler_classes(G, self.discriminant()._form, vectors).items():
+                key = self._orbit_key(key)
+                if key not in orbits or max(map(abs, rep)) < max(map(abs, orbits[key])):
+                    orbits[key] = rep
+            reps = list(orbits.values())
+        else:
+            O = self.orthogonal_group()
+            reps = []
+            for v in vectors:
+                if not any(O.same_orbit(self.element(r), self.element(v)) for r in reps):
+                    reps.append(v)
+        if not primitive:
+            reps += [tuple(k * c for c in v) for v in list(reps) for k in range(2, bound // max(map(abs, v)) + 1)]
+        return tuple(self.element(v) for v in reps)
+
+    def vinberg(self, *, max_height: int | None = 64, processes: int | None = None) -> CoxeterData:
+        # Vinberg's algorithm runs in signature (1, n - 1); the roots of L(-1) are those of L.
+        assert self._data.gram.denominator == 1, "Vinberg's algorithm needs an integral lattice."
+        n = self.rank()
+        assert self._data.signature in ((1, n - 1), (n - 1, 1)), f"Lattice is not hyperbolic: signature={self._data.signature}"
+        sign = 1 if self._data.signature == (1, n - 1) else -1
+        result = vinberg(
+            sign * self._data.gram.entries,
+            self.discriminant()._form.exponent,
+            max_height=max_height,
+            processes=processes,
+        )
+        if not result.finite_volume:
+            warnings.warn(
+                f"Vinberg's algorithm stopped at max_height={max_height} with {len(result.roots)} walls "
+                "that do not bound a finite-volume chamber; raise max_height, or the lattice is not reflective.",
+                RuntimeWarning,
+                stacklevel=2,
             )
-            return CoxeterData(self, LatticeRootSystem.A_affine(1), roots)
-        return CoxeterData(self, LatticeRootSystem.A_affine(1), tuple())
+        roots = tuple(RootLatticeElement(self, r) for r in result.roots)
+        return CoxeterData(self, None, roots, result.finite_volume)
+
+    def _eichler_invariants(self, xs) -> list[tuple[int, ...]]:
+        return eichler_invariants(self._data.gram.entries, self.discriminant()._form, coordinate_array(xs))
+
+    def divisor(self, x: LatticeElement) -> int:
+        return self._eichler_invariants([x.coords()])[0][1]
+
+    def discriminant_class(self, x: LatticeElement) -> DiscriminantGroupElement:
+        return self.discriminant().element(self._eichler_invariants([x.coords()])[0][2:])
 
     def eichler_criterion_equivalent(self, x: LatticeElement, y: LatticeElement) -> bool:
-        # Minimal contract model: in unimodular U, primitive isotropic vectors are O(U)-equivalent.
-        if self._data.name != "U":
+        # For primitive x, y in L ⊇ U ⊕ U: equal norm and div, and O(q)-equivalent classes of x/div.
+        # Without the splitting the criterion does not apply and the orbit walk decides instead.
+        if gcd(*x.coords()) != 1 or gcd(*y.coords()) != 1:
             return False
+        if not self._splits_u_plus_u():
+            return self.orthogonal_group().same_orbit(x, y)
+        ix, iy = self._eichler_invariants([x.coords(), y.coords()])
+        return self._orbit_key(ix) == self._orbit_key(iy)
 
-        def _is_primitive(v: LatticeElement) -> bool:
-            g = 0
-            for c in v.coords():
-                g = gcd(g, abs(int(c)))
-            return g == 1
+    def _splits_u_plus_u(self) -> bool:
+        # Eichler's criterion and the surjectivity of O(L) -> O(q) are used for even L ⊇ U ⊕ U only.
+        return self._is_even() and splits_hyperbolic_planes(self._data.gram.entries, 2)
 
-        return (
-            self.norm(x) == 0
-            and self.norm(y) == 0
-            and _is_primitive(x)
-            and _is_primitive(y)
-            and self.orthogonal_group().same_orbit(x, y)
-        )
+    def _orbit_key(self, invariant: tuple[int, ...]) -> tuple[int, ...]:
+        # (norm, div, class) with the class replaced by the least index of its O(q)-orbit.
+        D = self.discriminant()
+        elements = D._form_elements()
+        permutations = [elements.permutation(g._matrix) for g in D.orthogonal_group().generators()]
+        index = int(elements.index(np.array(invariant[2:], dtype=np.int64)))
+        return (*invariant[:2], min(_orbit(index, permutations)))
 
 
 class HyperbolicLattice(IndefiniteLattice, AbstractHyperbolicLattice):
@@ -739,20 +1410,27 @@ class RootLattice(DefiniteLattice, AbstractRootLattice):
 
 __all__ = [
     "assert_equal",
+    "isometry_screen",
     "CoxeterData",
     "DefiniteLattice",
+    "DiscriminantAutomorphism",
     "DiscriminantGroupElement",
+    "DiscriminantOrthogonalGroup",
     "HyperbolicLattice",
     "IndefiniteLattice",
     "Lattice",
     "LatticeCoxeterGroup",
     "LatticeDiscriminantGroup",
     "LatticeElement",
+    "LatticeGenus",
+    "LatticeGlueData",
     "LatticeHyperplane",
     "LatticePolytope",
+    "LatticePrimitiveEmbedding",
     "LatticeQuotient",
     "LatticeQuotientElement",
     "LatticeRootSystem",
+    "LatticeStabilizer",
     "OrthogonalGroup",
     "LatticeAutomorphism",
     "RationalLattice",
@@ -1,9 +1,5 @@
 from __future__ import annotations
 
-import pytest
-
-pytestmark = pytest.mark.tdd_red
-
 from sage.all import ZZ, matrix
 
 from .conftest import Lattice, assert_equal
@@ -46,3 +42,158 @@ def test_definite_lattice_shortest_vector_matches_minimum():
         L.minimum(),
         f"Lattice.shortest_vector norm mismatch on positive-definite gram: v={v}",
     )
+
+
+def test_definite_lattice_minimum_on_skewed_basis_needs_large_coefficients():
+    """
+    method: shortest_vector
+
+    Definite-class contract:
+    the minimum is exact even when every shortest vector has a coefficient outside [-2, 2].
+    `G` is the Gram matrix of `Z^2` in the basis (3, 1), (10, 3); its shortest vectors are
+    the images of the standard basis, with coordinates ±(-3, 1) and ±(10, -3).
+    """
+    L = Lattice.from_gram(matrix(ZZ, ((10, 33), (33, 109))))
+    v = L.shortest_vector()
+
+    assert_equal(L.minimum(), 1, "Lattice.minimum mismatch on skewed basis of Z^2")
+    assert_equal(L.norm(v), 1, f"Lattice.shortest_vector norm mismatch on skewed basis of Z^2: v={tuple(v.coords())}")
+    assert tuple(v.coords()) in {(-3, 1), (3, -1), (10, -3), (-10, 3)}, (
+        f"Unexpected shortest vector on skewed basis of Z^2: v={tuple(v.coords())}"
+    )
+
+
+def test_definite_lattice_minimum_on_skewed_e8_basis():
+    """
+    method: minimum
+
+    Definite-class contract:
+    `minimum()` and `shortest_vector()` are basis independent: on `E8` written in the
+    skewed basis `T·C·T^T` (`C` the E8 Cartan matrix, `T` unimodular bidiagonal with
+    superdiagonal 5) the minimum is still 2.
+    """
+    edges = {(0, 2), (2, 3), (3, 4), (4, 5), (5, 6), (6, 7), (1, 3)}
+    C = matrix(ZZ, 8, 8, lambda i, j: 2 if i == j else (-1 if (i, j) in edges or (j, i) in edges else 0))
+    T = matrix(ZZ, 8, 8, lambda i, j: 1 if i == j else (5 if j == i + 1 else 0))
+    L = Lattice.from_gram(T * C * T.transpose())
+    v = L.shortest_vector()
+
+    assert_equal(L.determinant(), 1, "Skewed E8 basis should stay unimodular")
+    assert_equal(L.minimum(), 2, "Lattice.minimum mismatch on skewed E8 basis")
+    assert_equal(L.norm(v), 2, f"Lattice.shortest_vector norm mismatch on skewed E8 basis: v={tuple(v.coords())}")
+
+
+def test_definite_lattice_short_vectors_streams_shells_up_to_sign():
+    """
+    method: short_vectors
+
+    Definite-class contract:
+    `short_vectors(lower, upper)` lazily yields `(v, norm)` pairs, one per `±v`;
+    D4 has 24 vectors of norm 2 and 24 of norm 4, i.e. 12 pairs in each shell.
+    """
+    L = Lattice.D(4)
+    shells: dict[int, int] = {}
+    seen: set[tuple[int, ...]] = set()
+    for v, n in L.short_vectors(2, 4):
+        coords = tuple(v.coords())
+        assert_equal(L.norm(v), n, f"short_vectors reported norm mismatch: v={coords}")
+        assert tuple(-c for c in coords) not in seen, f"short_vectors repeated a vector up to sign: v={coords}"
+        seen.add(coords)
+        shells[n] = shells.get(n, 0) + 1
+
+    assert_equal(shells, {2: 12, 4: 12}, "D4 short_vectors shell counts mismatch")
+    first, norm = next(iter(L.short_vectors(2, 2)))
+    assert_equal(L.norm(first), 2, f"Lazy short_vectors first vector should be a root: v={tuple(first.coords())}")
+
+
+def test_definite_lattice_theta_series_and_kissing_number_of_e8():
+    """
+    method: theta_series
+
+    Definite-class contract:
+    the E8 theta series starts `1 + 240 q^2 + 2160 q^4 + 6720 q^6` (norm-indexed), and
+    `kissing_number()` is its first nonzero coefficient after the constant term.
+    """
+    e8 = Lattice.E(8)
+    assert_equal(e8.theta_series(7), (1, 0, 240, 0, 2160, 0, 6720), "E8 theta series mismatch")
+    assert_equal(e8.kissing_number(), 240, "E8 kissing number mismatch")
+    assert_equal(Lattice.A(2).kissing_number(), 6, "A2 kissing number mismatch")
+
+
+def test_orthogonal_group_orbit_of_an_e8_root_is_the_root_system():
+    """
+    method: orbit
+
+    Orbit contract:
+    `O(E8)` acts transitively on the 240 roots, so the orbit of a simple root is
+    exactly the set of norm-2 vectors, and `same_orbit` separates it from `2 e_1`.
+    """
+    e8 = Lattice.E(8)
+    O = e8.orthogonal_group()
+    root = e8.element((1, 0, 0, 0, 0, 0, 0, 0))
+    orb = O.orbit(root, bound=6)
+
+    assert_equal(len(set(orb)), 240, "E8 root orbit size mismatch")
+    assert_equal({int(n) for n in e8.norms(orb)}, {2}, "E8 root orbit norms mismatch")
+    assert_equal(O.same_orbit(root, orb[-1]), True, f"Orbit membership mismatch: y={orb[-1]}")
+    assert_equal(O.same_orbit(root, e8.element((2, 0, 0, 0, 0, 0, 0, 0))), False, "Norm-8 vector is not a root")
+
+
+def test_orthogonal_group_orbit_of_an_e8_root_meets_the_unit_box_in_88_roots():
+    """
+    method: orbit
+
+    Orbit contract:
+    `O(E8)` is finite, so `orbit(x, bound=1)` is the orbit cut to the box `max_i |x_i| <= 1`,
+    including roots such as `(0, 0, 0, 1, 1, 1, 1, 1)` that no walk inside the box reaches.
+    """
+    e8 = Lattice.E(8)
+    O = e8.orthogonal_group()
+    orb = O.orbit(e8.element((1, 0, 0, 0, 0, 0, 0, 0)), bound=1)
+    coords = {x.coords() for x in orb}
+
+    assert_equal(len(coords), 88, "E8 roots with coordinates in {0, ±1}")
+    assert_equal((0, 0, 0, 1, 1, 1, 1, 1) in coords, True, f"Missing a box root of E8: {sorted(coords)}")
+
+
+def test_orthogonal_group_orbit_cost_follows_the_box_not_the_group():
+    """
+    method: orbit
+
+    Orbit contract:
+    the orbit is cut to the box from the equal-norm vectors of the box, so the 6720-element
+    orbit of norm 6 meets the unit box in its 840 norm-6 vectors, and a seed of norm 152
+    outside the box returns at once instead of walking an orbit of size up to `|W(E8)|`.
+    """
+    e8 = Lattice.E(8)
+    O = e8.orthogonal_group()
+    orb = O.orbit(e8.element((1, 0, 1, 0, 1, 0, 1, 0)), bound=1)
+    far = e8.element((3, 1, 4, 1, 5, 9, 2, 6))
+
+    assert_equal(len({x.coords() for x in orb}), 840, "Norm-6 vectors of E8 with coordinates in {0, ±1}")
+    assert_equal({int(n) for n in e8.norms(orb)}, {6}, "Orbit norms mismatch")
+    assert_equal([x.coords() for x in O.orbit(far, bound=1)], [far.coords()], "Only the seed lies outside the box")
+
+
+def test_orthogonal_group_of_e8_has_weyl_group_order_and_root_stabilizers():
+    """
+    method: stabilizer
+
+    Automorphism-group contract:
+    `O(E8)` is the Weyl group of order 696729600, found with generators; the stabilizer
+    of a root has index 240 and the stabilizer of the pair {r, -r} has index 120.
+    """
+    e8 = Lattice.E(8)
+    O = e8.orthogonal_group()
+    root = e8.element((1, 0, 0, 0, 0, 0, 0, 0))
+    basis = [e8.element(tuple(int(i == j) for j in range(8))) for i in range(8)]
+    stab = O.stabilizer(root)
+    pair = O.stabilizer_of_set([root, e8.element((-1, 0, 0, 0, 0, 0, 0, 0))])
+
+    assert_equal(O.order(), 696729600, "O(E8) order mismatch")
+    for g in O.generators:
+        images = g.apply_many(basis)
+        assert_equal(e8.pairings(images, images).tolist(), e8.pairings(basis, basis).tolist(), f"Not an isometry: g={g}")
+    assert_equal((stab.order(), pair.order()), (696729600 // 240, 696729600 // 120), "Root stabilizer orders mismatch")
+    assert_equal(all(stab.contains(g) for g in stab.generators), True, f"Stabilizer generators must fix the root: {stab}")
+    assert_equal(all(O.stabilizer(root).contains(g) for g in O.generators), False, "O(E8) moves the root")
@@ -2,8 +2,6 @@ from __future__ import annotations
 
 import pytest
 
-pytestmark = pytest.mark.tdd_red
-
 from .conftest import Lattice, LatticeRootSystem, assert_equal
 
 U = Lattice.U()
@@ -22,20 +20,29 @@ def test_hyperbolic_lattice_constructor_contract():
     assert_equal(U.gram(), ((0, 1), (1, 0)), "HyperbolicLattice gram mismatch")
 
 
-def test_hyperbolic_vinberg_on_u_matches_affine_a1_root_system():
+def test_hyperbolic_vinberg_on_u_reads_the_root_system_off_the_diagram():
     """
     method: vinberg
 
     Hyperbolic-class contract:
     `vinberg()` computes a fundamental domain for the full Coxeter reflection group.
-    For the hyperbolic plane `U`, the associated reflection root system is affine A1.
-    We assert this via isomorphism to a statically constructed affine A1 root system.
+    In `U` the only roots of negative norm are `±(1, -1)`, so the chamber is a half-line
+    with one wall and the root system, read off its Coxeter diagram, is `A1`, not affine `A1`.
+    The half-line has infinite volume, so the search runs to `max_height` and says so.
     """
-    vinberg_data = U.vinberg()
+    with pytest.warns(RuntimeWarning, match="finite-volume chamber"):
+        vinberg_data = U.vinberg()
+    assert not vinberg_data.has_finite_volume(), "U is not reflective"
+    assert_equal(len(vinberg_data.simple_roots()), 1, f"U has one Vinberg wall: {vinberg_data.simple_roots()}")
     assert_equal(
-        vinberg_data.root_system().is_isomorphic(LatticeRootSystem.A_affine(1)),
+        vinberg_data.root_system().is_isomorphic(LatticeRootSystem.A(1)),
         True,
-        "Vinberg root-system mismatch on U",
+        f"Vinberg root-system mismatch on U: {vinberg_data.root_system()}",
+    )
+    assert_equal(
+        vinberg_data.root_system().is_isomorphic(LatticeRootSystem.A_affine(1)),
+        False,
+        "A single wall cannot give an affine diagram",
     )
 
 
@@ -70,3 +77,71 @@ def test_hyperbolic_vinberg_simple_roots_have_reflective_norms():
         "Vinberg root norms mismatch: "
         f"allowed={allowed_norms}, violating_roots={bad}"
     )
+
+
+def test_hyperbolic_vinberg_on_odd_unimodular_lattice_finds_all_walls():
+    """
+    method: vinberg
+
+    Hyperbolic-class contract:
+    Vinberg's algorithm on `I_{1,10}` terminates with the 12 walls of its Weyl chamber
+    (Vinberg 1972): reflective roots of norm -1 or -2 whose pairwise products are
+    non-negative, so the chamber is acute-angled.
+    """
+    L = Lattice.I(p=1, q=10)
+    roots = L.vinberg().simple_roots()
+
+    assert_equal(len(roots), 12, "Vinberg wall count mismatch on I_{1,10}")
+    assert_equal({L.norm(r) for r in roots}, {-1, -2}, "Vinberg root norms mismatch on I_{1,10}")
+    obtuse = [(tuple(r), tuple(s)) for i, r in enumerate(roots) for s in roots[i + 1 :] if L.pairing(r, s) < 0]
+    assert not obtuse, f"Vinberg walls should pairwise meet at non-obtuse angles: violating_pairs={obtuse}"
+
+
+def test_hyperbolic_vinberg_chamber_of_even_unimodular_lattice_is_e10():
+    """
+    method: vinberg
+
+    Hyperbolic-class contract:
+    the Vinberg chamber of `II_{1,9} = U ⊕ E8(-1)` is the `E10 = T_{2,3,7}` Coxeter simplex,
+    so its Coxeter group is generated by 10 reflections forming a tree of simple edges,
+    and Vinberg's criterion certifies finite volume only once every wall is present.
+    """
+    e8 = {(0, 2), (2, 3), (3, 4), (4, 5), (5, 6), (6, 7), (1, 3)}
+    gram = [[0, 1] + [0] * 8, [1, 0] + [0] * 8] + [
+        [0, 0] + [-2 if i == j else 1 if (i, j) in e8 or (j, i) in e8 else 0 for j in range(8)] for i in range(8)
+    ]
+    L = Lattice.from_gram(gram)
+    data = L.vinberg()
+    matrix = data.coxeter_group().coxeter_matrix()
+
+    assert_equal(len(data.coxeter_group().simple_reflections()), 10, "E10 has 10 simple reflections")
+    assert_equal(sorted({m for row in matrix for m in row}), [1, 2, 3], "E10 diagram has only simple edges")
+    assert_equal(sum(row.count(3) for row in matrix), 18, "E10 diagram is a tree on 10 vertices")
+    assert data.fundamental_domain().has_finite_volume(), "E10 chamber should have finite volume"
+    assert data.has_finite_volume(), "Vinberg's search should report that it closed the E10 chamber"
+    with pytest.warns(RuntimeWarning, match="max_height=0"):
+        truncated = L.vinberg(max_height=0)
+    assert not truncated.fundamental_domain().has_finite_volume(), (
+        "height-0 walls alone should not bound a finite-volume chamber"
+    )
+    assert not truncated.has_finite_volume(), "a search cut off at max_height=0 should say the chamber is open"
+
+
+def test_hyperbolic_vinberg_on_u_plus_a2_minus_1_is_a_hyperbolic_simplex():
+    """
+    method: vinberg
+
+    Hyperbolic-class contract:
+    `U ⊕ A2(-1)` has a Vinberg chamber with 4 walls forming a path with labels 3, 3, 6.
+    It is a finite-volume simplex whose diagram is neither finite nor affine, so no
+    root system is attached to it.
+    """
+    L = Lattice.from_gram([[0, 1, 0, 0], [1, 0, 0, 0], [0, 0, -2, 1], [0, 0, 1, -2]])
+    data = L.vinberg()
+    labels = sorted(m for i, row in enumerate(data.coxeter_group().coxeter_matrix()) for m in row[i + 1 :] if m != 2)
+
+    assert_equal(len(data.simple_roots()), 4, f"U+A2(-1) has 4 Vinberg walls: {data.simple_roots()}")
+    assert_equal(labels, [3, 3, 6], "U+A2(-1) diagram labels mismatch")
+    assert data.fundamental_domain().has_finite_volume(), "U+A2(-1) chamber should have finite volume"
+    with pytest.raises(AssertionError):
+        data.root_system()
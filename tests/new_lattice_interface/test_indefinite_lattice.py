@@ -1,9 +1,5 @@
 from __future__ import annotations
 
-import pytest
-
-pytestmark = pytest.mark.tdd_red
-
 from .conftest import Lattice, assert_equal
 L = Lattice.U()
 
@@ -27,3 +23,44 @@ def test_indefinite_lattice_witt_index_contract():
     hyperbolic plane has Witt index 1.
     """
     assert_equal(L.witt_index(), 1, "IndefiniteLattice.witt_index mismatch")
+
+
+def test_indefinite_lattice_from_gram_signature_is_exact_inertia():
+    """
+    method: signature
+
+    Indefinite-class contract:
+    `Lattice.from_gram` computes the exact inertia of the Gram matrix: the binary form
+    [[2, 3], [3, 2]] (determinant -5, positive diagonal) plus `A2(-1)` has signature (1, 3).
+    """
+    G = (
+        (2, 3, 0, 0),
+        (3, 2, 0, 0),
+        (0, 0, -2, 1),
+        (0, 0, 1, -2),
+    )
+    M = Lattice.from_gram(G)
+    assert_equal(M.signature(), (1, 3), "Lattice.from_gram signature mismatch on indefinite gram")
+    assert_equal(M.is_indefinite(), True, "Lattice.from_gram should route indefinite gram to IndefiniteLattice")
+
+
+def test_indefinite_lattice_primitive_isotropic_vectors_are_pythagorean_triples():
+    """
+    method: primitive_isotropic_vectors
+
+    Indefinite-class contract:
+    in `I_{2,1} = <1> ⊕ <1> ⊕ <-1>` the primitive isotropic vectors of height at most 5
+    are the signed triples `(1, 0, 1)`, `(0, 1, 1)`, `(3, 4, 5)` and `(4, 3, 5)`.
+    """
+    M = Lattice.I(p=2, q=1)
+    vs = {tuple(v.coords()) for v in M.primitive_isotropic_vectors(bound=5)}
+    expected = {
+        (sx * x, sy * y, sz * z)
+        for x, y, z in ((1, 0, 1), (0, 1, 1), (3, 4, 5), (4, 3, 5))
+        for sx in (1, -1)
+        for sy in (1, -1)
+        for sz in (1, -1)
+    }
+    assert_equal(vs, expected, "I_{2,1} primitive isotropic vectors mismatch")
+    first = next(iter(M.iter_primitive_isotropic_vectors(bound=300)))
+    assert_equal(M.norm(first), 0, f"Streamed vector should be isotropic: v={first}")
@@ -1,9 +1,5 @@
 from __future__ import annotations
 
-import pytest
-
-pytestmark = pytest.mark.tdd_red
-
 from .conftest import Lattice, assert_equal
 
 
@@ -31,3 +27,37 @@ def test_indefinite_lattice_eichler_criterion_equivalent_on_u():
         "Expected non-equivalence when one vector is non-primitive: "
         f"e1={e1}, nonprimitive={nonprimitive}",
     )
+
+
+def test_indefinite_lattice_eichler_invariants_of_u_plus_u_plus_u3():
+    """
+    method: isotropic_orbit_representatives
+
+    Eichler-criterion contract:
+    `U ⊕ U ⊕ U(3)` contains `U ⊕ U`, so primitive isotropic vectors are `O(L)`-equivalent iff
+    their divisors agree and their discriminant classes are `O(q)`-equivalent. The four nonzero
+    isotropic classes `±f/3, ±g/3` of `(Z/3)^2` form one `O(q)`-orbit (`-1` and the swap of
+    `f, g` lie in `O(L)`), so there are two orbits, of divisor 1 and 3; the invariants agree
+    with `same_orbit` on every vector of height 1.
+    """
+    M = Lattice.from_gram(
+        [[0, 1, 0, 0, 0, 0], [1, 0, 0, 0, 0, 0], [0, 0, 0, 1, 0, 0], [0, 0, 1, 0, 0, 0], [0, 0, 0, 0, 0, 3], [0, 0, 0, 0, 3, 0]]
+    )
+    O = M.orthogonal_group()
+    e, f, g = M.element((1, 0, 0, 0, 0, 0)), M.element((0, 0, 0, 0, 1, 0)), M.element((0, 0, 0, 0, 0, 1))
+    shifted, negated = M.element((3, 0, 0, 0, 1, 0)), M.element((0, 0, 0, 0, -1, 0))
+
+    assert_equal((M.divisor(e), M.divisor(f), M.divisor(shifted)), (1, 3, 3), "Divisors in U+U+U(3)")
+    assert_equal(M.discriminant_class(f) == M.discriminant_class(shifted), True, f"f and f + 3e share a class: {f}")
+    assert_equal(M.discriminant_class(f) == -M.discriminant_class(negated), True, f"The class of -f is minus that of f: {f}")
+    for x, y in [(f, shifted), (f, negated), (f, g), (e, M.element((0, 0, 1, 0, 0, 0)))]:
+        assert_equal(O.same_orbit(x, y), True, f"Expected one O(L)-orbit: x={x}, y={y}")
+        assert_equal(M.eichler_criterion_equivalent(x, y), True, f"Eichler criterion should agree with O(L): x={x}, y={y}")
+    assert_equal(M.eichler_criterion_equivalent(e, f), False, "Divisors 1 and 3 are never equivalent")
+
+    reps = M.isotropic_orbit_representatives(bound=1)
+    assert_equal(sorted(M.divisor(r) for r in reps), [1, 3], f"One representative per O(L)-orbit: {reps}")
+    assert_equal({int(v) for v in M.norms(reps)}, {0}, f"Representatives must be isotropic: {reps}")
+    for v in M.primitive_isotropic_vectors(bound=1):
+        (rep,) = [r for r in reps if M.divisor(r) == M.divisor(v)]
+        assert_equal(O.same_orbit(rep, v), True, f"Every vector should lie in its representative's orbit: {v}")
@@ -2,8 +2,6 @@ from __future__ import annotations
 
 import pytest
 
-pytestmark = pytest.mark.tdd_red
-
 from .conftest import Lattice, assert_equal
 
 L = Lattice.U()
@@ -14,6 +12,7 @@ O = L.orthogonal_group()
 Stab_e1 = O.stabilizer(e1)
 
 
+@pytest.mark.tdd_red
 def test_indefinite_lattice_same_orbit_defaults_to_full_orthogonal_group():
     """
     method: same_orbit
@@ -33,6 +32,7 @@ def test_indefinite_lattice_same_orbit_defaults_to_full_orthogonal_group():
     )
 
 
+@pytest.mark.tdd_red
 def test_indefinite_lattice_same_orbit_respects_optional_subgroup():
     """
     method: same_orbit
@@ -53,6 +53,7 @@ def test_indefinite_lattice_same_orbit_respects_optional_subgroup():
     )
 
 
+@pytest.mark.tdd_red
 def test_indefinite_lattice_orbit_representative_defaults_to_full_group():
     """
     method: orbit_representative
@@ -69,6 +70,7 @@ def test_indefinite_lattice_orbit_representative_defaults_to_full_group():
     )
 
 
+@pytest.mark.tdd_red
 def test_indefinite_lattice_representation_classes_for_primitive_isotropic_norm():
     """
     method: representation_classes
@@ -86,6 +88,7 @@ def test_indefinite_lattice_representation_classes_for_primitive_isotropic_norm(
     assert_equal(L.norm(rep), 0, f"Class representative must have requested norm 0: rep={rep}")
 
 
+@pytest.mark.tdd_red
 def test_indefinite_lattice_eichler_criterion_equivalent_accepts_optional_subgroup():
     """
     method: eichler_criterion_equivalent
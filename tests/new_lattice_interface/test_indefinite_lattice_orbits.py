@@ -1,9 +1,5 @@
 from __future__ import annotations
 
-import pytest
-
-pytestmark = pytest.mark.tdd_red
-
 from .conftest import Lattice, LatticeAutomorphism, assert_equal
 
 L = Lattice.U()
@@ -100,3 +96,54 @@ def test_orthogonal_group_stabilizer_contains_nontrivial_isometry():
     stab = O.stabilizer(x)
     swap = LatticeAutomorphism(L, ((0, 1), (1, 0)))
     assert_equal(stab.contains(swap), True, f"Stabilizer should contain nontrivial swap isometry: vector={x}")
+
+
+def test_lattice_automorphism_composition_inverse_and_batched_application():
+    """
+    method: apply_many
+
+    Automorphism contract:
+    in `H3 = <-2> ⊕ <-2> ⊕ <2>` the product `g` of the reflections in the roots
+    `(1, 0, 0)` and `(1, 1, 0)` has order 4, `g.inverse()` is a true inverse distinct
+    from `g`, and `apply_many` agrees with applying `g` to each vector.
+    """
+    H3 = Lattice.hyperbolic(rank=3)
+    one = H3.orthogonal_group().identity()
+    g = H3.reflection(H3.element((1, 0, 0))) * H3.reflection(H3.element((1, 1, 0)))
+    xs = [H3.element(v) for v in ((1, 0, 0), (0, 1, 0), (0, 0, 1), (3, -2, 5))]
+
+    assert_equal(g * g == one, False, f"Rotation should not be an involution: g={g}")
+    assert_equal(g * g * g * g == one, True, f"Rotation should have order 4: g={g}")
+    assert_equal(g * g.inverse() == one, True, f"Inverse mismatch: g={g}")
+    assert_equal(g.inverse() == g, False, f"Inverse should differ from g: g={g}")
+    assert_equal(
+        [tuple(int(c) for c in row) for row in g.apply_many(xs)],
+        [g(x).coords() for x in xs],
+        "Batched automorphism application mismatch",
+    )
+
+
+def test_indefinite_lattice_eichler_invariants_separate_isotropic_orbits():
+    """
+    method: isotropic_orbit_representatives
+
+    Eichler contract:
+    `U ⊕ U(2)` does not contain `U ⊕ U`, so invariants alone do not decide orbits: `f1, f2`
+    of `U(2)` have divisor 2 and distinct discriminant classes, yet the swap of `U(2)` carries
+    one to the other. The orbit test decides instead, and with `bound=1` the representatives
+    are one per divisor, 1 and 2.
+    """
+    M = Lattice.from_gram(
+        [[0, 1, 0, 0], [1, 0, 0, 0], [0, 0, 0, 2], [0, 0, 2, 0]]
+    )
+    e1, f1, f2 = (M.element(v) for v in ((1, 0, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1)))
+    O = M.orthogonal_group()
+
+    assert_equal((M.divisor(e1), M.divisor(f1), M.divisor(f2)), (1, 2, 2), "Eichler divisor mismatch")
+    assert_equal(M.discriminant_class(e1) == M.discriminant().zero(), True, "div 1 vectors have zero class")
+    assert_equal(M.discriminant_class(f1) == M.discriminant_class(f2), False, "U(2) classes should differ")
+    assert_equal(O.same_orbit(f1, f2), True, "The swap of U(2) carries f1 to f2")
+    assert_equal(M.eichler_criterion_equivalent(f1, f2), True, "f1 ~ f2 under O(L)")
+    assert_equal(M.eichler_criterion_equivalent(e1, M.element((0, 1, 0, 0))), True, "e1 ~ e2 in U")
+    reps = M.isotropic_orbit_representatives(bound=1)
+    assert_equal(sorted(M.divisor(r) for r in reps), [1, 2], f"One representative per orbit: {reps}")
@@ -1,9 +1,5 @@
 from __future__ import annotations
 
-import pytest
-
-pytestmark = pytest.mark.tdd_red
-
 from sage.all import ZZ, matrix
 
 from .conftest import Lattice, assert_equal
@@ -66,3 +62,17 @@ def test_lattice_root_e8_constructor_contract():
         (8, (8, 0), 2, 1),
         "Lattice.E(8) invariant mismatch",
     )
+
+
+def test_lattice_from_gram_determinant_of_rank_16_cartan_matrix():
+    """
+    method: determinant
+
+    Base-class contract:
+    `Lattice.from_gram(G).determinant()` is exact at ranks where cofactor expansion is infeasible;
+    the A16 Cartan matrix has determinant 17.
+    """
+    n = 16
+    G = matrix(ZZ, n, n, lambda i, j: 2 if i == j else (-1 if abs(i - j) == 1 else 0))
+    L = Lattice.from_gram(G)
+    assert_equal(L.determinant(), n + 1, "Lattice.determinant mismatch on A16 Cartan matrix")
@@ -1,8 +1,6 @@
 from __future__ import annotations
 
-import pytest
-
-pytestmark = pytest.mark.tdd_red
+from fractions import Fraction
 
 from sage.all import ZZ, matrix
 
@@ -69,3 +67,47 @@ def test_hyperbolic_root_interface_reflection_and_orthogonal_hyperplane():
 
     O = H3.orthogonal_group()
     assert_equal(O.contains(s_from_root), True, f"Reflection should lie in O(L): reflection={s_from_root}")
+
+
+def test_lattice_pairing_is_exact_beyond_machine_word_range():
+    """
+    method: pairing
+
+    Element contract:
+    pairings stay exact integers when coordinates push `x^T G y` past the 64-bit range.
+    """
+    L = Lattice.from_gram(matrix(ZZ, ((2, 1), (1, 2))))
+    x = L.element([10**12, -3 * 10**12])
+    y = L.element([1, 10**12])
+
+    assert_equal(x.norm(), 14 * 10**24, f"Exact norm mismatch on large coordinates: x={tuple(x.coords())}")
+    assert_equal(
+        L.pairing(x, y),
+        -5 * 10**24 - 10**12,
+        f"Exact pairing mismatch on large coordinates: x={tuple(x.coords())}, y={tuple(y.coords())}",
+    )
+
+
+def test_lattice_batched_pairings_and_norms_agree_with_pairwise_api():
+    """
+    method: pairings
+
+    Batch contract:
+    `L.pairings(xs, ys)` is the matrix of pairwise `L.pairing` values and
+    `L.norms(xs)` is its diagonal when `ys = xs`.
+    """
+    L = Lattice.from_gram(matrix(ZZ, ((2, 1), (1, 2))))
+    xs = [L.element([1, 0]), L.element([1, 1]), L.element([3, -1])]
+    ys = [L.element([0, 1]), L.element([-1, 2])]
+
+    table = L.pairings(xs, ys)
+    expected = [[L.pairing(x, y) for y in ys] for x in xs]
+    assert_equal([[int(v) for v in row] for row in table], expected, "Lattice.pairings mismatch with pairwise pairing")
+    assert_equal([int(v) for v in L.norms(xs)], [2, 6, 14], "Lattice.norms mismatch on explicit vectors")
+    assert_equal(L.pairings([], ys).shape, (0, 2), "An empty batch should give an empty table, one column per y")
+
+    half = Lattice.from_gram([[1, Fraction(1, 2)], [Fraction(1, 2), 1]])
+    us = [half.element([1, 0]), half.element([1, 1])]
+    table = half.pairings(us, us)
+    assert_equal([[half.pairing(x, y) for y in us] for x in us], [list(row) for row in table], "Rational pairings mismatch")
+    assert_equal([type(v) for v in half.norms(us)], [int, int], f"Integral values of a rational Gram should be ints: {table}")
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from fractions import Fraction
+
+import pytest
+
+from .conftest import Lattice, LatticeGenus, assert_equal, isometry_screen
+
+
+def _identity(n: int) -> Lattice:
+    return Lattice.from_gram([[int(i == j) for j in range(n)] for i in range(n)])
+
+
+def test_lattice_genus_buckets_binary_forms_by_local_symbols():
+    """
+    method: genus
+
+    Genus-object contract:
+    genera are hashable values; the four classes of discriminant -56 fall into the
+    two genera {x^2 + 14y^2, 2x^2 + 7y^2} and {3x^2 ± 2xy + 5y^2}, separated by the
+    genus characters at 2 and 7.
+    """
+    principal = [Lattice.from_gram([[1, 0], [0, 14]]), Lattice.from_gram([[2, 0], [0, 7]])]
+    other = [Lattice.from_gram([[3, 1], [1, 5]]), Lattice.from_gram([[3, -1], [-1, 5]])]
+    buckets: dict[LatticeGenus, int] = {}
+    for L in principal + other:
+        buckets[L.genus()] = buckets.get(L.genus(), 0) + 1
+
+    assert_equal(sorted(buckets.values()), [2, 2], f"Expected two genera of two classes: {buckets}")
+    assert_equal(principal[0].in_genus_of(principal[1]), True, "x^2 + 14y^2 and 2x^2 + 7y^2 share a genus")
+    assert_equal(principal[0].in_genus_of(other[0]), False, "x^2 + 14y^2 and 3x^2 + 2xy + 5y^2 lie in different genera")
+    assert_equal(principal[0].genus().local_symbol(7), ((0, 1, 1), (1, 1, 1)), "7-adic symbol of x^2 + 14y^2")
+    assert_equal(other[0].genus().local_symbol(7), ((0, 1, -1), (1, 1, -1)), "7-adic symbol of 3x^2 + 2xy + 5y^2")
+    assert principal[0].genus().local_symbol(2) != other[0].genus().local_symbol(2), "The genera should differ 2-adically"
+
+
+def test_lattice_genus_mass_matches_automorphism_counts():
+    """
+    method: mass
+
+    Mass-formula contract:
+    `mass(E8) = 1 / |W(E8)| = 1 / 696729600` and `mass(A2) = 1 / 12`; the genus of `I_9`
+    holds `I_9` and `E8 + I_1`, so its mass is `1 / (2^9 9!) + 1 / (2 |W(E8)|)`.
+    A rank-one genus is the single class `<d>` with `O = {±1}`, of mass `1/2`.
+    """
+    assert_equal(Lattice.E(8).genus().mass(), Fraction(1, 696729600), "Mass of the genus of E8")
+    assert_equal(Lattice.A(2).genus().mass(), Fraction(1, 12), "Mass of the genus of A2")
+    assert_equal(_identity(9).genus().mass(), Fraction(17, 2786918400), "Mass of the genus of I_9")
+    for d in (1, 2, 3):
+        genus = Lattice.from_gram([[d]]).genus()
+        assert_equal(genus.mass(), Fraction(1, 2), f"Mass of the rank-one genus of <{d}>")
+        assert_equal(genus.is_single_class(), True, f"<{d}> is alone in its genus")
+
+
+def test_lattice_genus_of_odd_unimodular_rank_12_has_three_classes():
+    """
+    method: class_number
+
+    Genus-enumeration contract:
+    the genus of I_12 holds I_12, E8 + I_4 and D12+, found as Kneser neighbours whose
+    masses 1 / |O(L)| add up to the Conway--Sloane mass of the genus.
+    """
+    i12: Lattice = _identity(12)
+    g: LatticeGenus = i12.genus()
+    reps = g.representatives()
+
+    assert_equal(g.mass(), Fraction(31, 5885971660800), f"Mass mismatch for the genus of I_12: genus={g}")
+    assert_equal(g.class_number(), 3, f"Expected three classes in the genus of I_12: reps={reps}")
+    assert_equal(i12.is_unique_in_genus(), False, "I_12 shares its genus with E8 + I_4 and D12+")
+    assert_equal(all(g.contains(L) for L in reps), True, f"Representatives must lie in the genus: reps={reps}")
+    assert_equal(
+        sorted(L.minimum() for L in reps),
+        [1, 1, 2],
+        f"Expected minima 1 (I_12, E8 + I_4) and 2 (D12+): reps={reps}",
+    )
+
+
+def test_lattice_genus_class_numbers_of_odd_unimodular_and_binary_genera():
+    """
+    method: class_number
+
+    Genus-enumeration contract:
+    the genera of `I_9` and `I_10` hold two classes (`I_n` and `E8 + I_{n-8}`) and `I_8` only
+    one. Binary genera are read off reduced forms: `x^2 + 34y^2` shares its genus with
+    `2x^2 + 17y^2`. Rank one has a single class, and none of these needs a neighbour walk
+    that cannot end.
+    """
+    for n, expected in [(8, 1), (9, 2), (10, 2)]:
+        assert_equal(_identity(n).genus().class_number(), expected, f"Class number of the genus of I_{n}")
+
+    binary = Lattice.from_gram([[1, 0], [0, 34]]).genus().representatives()
+    assert_equal([L.gram() for L in binary][1:], [((2, 0), (0, 17))], f"Other class of the genus of x^2 + 34y^2: {binary}")
+    assert_equal(Lattice.from_gram([[3, 1], [1, 5]]).genus().class_number(), 1, "3x^2 + 2xy + 5y^2 is alone up to isometry")
+    z = Lattice.from_gram([[1]])
+    assert_equal(z.genus().representatives(), (z,), "Z is alone in its genus")
+
+
+def test_lattice_is_isometric_searches_only_when_fingerprints_match():
+    """
+    method: is_isometric
+
+    Isometry contract:
+    fingerprints reject x^2 + 14y^2 against 2x^2 + 7y^2 (same genus, different minimum)
+    without a search; E8 against another basis of E8 matches and is confirmed exactly.
+    Indefinite unimodular lattices are decided by their genus without a search, and
+    other indefinite pairs in a common genus are refused rather than guessed.
+    """
+    e8: Lattice = Lattice.E(8)
+    # E8 in the basis b1 + b0, b3 - b6, b7 + b2 (a unimodular change of its Dynkin basis).
+    skew = [
+        [2, 1, 0, 0, 0, 0, 0, 0],
+        [1, 2, -1, 0, 0, 0, 0, -1],
+        [0, -1, 2, -1, 0, 0, 0, 2],
+        [0, 0, -1, 4, -1, 1, -2, -1],
+        [0, 0, 0, -1, 2, -1, 0, -1],
+        [0, 0, 0, 1, -1, 2, -1, 0],
+        [0, 0, 0, -2, 0, -1, 2, 0],
+        [0, -1, 2, -1, -1, 0, 0, 4],
+    ]
+    a, b = Lattice.from_gram([[1, 0], [0, 14]]), Lattice.from_gram([[2, 0], [0, 7]])
+    # U + U in the basis e1 + f1, f1, e2, f2.
+    u2 = Lattice.from_gram([[0, 1, 0, 0], [1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]])
+    u2_skew = Lattice.from_gram([[2, 1, 0, 0], [1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]])
+    u_2 = Lattice.from_gram([[0, 2], [2, 0]])
+
+    assert_equal(a.is_isometric(b), False, "x^2 + 14y^2 and 2x^2 + 7y^2 share a genus but not a minimum")
+    assert_equal((isometry_screen.rejected, isometry_screen.searched), (1, 0), f"Fingerprints alone should decide: {isometry_screen}")
+    assert_equal(e8.is_isometric(Lattice.from_gram(skew)), True, "E8 in another basis is isometric to E8")
+    assert_equal((isometry_screen.compared, isometry_screen.isometric), (2, 1), f"Matching fingerprints go to the search: {isometry_screen}")
+    assert_equal(isometry_screen.hit_rate, 0.5, f"One of two pairs was screened out: {isometry_screen}")
+    assert_equal(u2.is_isometric(u2_skew), True, "U + U in another basis is isometric to U + U")
+    assert_equal((isometry_screen.searched, isometry_screen.collisions), (1, 0), f"The genus decides U + U without a search: {isometry_screen}")
+    with pytest.raises(AssertionError, match="only decided for unimodular"):
+        u_2.is_isometric(Lattice.from_gram([[0, 2], [2, 0]]))
+    assert_equal(isometry_screen.searched, 1, f"An undecided pair is not counted as searched: {isometry_screen}")
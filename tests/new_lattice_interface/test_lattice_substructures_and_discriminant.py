@@ -2,15 +2,31 @@ from __future__ import annotations
 
 import pytest
 
-pytestmark = pytest.mark.tdd_red
-
 from fractions import Fraction
 
-from .conftest import Lattice, assert_equal
+from .conftest import DiscriminantAutomorphism, Lattice, assert_equal
 
 U = Lattice.U()
 
 
+def _orthogonal_sum(*grams) -> tuple[tuple[int, ...], ...]:
+    n = sum(len(g) for g in grams)
+    rows = [[0] * n for _ in range(n)]
+    offset = 0
+    for g in grams:
+        for i, row in enumerate(g):
+            rows[offset + i][offset : offset + len(row)] = [int(v) for v in row]
+        offset += len(g)
+    return tuple(tuple(row) for row in rows)
+
+
+def _u2_plus_e8_minus_2() -> Lattice:
+    """`U(2) ⊕ E8(-2)`, whose discriminant form is the even plus-type form on `(Z/2)^10`."""
+    minus_2_e8 = [[-2 * int(v) for v in row] for row in Lattice.E(8).gram()]
+    return Lattice.from_gram(_orthogonal_sum([[0, 2], [2, 0]], minus_2_e8))
+
+
+@pytest.mark.tdd_red
 def test_lattice_element_perp_returns_sublattice_contract():
     """
     method: perp
@@ -27,6 +43,7 @@ def test_lattice_element_perp_returns_sublattice_contract():
     assert_equal(e_perp.ambient(), U, "Element perp ambient mismatch")
 
 
+@pytest.mark.tdd_red
 def test_lattice_quotient_by_sublattice_contract():
     """
     method: quotient
@@ -103,3 +120,217 @@ def test_discriminant_group_bilinear_form_contract():
     g = disc.generator(0)
 
     assert_equal(disc.bilinear(g, g), Fraction(2, 3), "Discriminant bilinear mismatch")
+
+
+def test_discriminant_group_of_d4_plus_a3_splits_into_smith_factors():
+    """
+    method: discriminant
+
+    Discriminant-group contract:
+    `D4 ⊕ A3` has discriminant group `Z/2 ⊕ Z/2 ⊕ Z/4`. The nonzero classes of `D4` have
+    `q = 1` and pair to `1/2`, the generator of `A3` has `q = 3/4`, so `q` vanishes exactly
+    on `0` and on the three sums of a nonzero `D4` class with twice the `A3` generator.
+    """
+    a3 = [[2, -1, 0], [-1, 2, -1], [0, -1, 2]]
+    disc = Lattice.from_gram(_orthogonal_sum(Lattice.D(4).gram(), a3)).discriminant()
+    gens = [disc.generator(i) for i in range(3)]
+    elements = disc.elements()
+
+    assert_equal(disc.order(), 16, "D4+A3 discriminant order mismatch")
+    assert_equal(sorted(g.order() for g in gens), [2, 2, 4], f"D4+A3 invariant factors mismatch: {gens}")
+    assert_equal(len(elements), 16, f"Element list should cover the group: {elements}")
+    values = [disc.quadratic(x) for x in elements]
+    assert_equal(values.count(Fraction(0)), 4, f"Isotropic elements of D4+A3: {values}")
+    assert_equal((values.count(Fraction(3, 4)), values.count(Fraction(7, 4))), (2, 6), f"Values on odd A3 classes: {values}")
+    (four,) = [g for g in gens if g.order() == 4]
+    assert_equal(disc.quadratic(four + four), Fraction(1), f"Twice the A3 generator has q = 1: {four}")
+    assert_equal(four + four + four + four, disc.zero(), f"The A3 generator has order 4: {four}")
+
+
+def test_discriminant_group_of_u2_plus_e8_minus_2_is_not_cyclic():
+    """
+    method: generator
+
+    Discriminant-group contract:
+    `U(2) ⊕ E8(-2)` has discriminant group `(Z/2)^10` with ten generators of order 2,
+    `q` takes values in `{0, 1}` mod 2 and `b` is nondegenerate with values in `{0, 1/2}`.
+    """
+    disc = _u2_plus_e8_minus_2().discriminant()
+    gens = [disc.generator(i) for i in range(10)]
+
+    assert_equal(disc.order(), 2**10, "U(2)+E8(-2) discriminant order mismatch")
+    assert_equal({g.order() for g in gens}, {2}, "U(2)+E8(-2) generator orders mismatch")
+    assert_equal({disc.quadratic(g) for g in gens} <= {Fraction(0), Fraction(1)}, True, "U(2)+E8(-2) q values mismatch")
+    for g in gens:
+        pairings = {disc.bilinear(g, h) for h in gens}
+        assert_equal(Fraction(1, 2) in pairings, True, f"Bilinear form degenerate on generator: g={g}")
+
+
+def test_discriminant_orthogonal_group_of_u2_plus_e8_minus_2_is_o_plus_10_2():
+    """
+    method: orthogonal_group
+
+    Discriminant-group contract:
+    the form on `(Z/2)^10` of `U(2) ⊕ E8(-2)` is the even plus-type form, so `O(q)` is
+    `O^+(10, 2)` of order `2 · 2^20 · (2^5 - 1)(2^2 - 1)(2^4 - 1)(2^6 - 1)(2^8 - 1)`;
+    its generators permute the elements preserving `q`, and a non-injective map is rejected.
+    """
+    disc = _u2_plus_e8_minus_2().discriminant()
+    O = disc.orthogonal_group()
+    elements = disc.elements()
+    collapse = DiscriminantAutomorphism(disc, [[int(i == max(j, 1)) for i in range(10)] for j in range(10)])
+
+    assert_equal(O.order(), 2 * 2**20 * 31 * 3 * 15 * 63 * 255, "O(q) order mismatch for U(2)+E8(-2)")
+    for g in O.generators():
+        images = [elements[i] for i in g.permutation()]
+        assert_equal([disc.quadratic(x) for x in images], [disc.quadratic(x) for x in elements], f"Not an isometry: g={g}")
+        assert_equal(O.contains(g.inverse() * g * g), True, f"Group should be closed under products: g={g}")
+    assert_equal(O.contains(collapse), False, "Sending g_0 and g_1 both to g_1 is not an automorphism")
+
+
+def test_discriminant_orthogonal_group_of_d4_is_reached_from_the_lattice():
+    """
+    method: discriminant_orthogonal_group
+
+    Discriminant-group contract:
+    `D4` has discriminant `(Z/2)^2` with `q = 1` on all three nonzero elements, so `O(q)`
+    is the triality `S3`; the lattice accessor returns the form's group, swapping the two
+    Smith generators is an isometry, and a root reflection acts through `L^vee / L`.
+    """
+    d4 = Lattice.D(4)
+    disc = d4.discriminant()
+    O = d4.discriminant_orthogonal_group()
+    swap = DiscriminantAutomorphism(disc, [[0, 1], [1, 0]])
+    reflection = d4.reflection(d4.element([1, 0, 0, 0]))
+
+    assert_equal(O is disc.orthogonal_group(), True, "The lattice accessor should return the cached O(q)")
+    assert_equal(O.order(), 6, "O(q) of D4 should be the triality S3")
+    assert_equal(O.contains(swap), True, "Swapping the Smith generators preserves q")
+    assert_equal(O.contains(reflection), True, "Root reflections act on the discriminant inside O(q)")
+
+
+def test_isotropic_subgroups_of_u2_plus_e8_minus_2_up_to_isometry():
+    """
+    method: isotropic_subgroups
+
+    Discriminant-group contract:
+    by Witt's theorem `O^+(10, 2)` is transitive on totally singular subspaces of each
+    dimension, so the 218551 nontrivial isotropic subgroups of `U(2) ⊕ E8(-2)` fall into
+    five orbits, one for each order `2, 4, ..., 32`; A2 has none (`q(g) = 2/3`).
+    """
+    disc = _u2_plus_e8_minus_2().discriminant()
+    reps = disc.isotropic_subgroups(up_to_isometry=True)
+
+    assert_equal([glue.order() for glue in reps], [2, 4, 8, 16, 32], f"Expected one orbit per order: {reps}")
+    assert_equal([len(glue.subgroup_generators()) for glue in reps], [1, 2, 3, 4, 5], "Generators should be irredundant")
+    assert_equal(all(glue.is_isotropic() for glue in reps), True, f"Representatives must be isotropic: {reps}")
+    assert_equal(all(glue.base_discriminant_form() is disc for glue in reps), True, "Glue data must reference the form")
+    assert_equal(Lattice.A(2).discriminant().isotropic_subgroups(), (), "Z/3 with q = 2/3 has no isotropic subgroup")
+
+
+def test_isotropic_subgroups_of_u_2_list_both_lines_and_one_orbit():
+    """
+    method: isotropic_subgroups
+
+    Discriminant-group contract:
+    `U(2)` has discriminant `(Z/2)^2` with `q = 0, 0, 1` on `e/2, f/2, (e + f)/2`; the two
+    isotropic lines `<e/2>` and `<f/2>` are both listed and are swapped by `O(q)`, so one
+    representative remains up to isometry.
+    """
+    disc = Lattice.from_gram([[0, 2], [2, 0]]).discriminant()
+    lines = disc.isotropic_subgroups()
+    reps = disc.isotropic_subgroups(up_to_isometry=True)
+
+    assert_equal([glue.order() for glue in lines], [2, 2], f"Expected the two isotropic lines: {lines}")
+    assert_equal(
+        {disc.quadratic(glue.subgroup_generators()[0]) for glue in lines}, {Fraction(0)}, "Lines must be isotropic"
+    )
+    assert_equal(disc.orthogonal_group().order(), 2, "O(q) of U(2) should swap the isotropic lines")
+    assert_equal([glue.order() for glue in reps], [2], f"Expected one orbit of isotropic lines: {reps}")
+
+
+def test_lattice_primitive_embeddings_into_k3_and_e8_from_discriminant_forms():
+    """
+    method: primitive_embedding_exists
+
+    Embedding contract:
+    existence into II_{3,19} = U^3 + E8(-1)^2 follows from forms and signatures alone:
+    U^3, E8(-1)^2 and <-2> + U embed, E8(-1)^3 does not (too many negative squares);
+    into E8, D4 embeds once up to O(E8) while A1^8 embeds only imprimitively.
+    """
+    e8: Lattice = Lattice.E(8)
+    minus_e8 = [[-int(v) for v in row] for row in e8.gram()]
+    u = [[0, 1], [1, 0]]
+    k3: Lattice = Lattice.from_gram(_orthogonal_sum(u, u, u, minus_e8, minus_e8))
+    for gram, expected in [
+        (_orthogonal_sum(u, u, u), True),
+        (_orthogonal_sum(minus_e8, minus_e8), True),
+        (_orthogonal_sum(u, [[-2]]), True),
+        (_orthogonal_sum(minus_e8, minus_e8, minus_e8), False),
+    ]:
+        source = Lattice.from_gram(gram)
+        assert_equal(source.primitive_embedding_exists(k3), expected, f"Embedding of {gram} into II_(3,19)")
+
+    a1_8: Lattice = Lattice.from_gram(_orthogonal_sum(*[[[2]]] * 8))
+    assert_equal(a1_8.primitive_embedding_exists(e8), False, "A1^8 lies in E8 only with index 2")
+    assert_equal(a1_8.primitive_embeddings(e8), (), "No primitive embedding of A1^8 into E8")
+
+    d4: Lattice = Lattice.D(4)
+    (embedding,) = d4.primitive_embeddings(e8)
+    images = embedding.image_generators()
+    pairings = [[int(e8.pairing(x, y)) for y in images] for x in images]
+    assert_equal(pairings, [[int(v) for v in row] for row in d4.gram()], f"Images must realize D4: {embedding}")
+
+
+def test_discriminant_form_exists_even_lattice_sweeps_signatures_with_local_conditions():
+    """
+    method: exists_even_lattice
+
+    Existence-query contract:
+    A2 + A2 + A4 + [[2, 1], [1, -2]] and U(3) + U(5) share the group (ZZ/15)^2 and
+    sign q = 0 (mod 8), but only the second is realized at rank 2: the 3-part of the
+    first is anisotropic, so (-1)^{t_-} |A_q| fails the 3-adic determinant condition.
+    """
+    a2, a4 = [[2, -1], [-1, 2]], [[2, -1, 0, 0], [-1, 2, -1, 0], [0, -1, 2, -1], [0, 0, -1, 2]]
+    anisotropic = _orthogonal_sum(a2, a2, a4, [[2, 1], [1, -2]])
+    hyperbolic = _orthogonal_sum([[0, 3], [3, 0]], [[0, 5], [5, 0]])
+    sweep = [(t_plus, t_minus) for t_plus in range(5) for t_minus in range(5)]
+
+    for gram, expected in [
+        (anisotropic, [(2, 2), (3, 3), (4, 4)]),
+        (hyperbolic, [(1, 1), (2, 2), (3, 3), (4, 4)]),
+    ]:
+        disc = Lattice.from_gram(gram).discriminant()
+        assert_equal(disc.signature_mod_8(), 0, f"sign q of {gram}")
+        assert_equal(disc.minimal_number_of_generators(prime=3), 2, f"l(A_q3) of {gram}")
+        realized = [t for t in sweep if disc.exists_even_lattice(t_plus=t[0], t_minus=t[1])]
+        assert_equal(realized, expected, f"Signatures realized by the form of {gram}")
+
+
+def test_lattice_overlattices_of_a1_8_walk_up_to_e8():
+    """
+    method: overlattices
+
+    Overlattice contract:
+    the even overlattices of A1^8 are its doubly-even codes up to equivalence, one per
+    dimension 0, 4 and two each for 1, 2, 3 (determinants 256, 64, 16, 4, 1); they are
+    yielded lazily, A1^8 first, and gluing a maximal isotropic subgroup gives E8.
+    A2 has no isotropic glue, so its walk yields A2 alone.
+    """
+    a1_8: Lattice = Lattice.from_gram(_orthogonal_sum(*[[[2]]] * 8))
+    walk = a1_8.overlattices()
+    assert_equal(next(walk) is a1_8, True, "The walk should start at the lattice itself")
+
+    rest = list(walk)
+    determinants = sorted((int(m.determinant()) for m in rest), reverse=True)
+    assert_equal(determinants, [64, 64, 16, 16, 4, 4, 1], f"Even overlattices of A1^8 by determinant: {rest}")
+    assert_equal(rest[-1].is_isometric(Lattice.E(8)), True, f"The unimodular overlattice should be E8: {rest[-1]}")
+
+    maximal = a1_8.discriminant().isotropic_subgroups()[-1]
+    assert_equal(maximal.order(), 16, f"Maximal isotropic subgroups of (ZZ/2)^8 have order 16: {maximal}")
+    glued: Lattice = a1_8.overlattice_from_glue(maximal)
+    assert_equal(glued.determinant(), 1, f"Gluing along order 16 should be unimodular: {glued}")
+    assert_equal(glued.is_isometric(Lattice.E(8)), True, f"Expected E8 from the extended Hamming code: {glued}")
+
+    a2: Lattice = Lattice.A(2)
+    assert_equal([m is a2 for m in a2.overlattices()], [True], "A2 has no proper even overlattice")
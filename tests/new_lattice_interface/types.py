@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from abc import ABC
+from collections.abc import Iterator
 from fractions import Fraction
 
+import numpy as np
 from pydantic import BaseModel, ConfigDict
 
 
@@ -11,10 +13,14 @@ def assert_equal(actual, expected, label: str) -> None:
         raise AssertionError(f"{label}: actual={actual}, expected={expected}")
 
 
-class LatticeElement(BaseModel, ABC):
-    """Base lattice-element contract."""
+class LatticeElement(ABC):
+    """Base lattice-element contract.
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    Deliberately not a pydantic model: enumeration allocates elements by the
+    hundred thousand, so implementations declare `__slots__` instead.
+    """
+
+    __slots__ = ()
 
     def coords(self) -> tuple[int, ...]:
         assert False, "stub: LatticeElement.coords"
@@ -75,6 +81,16 @@ class LatticeAutomorphism(LatticeMorphism, ABC):
     def inverse(self) -> LatticeAutomorphism:
         assert False, "stub: LatticeAutomorphism.inverse"
 
+    def __mul__(self, other: LatticeAutomorphism) -> LatticeAutomorphism:
+        """Return the composition `self ∘ other` (apply `other` first)."""
+        assert False, "stub: LatticeAutomorphism.__mul__"
+
+    def apply_many(
+        self, xs: np.ndarray | tuple[LatticeElement, ...] | list[LatticeElement]
+    ) -> np.ndarray:
+        """Return the coordinate rows of the images of the rows of `xs`."""
+        assert False, "stub: LatticeAutomorphism.apply_many"
+
     def determinant(self) -> int | Fraction:
         assert False, "stub: LatticeAutomorphism.determinant"
 
@@ -82,6 +98,8 @@ class LatticeAutomorphism(LatticeMorphism, ABC):
 class RootLatticeElement(LatticeElement, ABC):
     """Root-lattice element contract."""
 
+    __slots__ = ()
+
     def reflection(self) -> LatticeAutomorphism:
         assert False, "stub: RootLatticeElement.reflection"
 
@@ -199,6 +217,21 @@ class Lattice(BaseModel, ABC):
     def pairing(self, x: LatticeElement, y: LatticeElement) -> int:
         assert False, "stub: Lattice.pairing"
 
+    def pairings(
+        self,
+        xs: np.ndarray | tuple[LatticeElement, ...] | list[LatticeElement],
+        ys: np.ndarray | tuple[LatticeElement, ...] | list[LatticeElement],
+    ) -> np.ndarray:
+        """Return the `len(xs) x len(ys)` array of pairings `(x_i, y_j)`.
+
+        Rows of a 2-D `xs`/`ys` array are coordinate vectors in the basis of `self`.
+        """
+        assert False, "stub: Lattice.pairings"
+
+    def norms(self, xs: np.ndarray | tuple[LatticeElement, ...] | list[LatticeElement]) -> np.ndarray:
+        """Return the 1-D array of norms `(x_i, x_i)` for the rows of `xs`."""
+        assert False, "stub: Lattice.norms"
+
     def signature(self) -> tuple[int, int]:
         assert False, "stub: Lattice.signature"
 
@@ -272,8 +305,8 @@ class Lattice(BaseModel, ABC):
         """Return the primitive orthogonal complement associated to a primitive embedding."""
         assert False, "stub: Lattice.primitive_complement_in"
 
-    def overlattices(self) -> tuple[Lattice, ...]:
-        """Enumerate overlattices of `self` in the current arithmetic scope."""
+    def overlattices(self) -> Iterator[Lattice]:
+        """Yield overlattices of `self` in the current arithmetic scope, smallest index first."""
         assert False, "stub: Lattice.overlattices"
 
     def overlattice_from_glue(self, glue: LatticeGlueData) -> Lattice:
@@ -354,6 +387,24 @@ class DefiniteLattice(Lattice, ABC):
     def shortest_vector(self) -> LatticeElement:
         assert False, "stub: DefiniteLattice.shortest_vector"
 
+    def short_vectors(
+        self, lower: int | Fraction, upper: int | Fraction
+    ) -> Iterator[tuple[LatticeElement, int | Fraction]]:
+        """Lazily yield `(v, v.norm())` for `lower <= |v.norm()| <= upper`, one of each pair `±v`.
+
+        Vectors are produced by a depth-first search, so memory stays bounded in
+        the number of vectors and callers may stop early.
+        """
+        assert False, "stub: DefiniteLattice.short_vectors"
+
+    def theta_series(self, prec: int) -> tuple[int, ...]:
+        """Return `(a_0, ..., a_{prec-1})` with `a_k = #{v in L : |v.norm()| = k}` (integral `L`)."""
+        assert False, "stub: DefiniteLattice.theta_series"
+
+    def kissing_number(self) -> int:
+        """Return the number of vectors of minimal norm (both signs counted)."""
+        assert False, "stub: DefiniteLattice.kissing_number"
+
 
 class IndefiniteLattice(Lattice, ABC):
     """Indefinite-lattice contract."""
@@ -373,12 +424,23 @@ class IndefiniteLattice(Lattice, ABC):
     def primitive_isotropic_vectors(self, *, bound: int) -> tuple[LatticeElement, ...]:
         assert False, "stub: IndefiniteLattice.primitive_isotropic_vectors"
 
+    def iter_primitive_isotropic_vectors(self, *, bound: int) -> Iterator[LatticeElement]:
+        """Lazily yield the primitive `v` with `v.norm() == 0` and `max_i |v_i| <= bound`, both signs."""
+        assert False, "stub: IndefiniteLattice.iter_primitive_isotropic_vectors"
+
     def isotropic_orbit_representatives(
         self, *, bound: int, primitive: bool = True
     ) -> tuple[LatticeElement, ...]:
         assert False, "stub: IndefiniteLattice.isotropic_orbit_representatives"
 
-    def vinberg(self) -> CoxeterData:
+    def vinberg(self, *, max_height: int | None = 64, processes: int | None = None) -> CoxeterData:
+        """Walls of a Weyl chamber of the reflection group of a hyperbolic lattice.
+
+        Mirrors farther than `max_height` (in `sinh^2` of the distance from the
+        controlling vector) are not searched; `processes` enables a worker pool.
+        If the walls found by then do not close up a finite-volume chamber, a
+        `RuntimeWarning` is raised and `has_finite_volume()` of the result is False.
+        """
         assert False, "stub: IndefiniteLattice.vinberg"
 
     def reflection(self, root: RootLatticeElement) -> LatticeAutomorphism:
@@ -387,6 +449,14 @@ class IndefiniteLattice(Lattice, ABC):
     def orthogonal_hyperplane(self, root: RootLatticeElement) -> LatticeHyperplane:
         assert False, "stub: IndefiniteLattice.orthogonal_hyperplane"
 
+    def divisor(self, x: LatticeElement) -> int:
+        """Return `div(x)`, the positive generator of the ideal `(x, L)`."""
+        assert False, "stub: IndefiniteLattice.divisor"
+
+    def discriminant_class(self, x: LatticeElement) -> DiscriminantGroupElement:
+        """Return the class of `x / div(x)` in `L^vee / L`."""
+        assert False, "stub: IndefiniteLattice.discriminant_class"
+
     def eichler_criterion_equivalent(self, x: LatticeElement, y: LatticeElement) -> bool:
         assert False, "stub: IndefiniteLattice.eichler_criterion_equivalent"
 
@@ -425,6 +495,13 @@ class LatticePolytope(BaseModel, ABC):
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    def walls(self) -> tuple[LatticeHyperplane, ...]:
+        assert False, "stub: LatticePolytope.walls"
+
+    def has_finite_volume(self) -> bool:
+        """Decide finite volume by Vinberg's criterion on the Coxeter diagram of the walls."""
+        assert False, "stub: LatticePolytope.has_finite_volume"
+
 
 class LatticeOrthogonalSubgroup(BaseModel, ABC):
     """Subgroup contract for O(L), O^+(L), and stabilizers."""
@@ -441,6 +518,13 @@ class LatticeOrthogonalSubgroup(BaseModel, ABC):
 class LatticeCoxeterGroup(LatticeOrthogonalSubgroup, ABC):
     """Coxeter/orthogonal-group contract attached to lattice reflection data."""
 
+    def simple_reflections(self) -> tuple[LatticeAutomorphism, ...]:
+        assert False, "stub: LatticeCoxeterGroup.simple_reflections"
+
+    def coxeter_matrix(self) -> tuple[tuple[int, ...], ...]:
+        """Return the Coxeter matrix `m_ij` of the simple reflections, with `0` for `infinity`."""
+        assert False, "stub: LatticeCoxeterGroup.coxeter_matrix"
+
 
 class OrthogonalGroup(LatticeOrthogonalSubgroup, ABC):
     """Orthogonal-group contract O(L)."""
@@ -448,10 +532,22 @@ class OrthogonalGroup(LatticeOrthogonalSubgroup, ABC):
     def identity(self) -> LatticeAutomorphism:
         assert False, "stub: OrthogonalGroup.identity"
 
+    def order(self) -> int:
+        """Return `|O(L)|`; finite, and computed, for definite lattices."""
+        assert False, "stub: OrthogonalGroup.order"
+
     def orbit(self, x: LatticeElement, *, bound: int) -> tuple[LatticeElement, ...]:
         assert False, "stub: OrthogonalGroup.orbit"
 
+    def iter_orbit(self, x: LatticeElement, *, bound: int) -> Iterator[LatticeElement]:
+        """Lazily yield the orbit points of height `max_i |x_i| <= bound`, `x` first.
+
+        Exact for finite `O(L)`; otherwise only the points reached through vectors of height at most `bound`.
+        """
+        assert False, "stub: OrthogonalGroup.iter_orbit"
+
     def same_orbit(self, x: LatticeElement, y: LatticeElement) -> bool:
+        """Decide whether `y` lies in the orbit of `x`; for indefinite lattices `False` is not certified."""
         assert False, "stub: OrthogonalGroup.same_orbit"
 
     def stabilizer(self, x: LatticeElement) -> LatticeOrthogonalSubgroup:
@@ -552,6 +648,10 @@ class CoxeterData(BaseModel, ABC):
     def simple_roots(self) -> tuple[RootLatticeElement, ...]:
         assert False, "stub: CoxeterData.simple_roots"
 
+    def has_finite_volume(self) -> bool:
+        """Whether the search closed up the chamber before reaching `max_height`."""
+        assert False, "stub: CoxeterData.has_finite_volume"
+
 
 class LatticeQuotient(BaseModel, ABC):
     """Quotient contract for L/M with M a sublattice."""
@@ -623,7 +723,8 @@ class LatticeDiscriminantGroup(LatticeQuotient, ABC):
     def exists_even_lattice(self, *, t_plus: int, t_minus: int) -> bool:
         assert False, "stub: LatticeDiscriminantGroup.exists_even_lattice"
 
-    def isotropic_subgroups(self) -> tuple[LatticeGlueData, ...]:
+    def isotropic_subgroups(self, *, up_to_isometry: bool = False) -> tuple[LatticeGlueData, ...]:
+        """Return nontrivial isotropic subgroups; with `up_to_isometry`, one per `O(q)`-orbit."""
         assert False, "stub: LatticeDiscriminantGroup.isotropic_subgroups"
 
 
@@ -639,6 +740,13 @@ class DiscriminantOrthogonalGroup(BaseModel, ABC):
     def contains(self, automorphism) -> bool:
         assert False, "stub: DiscriminantOrthogonalGroup.contains"
 
+    def order(self) -> int:
+        assert False, "stub: DiscriminantOrthogonalGroup.order"
+
+    def generators(self) -> tuple:
+        """Return automorphisms generating `O(q)`."""
+        assert False, "stub: DiscriminantOrthogonalGroup.generators"
+
 
 class LatticeGenus(BaseModel, ABC):
     """Genus-level classification contract (signature + discriminant-form data)."""
@@ -648,13 +756,25 @@ class LatticeGenus(BaseModel, ABC):
     def signature(self) -> tuple[int, int]:
         assert False, "stub: LatticeGenus.signature"
 
+    def local_symbol(self, p: int) -> tuple[tuple[int, ...], ...]:
+        """Return the canonical `p`-adic Jordan symbol (Conway--Sloane form for `p = 2`)."""
+        assert False, "stub: LatticeGenus.local_symbol"
+
     def discriminant_form(self) -> LatticeDiscriminantGroup:
         assert False, "stub: LatticeGenus.discriminant_form"
 
     def contains(self, lattice: Lattice) -> bool:
         assert False, "stub: LatticeGenus.contains"
 
-    def class_number(self) -> int:
+    def mass(self) -> Fraction:
+        """Return the mass `sum 1 / |O(L)|` over the isometry classes of a definite genus."""
+        assert False, "stub: LatticeGenus.mass"
+
+    def representatives(self, *, processes: int | None = None) -> tuple[Lattice, ...]:
+        """Return one lattice per isometry class of a definite genus; `processes` enables a worker pool."""
+        assert False, "stub: LatticeGenus.representatives"
+
+    def class_number(self, *, processes: int | None = None) -> int:
         assert False, "stub: LatticeGenus.class_number"
 
     def is_single_class(self) -> bool: